@@ -2,26 +2,50 @@
 Data Fusion Hub Service - Authentication API Endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.security import oauth2_scheme
 from app.models.login import LoginRequest, Token
-from app.repositories.concrete_user_repository import ConcreteUserRepository
-from app.core.security import verify_password, create_access_token
+from app.models.user import UserPublic
+from app.services.auth_service import AuthService
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db, scope="function")
+) -> UserPublic:
+    """
+    Resolve the user making the request from its bearer token.
+    
+    The session is only used when the user is not cached, and it is the
+    route's own session when the route also depends on get_async_db.
+    
+    Raises:
+        HTTPException: 401 Unauthorized if the token is missing, invalid or
+            expired, or its user no longer exists
+    """
+    return await AuthService(db).get_user_for_token(token)
+
+
 @router.post("/login", response_model=Token)
 async def login_for_access_token(
     request_data: LoginRequest,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """
     Authenticate user and return JWT access token.
     
+    The time spent verifying the password is reported in the
+    ``Server-Timing`` response header as ``hash``.
+    
     Args:
         request_data: Login credentials (email and password)
+        response: Response used to report hash timing
         db: Database session
         
     Returns:
@@ -30,43 +54,27 @@ async def login_for_access_token(
     Raises:
         HTTPException: 401 Unauthorized if authentication fails
     """
-    # In a real implementation, you would fetch the user from database by email
+    service = AuthService(db)
+    user, hash_seconds = await service.authenticate(request_data.email, request_data.password)
+    timing = f"hash;dur={hash_seconds * 1000:.1f}"
+    response.headers["Server-Timing"] = timing
     
-    repository = ConcreteUserRepository(db)
-    
-    try:
-        # This is where you'd normally query the database for the user
-        # For demonstration purposes, let's assume we have a way to get the user
-        
-        users = await repository.get_all()
-        
-        # Find user with matching email (this is a simplified approach)
-        user = None
-        for u in users:
-            if u.email == request_data.email:
-                user = u
-                break
-                
-        if not user or not verify_password(request_data.password, user.password_hash):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-            
-        # Create access token with user identifier
-        from datetime import timedelta
-        access_token_expires = timedelta(minutes=30)
-        token_data = {"sub": user.email}
-        access_token = create_access_token(
-            data=token_data, expires_delta=access_token_expires
-        )
-        
-        return Token(access_token=access_token, token_type="bearer")
-        
-    except Exception as e:
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Authentication failed: {str(e)}",
-            headers={"WWW-Authenticate": "Bearer"},
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer", "Server-Timing": timing},
         )
+    
+    return service.issue_token(user)
+
+
+@router.get("/me", response_model=UserPublic)
+async def read_current_user(current_user: UserPublic = Depends(get_current_user)):
+    """
+    Get the user the bearer token was issued to.
+    
+    Returns:
+        The authenticated user
+    """
+    return current_user
@@ -10,7 +10,7 @@ router = APIRouter(prefix="/data-fields", tags=["Data Fields"])
 @router.post("/", response_model=DataField)
 def create_data_field(
     data_field: DataFieldCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Create a new data field"""
     try:
@@ -22,7 +22,7 @@ def create_data_field(
 @router.get("/{id}", response_model=DataField)
 def get_data_field(
     id: UUID,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Get a data field by ID"""
     repo = DataFieldRepository(db)
@@ -34,7 +34,7 @@ def get_data_field(
 @router.get("/object/{object_id}", response_model=list[DataField])
 def get_data_fields_by_object(
     object_id: UUID,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Get all data fields for a specific data object"""
     repo = DataFieldRepository(db)
@@ -44,7 +44,7 @@ def get_data_fields_by_object(
 def update_data_field(
     id: UUID,
     data_field_update: DataFieldUpdate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Update a data field"""
     repo = DataFieldRepository(db)
@@ -56,7 +56,7 @@ def update_data_field(
 @router.delete("/{id}", response_model=DataField)
 def delete_data_field(
     id: UUID,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Delete a data field"""
     repo = DataFieldRepository(db)
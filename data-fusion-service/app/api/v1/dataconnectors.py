@@ -4,9 +4,9 @@ Data Fusion Hub Service - Data Connector API Endpoints
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.data_connector import DataConnector, DataConnectorCreate, DataConnectorUpdate
 from app.repositories.data_connector_repository import DataConnectorRepository
 
@@ -16,8 +16,9 @@ router = APIRouter(prefix="/dataconnectors", tags=["Data Connectors"])
 class PaginationMetadata(BaseModel):
     page: int
     size: int
-    total: int
-    pages: int
+    total: Optional[int] = None
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 class PaginatedDataConnectorResponse(BaseModel):
     data: List[DataConnector]
@@ -25,30 +26,25 @@ class PaginatedDataConnectorResponse(BaseModel):
 
 @router.get("/", response_model=PaginatedDataConnectorResponse)
 def list_data_connectors(
-    db: Session = Depends(get_db),
-    page: int = Query(1, ge=1, description="Page number"),
-    size: int = Query(20, ge=1, le=100, description="Items per page")
+    db: Session = Depends(get_read_db),
+    page: int = Query(1, ge=1, description="Page number (ignored when a cursor is given)"),
+    size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="Whether to count all items for total/pages")
 ):
     """Get all data connectors with pagination support."""
     
     repository = DataConnectorRepository(db)
     
-    # Get total count
-    total = len(repository.get_all())
-    
-    # Calculate offset and limit for database query
-    skip = (page - 1) * size
-    
-    # For simplicity in this implementation, we'll get all items 
-    # In a real system, you'd implement actual database pagination
-    data_connectors = repository.get_all()
-    
-    # Apply pagination to the results
-    start_idx = skip
-    end_idx = min(skip + size, len(data_connectors))
-    paginated_data = data_connectors[start_idx:end_idx]
+    try:
+        paginated_data, next_cursor = repository.get_page(size, cursor=cursor, offset=(page - 1) * size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    pages = (total + size - 1) // size
+    total = pages = None
+    if include_total:
+        total = repository.count()
+        pages = (total + size - 1) // size
     
     return PaginatedDataConnectorResponse(
         data=paginated_data,
@@ -56,14 +52,15 @@ def list_data_connectors(
             page=page,
             size=size,
             total=total,
-            pages=pages
+            pages=pages,
+            next_cursor=next_cursor
         )
     )
 
 @router.post("/", response_model=DataConnector, status_code=status.HTTP_201_CREATED)
 def create_data_connector(
     data_connector: DataConnectorCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
     current_user: str = "test_user"  # In a real implementation, this would come from auth
 ):
     """Create a new data connector."""
@@ -78,7 +75,7 @@ def create_data_connector(
 @router.get("/{id}", response_model=DataConnector)
 def get_data_connector(
     id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific data connector by ID."""
     repository = DataConnectorRepository(db)
@@ -93,7 +90,7 @@ def get_data_connector(
 def update_data_connector(
     id: str,
     data_connector_update: DataConnectorUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
     current_user: str = "test_user"  # In a real implementation, this would come from auth
 ):
     """Update an existing data connector."""
@@ -109,7 +106,7 @@ def update_data_connector(
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_data_connector(
     id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Delete a data connector."""
     repository = DataConnectorRepository(db)
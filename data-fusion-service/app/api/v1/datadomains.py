@@ -4,11 +4,13 @@ Data Fusion Hub Service - Data Domain API Endpoints
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.models.batch import BatchGetRequest, BatchGetResponse
 from app.models.data_domain import DataDomain, DataDomainCreate, DataDomainUpdate
 from app.repositories.data_domain_repository import DataDomainRepository
+from app.utils.batch import order_by_ids
 
 router = APIRouter(prefix="/datadomains", tags=["Data Domains"])
 
@@ -16,8 +18,9 @@ router = APIRouter(prefix="/datadomains", tags=["Data Domains"])
 class PaginationMetadata(BaseModel):
     page: int
     size: int
-    total: int
-    pages: int
+    total: Optional[int] = None
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 class PaginatedDataDomainResponse(BaseModel):
     data: List[DataDomain]
@@ -25,30 +28,25 @@ class PaginatedDataDomainResponse(BaseModel):
 
 @router.get("/", response_model=PaginatedDataDomainResponse)
 def list_data_domains(
-    db: Session = Depends(get_db),
-    page: int = Query(1, ge=1, description="Page number"),
-    size: int = Query(20, ge=1, le=100, description="Items per page")
+    db: Session = Depends(get_read_db),
+    page: int = Query(1, ge=1, description="Page number (ignored when a cursor is given)"),
+    size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="Whether to count all items for total/pages")
 ):
     """Get all data domains with pagination support."""
     
     repository = DataDomainRepository(db)
     
-    # Get total count
-    total = len(repository.get_all())
-    
-    # Calculate offset and limit for database query
-    skip = (page - 1) * size
-    
-    # For simplicity in this implementation, we'll get all items 
-    # In a real system, you'd implement actual database pagination
-    data_domains = repository.get_all()
-    
-    # Apply pagination to the results
-    start_idx = skip
-    end_idx = min(skip + size, len(data_domains))
-    paginated_data = data_domains[start_idx:end_idx]
+    try:
+        paginated_data, next_cursor = repository.get_page(size, cursor=cursor, offset=(page - 1) * size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    pages = (total + size - 1) // size
+    total = pages = None
+    if include_total:
+        total = repository.count()
+        pages = (total + size - 1) // size
     
     return PaginatedDataDomainResponse(
         data=paginated_data,
@@ -56,14 +54,15 @@ def list_data_domains(
             page=page,
             size=size,
             total=total,
-            pages=pages
+            pages=pages,
+            next_cursor=next_cursor
         )
     )
 
 @router.post("/", response_model=DataDomain, status_code=status.HTTP_201_CREATED)
 def create_data_domain(
     data_domain: DataDomainCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
     current_user: str = "test_user"  # In a real implementation, this would come from auth
 ):
     """Create a new data domain."""
@@ -75,10 +74,20 @@ def create_data_domain(
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to create data domain: {str(e)}")
 
+@router.post("/batch-get", response_model=BatchGetResponse[DataDomain])
+def batch_get_data_domains(
+    batch_request: BatchGetRequest,
+    db: Session = Depends(get_read_db)
+):
+    """Get several data domains by ID, reporting the IDs that were not found."""
+    repository = DataDomainRepository(db)
+    data, missing = order_by_ids(repository.get_many(batch_request.ids), batch_request.ids)
+    return BatchGetResponse[DataDomain](data=data, missing=missing)
+
 @router.get("/{id}", response_model=DataDomain)
 def get_data_domain(
     id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific data domain by ID."""
     repository = DataDomainRepository(db)
@@ -93,7 +102,7 @@ def get_data_domain(
 def update_data_domain(
     id: str,
     data_domain_update: DataDomainUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
     current_user: str = "test_user"  # In a real implementation, this would come from auth
 ):
     """Update an existing data domain."""
@@ -109,7 +118,7 @@ def update_data_domain(
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_data_domain(
     id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Delete a data domain."""
     repository = DataDomainRepository(db)
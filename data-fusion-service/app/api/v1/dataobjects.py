@@ -2,41 +2,163 @@
 Data Fusion Hub Service - Data Object API Endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import zlib
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
-from app.models.data_object import DataObjectCreate, DataObjectUpdate, DataObject
-from app.models.data_object_bulk import DataObjectBulkCreate, DataObjectBulkResponse
+from typing import Dict, List, Literal, Optional, Tuple, Union
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from app.core.database import get_async_db, get_db, get_read_db, get_streaming_read_db
+from app.models.batch import BatchGetRequest, BatchGetResponse
+from app.models.bulk_job import BulkJob
+from app.models.data_object import DataObjectCreate, DataObjectUpdate, DataObject, DataObjectWithFields
+from app.models.data_object_bulk import (
+    DataObjectBulkCreate, DataObjectBulkResponse, DataObjectBulkUpsertResponse, DataObjectCreateBulk
+)
+from app.repositories.bulk_job_repository import BulkJobRepository
 from app.repositories.data_object_repository import DataObjectRepository
-from app.repositories.data_field_repository import DataFieldRepository
 from app.repositories.data_domain_repository import DataDomainRepository
+from app.services.bulk_jobs import bulk_job_runner
+from app.utils.batch import order_by_ids
+from app.utils.catalog_export import EXPORT_FORMATS
+from app.utils.ndjson import NDJSON_MEDIA_TYPES, iter_ndjson_lines
 
 
 router = APIRouter(prefix="/data-objects", tags=["Data Objects"])
 
+# Data objects written per statement batch by POST /data-objects/ingest
+INGEST_BATCH_SIZE = 1000
 
-@router.get("/", response_model=List[DataObject])
-def list_data_objects(db: Session = Depends(get_db)):
-    """Get all data objects."""
+bulk_object_adapter = TypeAdapter(DataObjectCreateBulk)
+
+
+# Pydantic model for pagination metadata
+class PaginationMetadata(BaseModel):
+    page: int
+    size: int
+    total: Optional[int] = None
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+class PaginatedDataObjectResponse(BaseModel):
+    data: List[DataObject]
+    pagination: PaginationMetadata
+
+class PaginatedDataObjectWithFieldsResponse(BaseModel):
+    data: List[DataObjectWithFields]
+    pagination: PaginationMetadata
+
+@router.get("/", response_model=Union[PaginatedDataObjectWithFieldsResponse, PaginatedDataObjectResponse])
+def list_data_objects(
+    db: Session = Depends(get_read_db),
+    data_domain_id: Optional[str] = Query(None, description="Only objects of this data domain"),
+    type: Optional[str] = Query(None, description="Only objects of this type, e.g. 'table'"),
+    name_prefix: Optional[str] = Query(None, description="Only objects whose name starts with this"),
+    updated_since: Optional[datetime] = Query(None, description="Only objects updated at or after this time"),
+    sort: str = Query("created_at", description="created_at, updated_at or name; prefix with '-' for descending"),
+    page: int = Query(1, ge=1, description="Page number (ignored when a cursor is given)"),
+    size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(False, description="Whether to count all matching items for total/pages"),
+    include: Optional[Literal["fields"]] = Query(None, description="'fields' to embed each object's data fields")
+):
+    """Get data objects matching the filters, one page at a time."""
+    repository = DataObjectRepository(db)
+    filters = dict(data_domain_id=data_domain_id, type=type, name_prefix=name_prefix, updated_since=updated_since)
+    
+    try:
+        paginated_data, next_cursor = repository.get_page(
+            size, cursor=cursor, offset=(page - 1) * size, sort=sort,
+            with_fields=include == "fields", **filters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    total = pages = None
+    if include_total:
+        total = repository.count(**filters)
+        pages = (total + size - 1) // size
+    
+    response_class = PaginatedDataObjectWithFieldsResponse if include == "fields" else PaginatedDataObjectResponse
+    return response_class(
+        data=paginated_data,
+        pagination=PaginationMetadata(
+            page=page,
+            size=size,
+            total=total,
+            pages=pages,
+            next_cursor=next_cursor
+        )
+    )
+
+
+@router.get("/export")
+def export_data_objects(
+    db: Session = Depends(get_streaming_read_db),
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson (one object per line) or csv (one field per row)"),
+    data_domain_id: Optional[str] = Query(None, description="Only objects of this data domain"),
+    type: Optional[str] = Query(None, description="Only objects of this type, e.g. 'table'"),
+    name_prefix: Optional[str] = Query(None, description="Only objects whose name starts with this"),
+    updated_since: Optional[datetime] = Query(None, description="Only objects updated at or after this time")
+):
+    """Stream every matching data object with its data fields."""
+    repository = DataObjectRepository(db)
+    items = repository.iter_with_fields(
+        data_domain_id=data_domain_id, type=type, name_prefix=name_prefix, updated_since=updated_since
+    )
+    serializer, media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        serializer(items),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="data-objects.{extension}"'}
+    )
+
+
+@router.post(
+    "/batch-get",
+    response_model=Union[BatchGetResponse[DataObjectWithFields], BatchGetResponse[DataObject]]
+)
+def batch_get_data_objects(
+    batch_request: BatchGetRequest,
+    db: Session = Depends(get_read_db),
+    include: Optional[Literal["fields"]] = Query(None, description="'fields' to embed each object's data fields")
+):
+    """Get several data objects by ID, reporting the IDs that were not found."""
     repository = DataObjectRepository(db)
-    return repository.get_all()
+    rows = repository.get_many(batch_request.ids, with_fields=include == "fields")
+    data, missing = order_by_ids(rows, batch_request.ids)
+    response_class = BatchGetResponse[DataObjectWithFields] if include == "fields" else BatchGetResponse[DataObject]
+    return response_class(data=data, missing=missing)
 
 
-@router.get("/{id}", response_model=DataObject)
-def get_data_object(id: str, db: Session = Depends(get_db)):
+@router.get("/{id}", response_model=Union[DataObjectWithFields, DataObject])
+def get_data_object(
+    id: str,
+    db: Session = Depends(get_read_db),
+    include: Optional[Literal["fields"]] = Query(None, description="'fields' to embed the object's data fields")
+):
     """Get a data object by ID."""
     repository = DataObjectRepository(db)
-    data_object = repository.get_by_id(id)
+    if include == "fields":
+        data_object = repository.get_with_fields(id)
+    else:
+        data_object = repository.get_by_id(id)
     if not data_object:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data object not found")
-    return data_object
+    
+    # Validate explicitly so the union never lazy-loads fields that were not asked for
+    if include == "fields":
+        return DataObjectWithFields.model_validate(data_object)
+    return DataObject.model_validate(data_object)
 
 
 @router.post("/", response_model=DataObject)
 def create_data_object(
     data_object_create: DataObjectCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Create a new data object."""
     # Validate that the data domain exists
@@ -64,12 +186,13 @@ def create_data_object(
     return repository.create(data_object_create, created_by="system")
 
 
-@router.post("/bulk", response_model=List[DataObjectBulkResponse])
-def create_data_objects_bulk(
-    bulk_request: DataObjectBulkCreate,
-    db: Session = Depends(get_db)
-):
-    """Create multiple data objects in a single request."""
+def validate_bulk_request(bulk_request: DataObjectBulkCreate, db: Session, mode: str = "create") -> None:
+    """
+    Reject a bulk request that cannot be written, reporting every bad data object at once.
+    
+    The 400 response's detail lists one error per problem, each with the
+    object's index and name, the field name for field problems, and a message.
+    """
     # Validate that the data domain exists
     domain_repo = DataDomainRepository(db)
     if not domain_repo.get_by_id(bulk_request.data_domain_id):
@@ -79,91 +202,217 @@ def create_data_objects_bulk(
         )
     
     # Validate all data objects first
+    errors = []
     for i, data_object in enumerate(bulk_request.data_objects):
-        if not data_object.name:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Data object at index {i} must have a name"
-            )
-        
-        # Ensure data_fields is provided and not empty
-        if not data_object.data_fields:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Data object '{data_object.name}' must have data_fields specified"
-            )
+        error = bulk_object_error(i, data_object)
+        if error:
+            errors.append({"index": i, "name": data_object.name, "error": error})
+    errors.extend(DataObjectRepository(db).find_bulk_conflicts(
+        bulk_request.data_domain_id, bulk_request.data_objects, check_existing=mode == "create"
+    ))
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=sorted(errors, key=lambda error: error["index"])
+        )
+
+
+def bulk_object_error(index: int, data_object: DataObjectCreateBulk) -> Optional[str]:
+    """Get why a data object cannot be bulk created, or None if it can."""
+    if not data_object.name:
+        return f"Data object at index {index} must have a name"
     
-    # Create all data objects within a single transaction
+    # Ensure data_fields is provided and not empty
+    if not data_object.data_fields:
+        return f"Data object '{data_object.name}' must have data_fields specified"
+    return None
+
+
+@router.post("/bulk", response_model=Union[List[DataObjectBulkResponse], DataObjectBulkUpsertResponse])
+def create_data_objects_bulk(
+    bulk_request: DataObjectBulkCreate,
+    db: Session = Depends(get_db, scope="function"),
+    mode: Literal["create", "upsert"] = Query(
+        "create", description="create always inserts; upsert matches objects on domain and name and writes only changes"
+    )
+):
+    """Create multiple data objects in a single request, or create and update them in upsert mode."""
+    validate_bulk_request(bulk_request, db, mode)
     repository = DataObjectRepository(db)
-    field_repository = DataFieldRepository(db)
     
-    created_objects = []
+    if mode == "upsert":
+        try:
+            return DataObjectBulkUpsertResponse(
+                **repository.upsert_bulk(bulk_request.data_domain_id, bulk_request.data_objects, updated_by="system")
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
+    # Create all data objects and their fields within a single transaction
     try:
-        for data_object in bulk_request.data_objects:
-            # Set the domain ID on each object to ensure consistency
-            data_object_data = data_object.dict()
-            data_object_data["data_domain_id"] = bulk_request.data_domain_id
-            
-            # Create the data object
-            db_data_object = repository.create(data_object_data, created_by="system")
-            
-            # Create associated fields
-            if hasattr(data_object, 'data_fields') and data_object.data_fields:
-                created_fields = []
-                for field in data_object.data_fields:
-                    # Set the object_id to link this field to the parent data object
-                    field_data = field.dict()
-                    field_data["object_id"] = db_data_object.id
-                    field_data["created_by"] = "system"
-                    field_data["updated_by"] = "system"
-                    
-                    created_field = field_repository.create(field_data)
-                    created_fields.append(created_field)
-                
-                # Create response object with fields
-                temp_response_obj = DataObjectBulkResponse(
-                    id=db_data_object.id,
-                    name=db_data_object.name,
-                    description=db_data_object.description,
-                    type=db_data_object.type,
-                    data_domain_id=db_data_object.data_domain_id,  # Include domain ID in response
-                    created_at=db_data_object.created_at,
-                    updated_at=db_data_object.updated_at,
-                    data_fields=created_fields  # This will be the list of fields
-                )
-                
-                created_objects.append(temp_response_obj)
-            else:
-                # Create response object without fields (should not happen due to validation above)
-                temp_response_obj = DataObjectBulkResponse(
-                    id=db_data_object.id,
-                    name=db_data_object.name,
-                    description=db_data_object.description,
-                    type=db_data_object.type,
-                    data_domain_id=db_data_object.data_domain_id,  # Include domain ID in response
-                    created_at=db_data_object.created_at,
-                    updated_at=db_data_object.updated_at,
-                    data_fields=[]  # No fields
-                )
-                
-                created_objects.append(temp_response_obj)
-        
-        return created_objects
-        
+        created_rows = repository.create_bulk(
+            bulk_request.data_domain_id,
+            bulk_request.data_objects,
+            created_by="system"
+        )
     except Exception as e:
-        # If any error occurs, the transaction will be automatically rolled back
+        # The HTTPException makes get_db roll back, so nothing from this batch is persisted
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating data objects: {str(e)}"
         )
+    
+    return [
+        DataObjectBulkResponse(**object_row, data_fields=field_rows)
+        for object_row, field_rows in created_rows
+    ]
+
+
+@router.post("/ingest", response_model=DataObjectBulkUpsertResponse)
+async def ingest_data_objects(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db, scope="function"),
+    mode: Literal["create", "upsert"] = Query("create", description="Same as for POST /data-objects/bulk")
+):
+    """
+    Create or upsert data objects streamed as NDJSON, one data object per line.
+    
+    Lines are parsed as they arrive and written INGEST_BATCH_SIZE objects at a
+    time, so memory use does not grow with the size of the body. Each line
+    names its own data_domain_id. Gzip bodies (Content-Encoding: gzip) are
+    accepted. The whole body is written in one transaction, so an invalid
+    line rejects all of it. A name repeated within a batch, or in create
+    mode already taken in its domain (earlier batches of the body included),
+    is a 409 naming the line; in upsert mode a later batch repeating a name
+    updates that object again.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type not in NDJSON_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Expected one of {', '.join(sorted(NDJSON_MEDIA_TYPES))}"
+        )
+    gzipped = request.headers.get("content-encoding", "").lower() == "gzip"
+    
+    counts = {"created": 0, "updated": 0, "unchanged": 0}
+    known_domains = set()
+    batch = []
+    line_number = 0
+    try:
+        async for line in iter_ndjson_lines(request.stream(), gzipped=gzipped):
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                data_object = bulk_object_adapter.validate_json(line)
+            except ValidationError as e:
+                raise HTTPException(
+                    status_code=422,
+                    detail={"line": line_number, "errors": e.errors(include_url=False, include_context=False, include_input=False)}
+                )
+            error = bulk_object_error(line_number - 1, data_object)
+            if error is None and data_object.data_domain_id not in known_domains:
+                if not await db.run_sync(lambda session: DataDomainRepository(session).get_by_id(data_object.data_domain_id)):
+                    error = "Data domain not found"
+                known_domains.add(data_object.data_domain_id)
+            if error:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Line {line_number}: {error}")
+            
+            batch.append((line_number, data_object))
+            if len(batch) >= INGEST_BATCH_SIZE:
+                await db.run_sync(write_ingest_batch, batch, mode, counts)
+                batch = []
+        if batch:
+            await db.run_sync(write_ingest_batch, batch, mode, counts)
+    except IntegrityError:
+        # A row written by another request after the batch was checked
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Line {line_number}: A data object in the batch ending here conflicts with an existing one"
+        )
+    except (ValueError, zlib.error) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Line {line_number}: {e}")
+    
+    return DataObjectBulkUpsertResponse(**counts)
+
+
+def write_ingest_batch(
+    db: Session, batch: List[Tuple[int, DataObjectCreateBulk]], mode: str, counts: Dict[str, int]
+) -> None:
+    """
+    Write one batch of ingested data objects, grouped by domain, and add up the counts.
+    
+    Each domain's objects are checked for names repeated in the batch and
+    with find_bulk_conflicts first, and the first conflict is raised with its
+    line number. Names from earlier batches are already written, so create
+    mode finds them as taken in the domain.
+    """
+    repository = DataObjectRepository(db)
+    by_domain: Dict[str, List[Tuple[int, DataObjectCreateBulk]]] = {}
+    for line_number, data_object in batch:
+        by_domain.setdefault(data_object.data_domain_id, []).append((line_number, data_object))
+    
+    for data_domain_id, numbered_objects in by_domain.items():
+        first_lines: Dict[str, int] = {}
+        for line_number, data_object in numbered_objects:
+            first_line = first_lines.setdefault(data_object.name, line_number)
+            if first_line != line_number:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Line {line_number}: Duplicate data object name, first used at line {first_line}"
+                )
+        
+        data_objects = [data_object for _, data_object in numbered_objects]
+        conflicts = repository.find_bulk_conflicts(data_domain_id, data_objects, check_existing=mode == "create")
+        if conflicts:
+            conflict = conflicts[0]
+            line_number = numbered_objects[conflict["index"]][0]
+            if "field" in conflict:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Line {line_number}: Field '{conflict['field']}': {conflict['error']}"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Line {line_number}: '{conflict['name']}': {conflict['error']}"
+            )
+        
+        if mode == "upsert":
+            for key, value in repository.upsert_bulk(data_domain_id, data_objects, updated_by="system").items():
+                counts[key] += value
+        else:
+            repository.create_bulk(data_domain_id, data_objects, created_by="system")
+            counts["created"] += len(data_objects)
+
+
+@router.post("/bulk-jobs", response_model=BulkJob, status_code=status.HTTP_202_ACCEPTED)
+def submit_bulk_job(
+    bulk_request: DataObjectBulkCreate,
+    db: Session = Depends(get_db, scope="function"),
+    mode: Literal["create", "upsert"] = Query("create", description="Same as for POST /data-objects/bulk")
+):
+    """Queue a bulk request to be written in the background and return its job right away."""
+    validate_bulk_request(bulk_request, db, mode)
+    
+    job = BulkJobRepository(db).create(mode, bulk_request.data_domain_id, bulk_request.data_objects, created_by="system")
+    bulk_job_runner.enqueue(job.id, db)
+    return BulkJob.from_db(job)
+
+
+@router.get("/bulk-jobs/{id}", response_model=BulkJob)
+def get_bulk_job(id: str, db: Session = Depends(get_db, scope="function")):
+    """Get the progress, throughput and per-item errors of a bulk job."""
+    job = BulkJobRepository(db).get_by_id(id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bulk job not found")
+    return BulkJob.from_db(job)
 
 
 @router.put("/{id}", response_model=DataObject)
 def update_data_object(
     id: str,
     data_object_update: DataObjectUpdate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Update an existing data object."""
     repository = DataObjectRepository(db)
@@ -199,7 +448,7 @@ def update_data_object(
 
 
 @router.delete("/{id}")
-def delete_data_object(id: str, db: Session = Depends(get_db)):
+def delete_data_object(id: str, db: Session = Depends(get_db, scope="function")):
     """Delete a data object."""
     repository = DataObjectRepository(db)
     success = repository.delete(id)
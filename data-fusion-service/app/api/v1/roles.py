@@ -3,11 +3,14 @@ Data Fusion Hub Service - Roles API Router
 """
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_async_read_db
+from app.models.batch import BatchGetRequest, BatchGetResponse
 from app.models.role_api import Role, RoleCreate, RoleUpdate
-from app.models.role_db import RoleDB
+from app.repositories.async_concrete_role_repository import AsyncConcreteRoleRepository
+from app.utils.batch import order_by_ids
 
 router = APIRouter(
     prefix="/roles",
@@ -17,53 +20,57 @@ router = APIRouter(
 
 
 @router.get("/", response_model=List[Role])
-async def get_roles(skip: int = 0, limit: int = 100, db = Depends(get_db)):
+async def get_roles(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_read_db)):
     """Get all roles."""
-    roles = db.query(RoleDB).offset(skip).limit(limit).all()
-    return roles
+    repository = AsyncConcreteRoleRepository(db)
+    return await repository.get_all(skip=skip, limit=limit)
+
+
+@router.post("/batch-get", response_model=BatchGetResponse[Role])
+async def batch_get_roles(batch_request: BatchGetRequest, db: AsyncSession = Depends(get_async_read_db)):
+    """Get several roles by ID, reporting the IDs that were not found."""
+    repository = AsyncConcreteRoleRepository(db)
+    data, missing = order_by_ids(await repository.get_many(batch_request.ids), batch_request.ids)
+    return BatchGetResponse[Role](data=data, missing=missing)
 
 
 @router.get("/{role_id}", response_model=Role)
-async def get_role(role_id: str, db = Depends(get_db)):
+async def get_role(role_id: str, db: AsyncSession = Depends(get_async_read_db)):
     """Get a specific role by ID."""
-    role = db.query(RoleDB).filter(RoleDB.id == role_id).first()
+    repository = AsyncConcreteRoleRepository(db)
+    role = await repository.get_by_id(role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
     return role
 
 
 @router.post("/", response_model=Role)
-async def create_role(role: RoleCreate, db = Depends(get_db)):
+async def create_role(role: RoleCreate, db: AsyncSession = Depends(get_async_db, scope="function")):
     """Create a new role."""
-    db_role = RoleDB(**role.dict())
-    db.add(db_role)
-    db.commit()
-    db.refresh(db_role)
-    return db_role
+    repository = AsyncConcreteRoleRepository(db)
+    try:
+        return await repository.create(role, created_by="system")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.put("/{role_id}", response_model=Role)
-async def update_role(role_id: str, role_update: RoleUpdate, db = Depends(get_db)):
+async def update_role(role_id: str, role_update: RoleUpdate, db: AsyncSession = Depends(get_async_db, scope="function")):
     """Update a specific role."""
-    db_role = db.query(RoleDB).filter(RoleDB.id == role_id).first()
+    repository = AsyncConcreteRoleRepository(db)
+    try:
+        db_role = await repository.update(role_id, role_update, updated_by="system")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not db_role:
         raise HTTPException(status_code=404, detail="Role not found")
-    
-    for key, value in role_update.dict(exclude_unset=True).items():
-        setattr(db_role, key, value)
-        
-    db.commit()
-    db.refresh(db_role)
     return db_role
 
 
 @router.delete("/{role_id}")
-async def delete_role(role_id: str, db = Depends(get_db)):
+async def delete_role(role_id: str, db: AsyncSession = Depends(get_async_db, scope="function")):
     """Delete a specific role."""
-    db_role = db.query(RoleDB).filter(RoleDB.id == role_id).first()
-    if not db_role:
+    repository = AsyncConcreteRoleRepository(db)
+    if not await repository.delete(role_id):
         raise HTTPException(status_code=404, detail="Role not found")
-    
-    db.delete(db_role)
-    db.commit()
-    return {"message": "Role deleted successfully"}
\ No newline at end of file
+    return {"message": "Role deleted successfully"}
@@ -0,0 +1,59 @@
+"""
+Data Fusion Hub Service - Internal Diagnostics Routes
+"""
+
+import os
+
+from fastapi import APIRouter, Depends
+
+from app.api.v1.auth import get_current_user
+from app.core.cache import entity_cache
+from app.core.database import async_engine, async_replica_engines, engine, replica_engines
+from app.core.permissions import permission_index
+from app.core.pool import get_pool_status
+from app.core.security import current_user_cache, token_claims_cache
+from app.services.password_hasher import password_hasher
+
+# Diagnostics reveal load and usage patterns, so only signed-in users get them
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+    dependencies=[Depends(get_current_user)],
+)
+
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get entity cache hit/miss/eviction counters."""
+    return entity_cache.stats()
+
+
+@router.get("/auth/cache/stats")
+async def get_auth_cache_stats():
+    """Get hit/miss counters of the verified token and current user caches."""
+    return {"tokens": token_claims_cache.stats(), "users": current_user_cache.stats()}
+
+
+@router.get("/permissions/stats")
+async def get_permission_index_stats():
+    """Get hit/miss counters and the number of users and roles in the permission index."""
+    return permission_index.stats()
+
+
+@router.get("/password-hasher/stats")
+async def get_password_hasher_stats():
+    """Get hashing counters, rejected calls and the queue slots in use."""
+    return password_hasher.stats()
+
+
+@router.get("/pool/stats")
+async def get_pool_stats():
+    """Get connection pool occupancy and checkout wait counters of this worker."""
+    return {
+        # Each uvicorn worker has its own pools; the pid tells them apart
+        "pid": os.getpid(),
+        "sync": get_pool_status(engine),
+        "async": get_pool_status(async_engine.sync_engine),
+        "replicas": [get_pool_status(replica) for replica in replica_engines],
+        "async_replicas": [get_pool_status(replica.sync_engine) for replica in async_replica_engines],
+    }
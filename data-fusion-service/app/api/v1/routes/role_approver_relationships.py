@@ -2,14 +2,20 @@
 Data Fusion Hub Service - Role Approver Relationships Routes
 """
 
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
 from typing import List
 import uuid
 
 from app.core.database import get_db
 from app.models.role_approver_relationship_db import RoleApproverRelationshipDB, RoleApproverRelationshipCreate, RoleApproverRelationship
 from app.models.role_db import RoleDB
+from app.services.approver_graph import approved_role_ids, approver_graph, lock_approver_relationships
+from app.utils.batch import unique_ids
 
+# The handlers use a sync session and are plain functions, so FastAPI runs
+# them in its threadpool rather than blocking the event loop
 router = APIRouter(
     prefix="/roles/{role_id}/approver-roles",
     tags=["Role Approver Relationships"],
@@ -18,57 +24,108 @@ router = APIRouter(
 
 
 @router.put("/", response_model=List[RoleApproverRelationship])
-async def assign_approver_roles(
+def assign_approver_roles(
     role_id: str,
     approver_role_ids: List[str],
-    db = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
-    """Assign one or more roles as approvers for a specific role."""
+    """
+    Assign one or more roles as approvers for a specific role, replacing its current approvers.
     
-    # Validate that the target role exists
-    target_role = db.query(RoleDB).filter(RoleDB.id == role_id).first()
-    if not target_role:
+    The roles are validated with one query and the change is written as a
+    diff: relationships to approvers that stay are kept as they are, the rest
+    are removed with one DELETE and the new ones added with one multi-row
+    INSERT, so the round trips do not grow with the number of approvers. All
+    of it commits together or not at all.
+    
+    Approval cycles are checked with one recursive query over the edges as
+    written, after the INSERT. Other assignments wait for this one to
+    commit, so two of them cannot each add half of a cycle.
+    """
+    approver_role_ids = unique_ids(approver_role_ids)
+    
+    # Validate the target role and all approver roles in one query
+    existing_role_ids = {
+        id for id, in db.query(RoleDB.id).filter(RoleDB.id.in_([role_id, *approver_role_ids]))
+    }
+    if role_id not in existing_role_ids:
         raise HTTPException(status_code=404, detail="Target role not found")
-        
-    # Validate that all approver roles exist and are different from target role
+    if role_id in approver_role_ids:
+        raise HTTPException(
+            status_code=400, 
+            detail="Cannot assign a role to itself as an approver"
+        )
     for approver_role_id in approver_role_ids:
-        if approver_role_id == role_id:
-            raise HTTPException(
-                status_code=400, 
-                detail="Cannot assign a role to itself as an approver"
-            )
-        
-        approver_role = db.query(RoleDB).filter(RoleDB.id == approver_role_id).first()
-        if not approver_role:
+        if approver_role_id not in existing_role_ids:
             raise HTTPException(status_code=404, detail=f"Approver role with ID {approver_role_id} not found")
     
-    # Delete existing relationships for this role
-    db.query(RoleApproverRelationshipDB).filter(
-        RoleApproverRelationshipDB.role_id == role_id
-    ).delete()
+    lock_approver_relationships(db)
     
-    # Create new relationships
-    created_relationships = []
-    for approver_role_id in approver_role_ids:
-        relationship = RoleApproverRelationshipDB(
+    # Diff the requested approvers against the existing relationships
+    existing = {
+        relationship.approver_role_id: relationship
+        for relationship in db.query(RoleApproverRelationshipDB).filter(RoleApproverRelationshipDB.role_id == role_id)
+    }
+    removed = [approver_role_id for approver_role_id in existing if approver_role_id not in approver_role_ids]
+    added = [approver_role_id for approver_role_id in approver_role_ids if approver_role_id not in existing]
+    
+    if removed:
+        db.query(RoleApproverRelationshipDB).filter(
+            RoleApproverRelationshipDB.role_id == role_id,
+            RoleApproverRelationshipDB.approver_role_id.in_(removed)
+        ).delete(synchronize_session=False)
+    
+    now = datetime.now(timezone.utc)
+    new_relationships = [
+        RoleApproverRelationshipDB(
             id=str(uuid.uuid4()),
             role_id=role_id,
             approver_role_id=approver_role_id,
             created_by="system",  # This would be replaced with actual user when auth is implemented
-            updated_by="system"
+            updated_by="system",
+            created_at=now,
+            updated_at=now
         )
-        db.add(relationship)
-        db.commit()
-        db.refresh(relationship)
-        created_relationships.append(relationship)
+        for approver_role_id in added
+    ]
+    # Flushed as one executemany INSERT
+    db.add_all(new_relationships)
+    db.flush()
+    
+    # Reject edges that let the role approve itself through other roles. The
+    # edges are read after the write, not from the cached graph, so edges
+    # other requests or workers committed before the lock are seen too; the
+    # HTTPException rolls the whole assignment back
+    if added:
+        approved = approved_role_ids(db, role_id)
+        if role_id in approved:
+            approver_role_id = next(
+                (approver_role_id for approver_role_id in added if approver_role_id in approved), None
+            )
+            if approver_role_id is None:
+                # The cycle runs only through approvers the role already had
+                raise HTTPException(
+                    status_code=409,
+                    detail="The role is already on an approval cycle through its current approvers"
+                )
+            raise HTTPException(
+                status_code=400,
+                detail=f"Assigning role {approver_role_id} as an approver would create an approval cycle"
+            )
+    
+    for approver_role_id in removed:
+        approver_graph.apply_on_commit(db, False, role_id, approver_role_id)
+    for approver_role_id in added:
+        approver_graph.apply_on_commit(db, True, role_id, approver_role_id)
     
-    return created_relationships
+    relationships = {**existing, **{relationship.approver_role_id: relationship for relationship in new_relationships}}
+    return [relationships[approver_role_id] for approver_role_id in approver_role_ids]
 
 
 @router.get("/", response_model=List[RoleApproverRelationship])
-async def get_approver_roles(
+def get_approver_roles(
     role_id: str,
-    db = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Get all approver roles for a specific role."""
     
@@ -85,10 +142,10 @@ async def get_approver_roles(
 
 
 @router.delete("/{approver_role_id}")
-async def remove_approver_role(
+def remove_approver_role(
     role_id: str,
     approver_role_id: str,
-    db = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Remove an approver role from a specific role."""
     
@@ -107,6 +164,7 @@ async def remove_approver_role(
         raise HTTPException(status_code=404, detail="Role approver relationship not found")
         
     db.delete(relationship)
-    db.commit()
+    db.flush()
+    approver_graph.apply_on_commit(db, False, role_id, approver_role_id)
     
     return {"message": "Approver role removed successfully"}
\ No newline at end of file
@@ -2,15 +2,33 @@
 Data Fusion Hub Service - User Role Request Routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
 import uuid
 
-from app.core.database import get_db
-from app.models.user_role_request_db import UserRoleRequestDB, UserRoleRequestCreate, UserRoleRequestUpdate, UserRoleRequest
+from app.api.v1.auth import get_current_user
+from app.core.database import get_async_db, get_async_read_db
+from app.models.user_role_request_db import (
+    UserRoleRequestDB,
+    UserRoleRequestBulkDecision,
+    UserRoleRequestBulkDecisionResponse,
+    UserRoleRequestCreate,
+    UserRoleRequestUpdate,
+    UserRoleRequest,
+)
 from app.models.role_approver_relationship_db import RoleApproverRelationshipDB
+from app.models.user import UserPublic
 from app.models.user_db import UserDB
 from app.models.role_db import RoleDB
+from app.repositories.user_role_repository import UserRoleRepository
+from app.repositories.user_role_request_repository import UserRoleRequestRepository
+from app.services.approver_graph import approver_graph
+from app.utils.batch import unique_ids
 
 router = APIRouter(
     prefix="/user-role-requests",
@@ -18,16 +36,27 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+class PaginationMetadata(BaseModel):
+    page: int
+    size: int
+    total: Optional[int] = None
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+class PaginatedUserRoleRequestResponse(BaseModel):
+    data: List[UserRoleRequest]
+    pagination: PaginationMetadata
+
 
 @router.post("/", response_model=UserRoleRequest)
 async def create_user_role_request(
     request: UserRoleRequestCreate,
-    db = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Submit a new role request."""
     
     # Check if the requested role is public (not allowed)
-    role = db.query(RoleDB).filter(RoleDB.id == request.role_id).first()
+    role = (await db.execute(select(RoleDB).where(RoleDB.id == request.role_id))).scalars().first()
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
     
@@ -38,41 +67,109 @@ async def create_user_role_request(
         )
         
     # Check if user exists
-    user = db.query(UserDB).filter(UserDB.id == request.user_id).first()
+    user = (await db.execute(select(UserDB).where(UserDB.id == request.user_id))).scalars().first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
         
-    # Create the user role request
-    db_request = UserRoleRequestDB(**request.dict(), id=str(uuid.uuid4()))
-    db.add(db_request)
-    db.commit()
-    db.refresh(db_request)
+    # Create the user role request; the partial unique index rejects a
+    # second pending request for the same role, e.g. from a retry
+    db_request = UserRoleRequestDB(
+        **request.model_dump(), id=str(uuid.uuid4()), created_by="system", updated_by="system"
+    )
+    try:
+        async with db.begin_nested():
+            db.add(db_request)
+            await db.flush()
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A pending request for this role already exists for the user"
+        )
     
     return db_request
 
 
-@router.get("/", response_model=List[UserRoleRequest])
+@router.get("/", response_model=PaginatedUserRoleRequestResponse)
 async def get_user_role_requests(
-    user_id: str,
-    db = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: Optional[str] = Query(None, description="Only requests of this user"),
+    role_id: Optional[str] = Query(None, description="Only requests for this role"),
+    status: Optional[Literal["pending", "approved", "denied"]] = Query(None, description="Only requests in this status"),
+    created_after: Optional[datetime] = Query(None, description="Only requests created at or after this time"),
+    created_before: Optional[datetime] = Query(None, description="Only requests created before this time"),
+    sort: Literal["created_at", "-created_at"] = Query("created_at", description="Oldest or ('-') newest first"),
+    page: int = Query(1, ge=1, description="Page number (ignored when a cursor is given)"),
+    size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(False, description="Whether to count all matching items for total/pages")
+):
+    """Get role requests matching the filters, one page at a time."""
+    filters = dict(
+        status=status, role_id=role_id, user_id=user_id, created_after=created_after, created_before=created_before
+    )
+    
+    def read_page(session):
+        repository = UserRoleRequestRepository(session)
+        requests, next_cursor = repository.get_page(
+            size, cursor=cursor, offset=(page - 1) * size, descending=sort.startswith("-"), **filters
+        )
+        return requests, next_cursor, repository.count(**filters) if include_total else None
+    
+    try:
+        paginated_data, next_cursor, total = await db.run_sync(read_page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return PaginatedUserRoleRequestResponse(
+        data=paginated_data,
+        pagination=PaginationMetadata(
+            page=page,
+            size=size,
+            total=total,
+            pages=(total + size - 1) // size if total is not None else None,
+            next_cursor=next_cursor
+        )
+    )
+
+
+@router.get("/inbox", response_model=List[UserRoleRequest])
+async def get_approver_inbox(
+    current_user: UserPublic = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
-    """Get all role requests for a specific user."""
-    requests = db.query(UserRoleRequestDB).filter(
-        UserRoleRequestDB.user_id == user_id
-    ).all()
+    """
+    Get the pending requests the current user may approve, oldest first.
     
-    return requests
+    The roles the user may approve come from the user's roles and the
+    transitive approver graph, both held in memory, so the requests are
+    fetched with a single indexed query. The user's own requests are left out.
+    """
+    held_role_ids = await UserRoleRepository(db).get_held_role_ids(current_user.id)
+    await db.run_sync(approver_graph.ensure_loaded)
+    approvable_role_ids = approver_graph.approvable_roles(held_role_ids)
+    if not approvable_role_ids:
+        return []
+    
+    result = await db.execute(
+        select(UserRoleRequestDB).where(
+            UserRoleRequestDB.status == "pending",
+            UserRoleRequestDB.role_id.in_(approvable_role_ids),
+            UserRoleRequestDB.user_id != current_user.id,
+        )
+    )
+    # Sorted here, since ordering an IN lookup would add a sort step to the query
+    return sorted(result.scalars().all(), key=lambda request: request.created_at)
 
 
 @router.get("/{request_id}", response_model=UserRoleRequest)
 async def get_user_role_request(
     request_id: str,
-    db = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Get a specific role request by ID."""
-    request = db.query(UserRoleRequestDB).filter(
-        UserRoleRequestDB.id == request_id
-    ).first()
+    request = (await db.execute(
+        select(UserRoleRequestDB).where(UserRoleRequestDB.id == request_id)
+    )).scalars().first()
     
     if not request:
         raise HTTPException(status_code=404, detail="User role request not found")
@@ -84,7 +181,7 @@ async def get_user_role_request(
 async def approve_user_role_request(
     request_id: str,
     update_data: UserRoleRequestUpdate,
-    db = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Approve a user role request."""
     
@@ -93,9 +190,9 @@ async def approve_user_role_request(
         raise HTTPException(status_code=400, detail="Invalid status. Must be 'approved'")
         
     # Get the existing request
-    db_request = db.query(UserRoleRequestDB).filter(
-        UserRoleRequestDB.id == request_id
-    ).first()
+    db_request = (await db.execute(
+        select(UserRoleRequestDB).where(UserRoleRequestDB.id == request_id)
+    )).scalars().first()
     
     if not db_request:
         raise HTTPException(status_code=404, detail="User role request not found")
@@ -105,8 +202,12 @@ async def approve_user_role_request(
     if update_data.reason is not None:
         db_request.reason = update_data.reason
         
-    db.commit()
-    db.refresh(db_request)
+    await db.flush()
+    
+    # The membership commits together with the approval
+    await UserRoleRepository(db).grant(
+        db_request.user_id, db_request.role_id, granted_by="system", request_id=request_id
+    )
     
     return {"message": "Role request approved successfully", "request_id": request_id}
 
@@ -115,7 +216,7 @@ async def approve_user_role_request(
 async def deny_user_role_request(
     request_id: str,
     update_data: UserRoleRequestUpdate,
-    db = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Deny a user role request."""
     
@@ -124,19 +225,72 @@ async def deny_user_role_request(
         raise HTTPException(status_code=400, detail="Invalid status. Must be 'denied'")
         
     # Get the existing request
-    db_request = db.query(UserRoleRequestDB).filter(
-        UserRoleRequestDB.id == request_id
-    ).first()
+    db_request = (await db.execute(
+        select(UserRoleRequestDB).where(UserRoleRequestDB.id == request_id)
+    )).scalars().first()
     
     if not db_request:
         raise HTTPException(status_code=404, detail="User role request not found")
         
+    # Denying an approved request takes the role away again
+    was_approved = db_request.status == "approved"
+        
     # Update the request status and reason
     db_request.status = update_data.status
     if update_data.reason is not None:
         db_request.reason = update_data.reason
         
-    db.commit()
-    db.refresh(db_request)
+    await db.flush()
+    
+    # The membership stays while another approved request for the role backs it
+    if was_approved:
+        backing = (await db.execute(
+            select(UserRoleRequestDB.id).where(
+                UserRoleRequestDB.user_id == db_request.user_id,
+                UserRoleRequestDB.role_id == db_request.role_id,
+                UserRoleRequestDB.status == "approved",
+            ).limit(1)
+        )).first()
+        if backing is None:
+            await UserRoleRepository(db).revoke(db_request.user_id, db_request.role_id)
+    
+    return {"message": "Role request denied successfully", "request_id": request_id}
+
+
+@router.put("/bulk-decision", response_model=UserRoleRequestBulkDecisionResponse)
+async def decide_user_role_requests(
+    decision: UserRoleRequestBulkDecision,
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """
+    Approve or deny several pending role requests at once.
+    
+    The requests are decided with a single ``UPDATE ... WHERE id IN (...)
+    AND status = 'pending'``, so requests decided in the meantime are left
+    alone, and approvals grant their memberships in the same transaction.
+    """
+    request_ids = unique_ids(decision.request_ids)
+    values = {"status": decision.status, "updated_by": "system"}
+    if decision.reason is not None:
+        values["reason"] = decision.reason
+    
+    result = await db.execute(
+        update(UserRoleRequestDB)
+        .where(UserRoleRequestDB.id.in_(request_ids), UserRoleRequestDB.status == "pending")
+        .values(**values)
+        .returning(UserRoleRequestDB.id, UserRoleRequestDB.user_id, UserRoleRequestDB.role_id)
+        .execution_options(synchronize_session=False)
+    )
+    decided = {id: (user_id, role_id) for id, user_id, role_id in result}
+    
+    # Pending requests never granted a membership, so only approvals have side effects
+    if decision.status == "approved" and decided:
+        await UserRoleRepository(db).grant_many(
+            [(user_id, role_id, id) for id, (user_id, role_id) in decided.items()], granted_by="system"
+        )
     
-    return {"message": "Role request denied successfully", "request_id": request_id}
\ No newline at end of file
+    return UserRoleRequestBulkDecisionResponse(
+        status=decision.status,
+        updated=[id for id in request_ids if id in decided],
+        skipped=[id for id in request_ids if id not in decided],
+    )
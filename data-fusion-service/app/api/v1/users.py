@@ -2,15 +2,17 @@
 Data Fusion Hub Service - User API Endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.core.database import get_db
-from app.models.user import User, UserCreate, UserUpdate
+from app.core.database import get_async_db
+from app.models.batch import BatchGetRequest, BatchGetResponse
+from app.models.user import User, UserBulkCreate, UserCreate, UserPublic, UserUpdate
 from app.models.login import LoginRequest, Token
-from app.repositories.concrete_user_repository import ConcreteUserRepository
-from app.core.security import verify_password, create_access_token
+from app.repositories.async_concrete_user_repository import AsyncConcreteUserRepository
+from app.utils.batch import order_by_ids
+from app.api.v1 import auth
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -29,13 +31,15 @@ def get_current_user_identifier(request: Request) -> str:
 @router.post("/login", response_model=Token)
 async def login_for_access_token(
     request_data: LoginRequest,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """
     Authenticate user and return JWT access token.
     
     Args:
         request_data: Login credentials (email and password)
+        response: Response used to report hash timing
         db: Database session
         
     Returns:
@@ -44,55 +48,13 @@ async def login_for_access_token(
     Raises:
         HTTPException: 401 Unauthorized if authentication fails
     """
-    # In a real implementation, you would fetch the user from database by email
-    # For now, we'll demonstrate with mock logic
-    
-    repository = ConcreteUserRepository(db)
-    
-    # This is where you'd normally query the database for the user
-    # For demonstration purposes, let's assume we have a way to get the user
-    try:
-        # Mock implementation - in real app this would be actual DB lookup
-        # Let's say we're looking up by email and checking password
-        
-        # This is just an example - you'd need to implement proper database logic here
-        users = await repository.get_all()
-        
-        # Find user with matching email (this is a simplified approach)
-        user = None
-        for u in users:
-            if u.email == request_data.email:
-                user = u
-                break
-                
-        if not user or not verify_password(request_data.password, user.password_hash):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-            
-        # Create access token with user identifier
-        access_token_expires = timedelta(minutes=30)
-        token_data = {"sub": user.email}
-        access_token = create_access_token(
-            data=token_data, expires_delta=access_token_expires
-        )
-        
-        return Token(access_token=access_token, token_type="bearer")
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Authentication failed: {str(e)}",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    return await auth.login_for_access_token(request_data, response, db)
 
 @router.post("/create", response_model=User, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user: UserCreate,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """
     Create a new user.
@@ -109,15 +71,41 @@ async def create_user(
         # Get the current user identifier from auth context
         created_by = get_current_user_identifier(request)
         
-        repository = ConcreteUserRepository(db)
+        repository = AsyncConcreteUserRepository(db)
         created_user = await repository.create(user, created_by)
         return created_user
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+@router.post("/bulk", response_model=List[UserPublic], status_code=status.HTTP_201_CREATED)
+async def create_users_bulk(
+    bulk_request: UserBulkCreate,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """
+    Import several users in one transaction.
+    
+    Passwords are hashed in parallel on the password hashing pool, so an
+    import is bound by the cores. Nothing is written if any email is taken.
+    
+    Args:
+        bulk_request: Users to create
+        request: HTTP request object for authentication context
+        db: Database session
+        
+    Returns:
+        Created users, in request order
+    """
+    try:
+        repository = AsyncConcreteUserRepository(db)
+        return await repository.create_many(bulk_request.users, get_current_user_identifier(request))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
 @router.get("/", response_model=List[User])
 async def get_users(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """
     Get all users.
@@ -128,13 +116,32 @@ async def get_users(
     Returns:
         List of all users
     """
-    repository = ConcreteUserRepository(db)
+    repository = AsyncConcreteUserRepository(db)
     return await repository.get_all()
 
+@router.post("/batch-get", response_model=BatchGetResponse[User])
+async def batch_get_users(
+    batch_request: BatchGetRequest,
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """
+    Get several users by ID.
+    
+    Args:
+        batch_request: IDs of the users to retrieve
+        db: Database session
+        
+    Returns:
+        The users found, in request order, and the IDs that were not found
+    """
+    repository = AsyncConcreteUserRepository(db)
+    data, missing = order_by_ids(await repository.get_many(batch_request.ids), batch_request.ids)
+    return BatchGetResponse[User](data=data, missing=missing)
+
 @router.get("/{user_id}", response_model=User)
 async def get_user(
     user_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """
     Get a user by ID.
@@ -146,7 +153,7 @@ async def get_user(
     Returns:
         User if found, raises 404 if not found
     """
-    repository = ConcreteUserRepository(db)
+    repository = AsyncConcreteUserRepository(db)
     user = await repository.get_by_id(user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -157,7 +164,7 @@ async def update_user(
     user_id: str,
     user_update: UserUpdate,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """
     Update an existing user.
@@ -175,7 +182,7 @@ async def update_user(
         # Get the current user identifier from auth context
         updated_by = get_current_user_identifier(request)
         
-        repository = ConcreteUserRepository(db)
+        repository = AsyncConcreteUserRepository(db)
         updated_user = await repository.update(user_id, user_update, updated_by)
         if not updated_user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -186,7 +193,7 @@ async def update_user(
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """
     Delete a user.
@@ -198,7 +205,7 @@ async def delete_user(
     Returns:
         None if successful, raises 404 if not found
     """
-    repository = ConcreteUserRepository(db)
+    repository = AsyncConcreteUserRepository(db)
     success = await repository.delete(user_id)
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
\ No newline at end of file
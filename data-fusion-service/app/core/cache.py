@@ -0,0 +1,333 @@
+"""
+Data Fusion Hub Service - Entity Cache
+"""
+
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, SessionTransaction, make_transient_to_detached
+
+from app.core.config import settings
+
+# Session.info key holding (backend, key) pairs to drop once the session commits
+PENDING_INVALIDATIONS = "entity_cache_invalidations"
+
+
+class CacheBackend:
+    """Interface for cache backends storing JSON-compatible dicts."""
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached value, or None on a miss."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a value under a key."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Remove a key if present."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Remove every key."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters."""
+        raise NotImplementedError
+
+
+class LRUCacheBackend(CacheBackend):
+    """In-process LRU cache with a per-entry time to live."""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return copy.deepcopy(value)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._counters["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._counters, "size": len(self._entries), "max_entries": self.max_entries}
+
+
+class InMemoryRedis:
+    """
+    Minimal stand-in for a Redis client supporting get/set(ex=)/delete.
+
+    Lets RedisCacheBackend run in tests and local development without a
+    Redis server.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Any, ex: Optional[float] = None) -> bool:
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        with self._lock:
+            self._data[key] = (time.monotonic() + ex if ex else None, value)
+        return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def flushdb(self) -> bool:
+        with self._lock:
+            self._data.clear()
+        return True
+
+
+def _encode(value: Any) -> Any:
+    """JSON hook keeping datetimes round-trippable."""
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode(value: Dict[str, Any]) -> Any:
+    """JSON hook reversing _encode."""
+    if set(value) == {"__datetime__"}:
+        return datetime.fromisoformat(value["__datetime__"])
+    return value
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache backend storing JSON-encoded entries in Redis with a TTL."""
+
+    def __init__(self, client: Any, ttl_seconds: float = 60.0, prefix: str = "dfh:"):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    @classmethod
+    def from_url(cls, url: str, ttl_seconds: float = 60.0) -> "RedisCacheBackend":
+        """Create a backend connected to a Redis server."""
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("The redis cache backend requires the 'redis' package") from e
+        return cls(redis.Redis.from_url(url), ttl_seconds=ttl_seconds)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return json.loads(raw, object_hook=_decode)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        self.client.set(self.prefix + key, json.dumps(value, default=_encode), ex=self.ttl_seconds)
+
+    def delete(self, key: str) -> None:
+        if self.client.delete(self.prefix + key):
+            self._count("invalidations")
+
+    def clear(self) -> None:
+        self.client.flushdb()
+
+    def stats(self) -> Dict[str, int]:
+        # Evictions and expirations happen inside Redis and are not seen here
+        with self._lock:
+            return dict(self._counters)
+
+
+class NullCacheBackend(CacheBackend):
+    """Backend that never stores anything, used when caching is disabled."""
+
+    def __init__(self):
+        self._misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        self._misses += 1
+        return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": 0, "misses": self._misses, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+
+class EntityCache:
+    """Read-through cache of ORM rows keyed by table name and primary key."""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    @staticmethod
+    def key(model: Any, id: str) -> str:
+        """Build the cache key for a row."""
+        return f"{model.__tablename__}:{id}"
+
+    def get_or_load(
+        self, model: Any, id: str, load: Callable[[], Any], session: Optional[Session] = None
+    ) -> Any:
+        """
+        Get a row from the cache, loading and caching it on a miss.
+
+        Rows served from the cache are built from the cached column values
+        and made detached, with their identity key set, so session.merge and
+        session.delete treat them like any detached row. They belong to no
+        session, so their relationships cannot be loaded.
+
+        Rows loaded through a session reading from a replica are returned but
+        not cached: a lagging replica would otherwise keep serving a stale
+        row for the whole TTL after the primary changed.
+
+        Args:
+            model: SQLAlchemy model class of the row
+            id: Primary key of the row
+            load: Callable that loads the row from the database
+            session: Session load reads through, if any
+
+        Returns:
+            The row, or None if it does not exist
+        """
+        key = self.key(model, id)
+        values = self.backend.get(key)
+        if values is not None:
+            row = model(**values)
+            make_transient_to_detached(row)
+            return row
+
+        row = load()
+        if row is not None and not getattr(session, "reads_from_replica", False):
+            self.backend.set(key, {
+                column.key: getattr(row, column.key) for column in inspect(model).column_attrs
+            })
+        return row
+
+    def invalidate(self, model: Any, id: str, session: Optional[Session] = None) -> None:
+        """
+        Drop a row from the cache after it was changed or deleted.
+
+        With a session the key is dropped again once that session commits,
+        so a reader that cached the old row while the change was still
+        uncommitted cannot keep serving it.
+
+        Args:
+            model: SQLAlchemy model class of the row
+            id: Primary key of the row
+            session: Session holding the uncommitted change, if any
+        """
+        key = self.key(model, id)
+        self.backend.delete(key)
+        if session is not None:
+            invalidate_on_commit(self.backend, key, session)
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters of the backend."""
+        return self.backend.stats()
+
+
+def invalidate_on_commit(backend: CacheBackend, key: str, session: Session) -> None:
+    """Drop a key from a cache backend again once the session commits."""
+    session.info.setdefault(PENDING_INVALIDATIONS, []).append((backend, key))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    """Drop the keys of rows changed in a transaction once it has committed."""
+    # Also fired when a savepoint is released, before anything is committed
+    if session.in_nested_transaction():
+        return
+    for backend, key in session.info.pop(PENDING_INVALIDATIONS, []):
+        backend.delete(key)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending_invalidations(session: Session, transaction: SessionTransaction) -> None:
+    """Forget pending invalidations once the outermost transaction ended without committing."""
+    # Savepoints and flush subtransactions also end here; their rollback
+    # must keep the outer transaction's invalidations
+    if transaction.parent is None and not transaction.nested:
+        session.info.pop(PENDING_INVALIDATIONS, None)
+
+
+def create_cache_backend(backend: str) -> CacheBackend:
+    """
+    Create the cache backend named in settings.
+
+    Args:
+        backend: One of 'memory', 'redis' or 'none'
+
+    Returns:
+        The configured backend
+    """
+    if backend == "memory":
+        return LRUCacheBackend(max_entries=settings.CACHE_MAX_ENTRIES, ttl_seconds=settings.CACHE_TTL_SECONDS)
+    if backend == "redis":
+        return RedisCacheBackend.from_url(settings.REDIS_URL, ttl_seconds=settings.CACHE_TTL_SECONDS)
+    if backend == "none":
+        return NullCacheBackend()
+    raise ValueError(f"Unknown cache backend '{backend}'")
+
+
+entity_cache = EntityCache(create_cache_backend(settings.CACHE_BACKEND))
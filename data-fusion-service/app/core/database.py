@@ -2,27 +2,323 @@
 Data Fusion Hub Service - Database Configuration
 """
 
-from sqlalchemy import create_engine
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence
+
+from fastapi import Depends, Request, Response
+from sqlalchemy import Select, create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 import os
+import random
+import time
+
+from app.core.config import settings
+from app.core.pool import get_pool_options
 
 # Get database URL from environment variable or use default
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data_fusion_hub.db")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Header a client sends to read from the primary, e.g. right after its own write
+READ_CONSISTENCY_HEADER = "X-Read-Consistency"
+# Cookie holding the time until which a client that wrote reads from the primary
+READ_PRIMARY_COOKIE = "read_primary_until"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Async drivers used for each sync backend when building the async engine
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    Translate a sync database URL into its async driver equivalent.
+
+    URLs that already name an async driver (e.g. ``sqlite+aiosqlite://`` or
+    ``postgresql+asyncpg://``) are returned unchanged.
+
+    Args:
+        database_url: Database URL as configured in ``DATABASE_URL``
+
+    Returns:
+        Database URL using the async driver for the same backend
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    async_driver = ASYNC_DRIVERS.get(backend)
+    if async_driver is None:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    if url.get_driver_name() == async_driver:
+        return database_url
+    return url.set(drivername=f"{backend}+{async_driver}").render_as_string(hide_password=False)
+
+
+def get_sqlite_pragmas(profile: str) -> Dict[str, Any]:
+    """
+    Get the pragmas a SQLite tuning profile applies to each connection.
+
+    The ``production`` profile switches to WAL so readers no longer block
+    on the writer, relaxes ``synchronous`` to NORMAL (safe with WAL, only
+    the last transactions can be lost on power failure) and sizes the page
+    cache and memory map for a single-node deployment.
+
+    Args:
+        profile: ``default`` (SQLite's own settings) or ``production``
+
+    Returns:
+        Pragma names mapped to their values, in the order they are applied
+    """
+    if profile == "default":
+        return {}
+    if profile == "production":
+        return {
+            # Set first so switching the journal mode waits out other writers
+            "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            # Negative cache sizes are in KiB rather than pages
+            "cache_size": -settings.SQLITE_CACHE_SIZE_KIB,
+            "mmap_size": settings.SQLITE_MMAP_SIZE,
+            "temp_store": "MEMORY",
+        }
+    raise ValueError(f"Unknown SQLite profile '{profile}'")
+
+
+def configure_sqlite(engine: Engine, profile: str) -> None:
+    """
+    Apply a SQLite tuning profile to every new connection of an engine.
+
+    Engines for other backends are left untouched.
+
+    Args:
+        engine: Sync engine, or the ``sync_engine`` of an async engine
+        profile: Profile name accepted by get_sqlite_pragmas
+    """
+    pragmas = get_sqlite_pragmas(profile)
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+    
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
+def create_database_engine(database_url: str) -> Engine:
+    """Create a sync engine with the configured pool and SQLite profile."""
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False} if "sqlite" in database_url else {},
+        **get_pool_options(database_url),
+    )
+    configure_sqlite(engine, settings.SQLITE_PROFILE)
+    return engine
+
+
+def create_async_database_engine(database_url: str) -> AsyncEngine:
+    """Create an async engine for a sync database URL."""
+    async_database_url = get_async_database_url(database_url)
+    engine = create_async_engine(async_database_url, **get_pool_options(async_database_url, is_async=True))
+    configure_sqlite(engine.sync_engine, settings.SQLITE_PROFILE)
+    return engine
+
+
+class RoutingSession(Session):
+    """
+    Session that can send plain reads to a read replica.
+
+    Reads only go to a replica once ``use_replica`` is set, which
+    get_read_db does for safe GET handlers. Flushes and INSERT, UPDATE or
+    DELETE statements always go to the primary the session is bound to.
+    One replica is picked per session so a request reads a single snapshot.
+    """
+
+    def __init__(self, *args, replicas: Sequence[Engine] = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = list(replicas)
+        self.use_replica = False
+        self._replica: Optional[Engine] = None
+
+    @property
+    def reads_from_replica(self) -> bool:
+        """Whether plain reads of this session go to a replica."""
+        return self.use_replica and bool(self.replicas)
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.use_replica and self.replicas and not self._flushing and isinstance(clause, Select):
+            if self._replica is None:
+                self._replica = random.choice(self.replicas)
+            return self._replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+
+engine = create_database_engine(DATABASE_URL)
+replica_engines = [create_database_engine(url) for url in settings.DATABASE_REPLICA_URLS]
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine, replicas=replica_engines
+)
+
+# Async engine for handlers that must not block the event loop on database I/O
+async_engine = create_async_database_engine(DATABASE_URL)
+async_replica_engines = [create_async_database_engine(url) for url in settings.DATABASE_REPLICA_URLS]
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    replicas=[replica.sync_engine for replica in async_replica_engines],
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 Base = declarative_base()
 
 # Import all models here to ensure they're registered with Base
 from app.models.user_role_request_db import UserRoleRequestDB
 from app.models.role_approver_relationship_db import RoleApproverRelationshipDB
+from app.models.data_field import DataFieldDB
+from app.models.role_db import RoleDB
+from app.models.user_db import UserDB
+from app.models.bulk_job import BulkJobDB
+from app.models.user_role_db import UserRoleDB
 
-def get_db():
-    """Get database session."""
-    db = SessionLocal()
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """
+    Commit a session once when the block succeeds and roll it back if it raises.
+
+    Repositories only flush their changes, so everything written inside the
+    block becomes visible to other transactions at once or not at all.
+
+    Args:
+        db: Session to run the unit of work in
+
+    Returns:
+        The same session
+    """
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+@asynccontextmanager
+async def async_unit_of_work(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """Async counterpart of unit_of_work."""
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+
+def prefers_primary(request: Request) -> bool:
+    """
+    Check whether a read must see the client's latest writes.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        True if the client sent ``X-Read-Consistency: primary`` or wrote
+        within the last READ_YOUR_WRITES_SECONDS
+    """
+    if request.headers.get(READ_CONSISTENCY_HEADER, "").lower() == "primary":
+        return True
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def _pin_writer_to_primary(request: Request, response: Response, db: Session) -> None:
+    """
+    Keep a writing client's reads on the primary until replicas have caught up.
+
+    The cookie is set when the session first flushes changes, so requests that
+    only read, like the POST batch-get endpoints, do not pin the client. Handlers
+    must flush their writes, which repositories do, for the cookie to be sent.
+    """
+    if request.method in SAFE_METHODS or not settings.DATABASE_REPLICA_URLS:
+        return
+
+    def pin(session, flush_context):
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            str(time.time() + settings.READ_YOUR_WRITES_SECONDS),
+            max_age=settings.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+        )
+
+    event.listen(db, "after_flush", pin, once=True)
+
+
+def get_db(request: Request, response: Response):
+    """
+    Get a database session acting as the unit of work for one request.
+
+    Routes depend on it with ``scope="function"`` so the commit happens
+    before the response is sent and a failed commit surfaces as an error
+    response.
+    """
+    db = SessionLocal()
+    _pin_writer_to_primary(request, response, db)
+    try:
+        with unit_of_work(db):
+            yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def _route_reads_to_replica(request: Request, db: Session) -> Session:
+    """Let a session send its plain reads to a replica unless the client needs the primary."""
+    if isinstance(db, RoutingSession) and not prefers_primary(request):
+        db.use_replica = True
+    return db
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db, scope="function")) -> Session:
+    """
+    Get the request's session with plain reads routed to a read replica.
+
+    Meant for safe GET handlers. Reads stay on the primary when no replicas
+    are configured or the client needs to read its own writes.
+    """
+    return _route_reads_to_replica(request, db)
+
+
+def get_streaming_read_db(request: Request, db: Session = Depends(get_db)) -> Session:
+    """
+    get_read_db for handlers returning a StreamingResponse.
+
+    The session is request scoped, so it stays open until the response body
+    has been sent instead of closing when the handler returns.
+    """
+    return _route_reads_to_replica(request, db)
+
+
+async def get_async_db(request: Request, response: Response):
+    """Get an async database session acting as the unit of work for one request."""
+    async with AsyncSessionLocal() as db:
+        _pin_writer_to_primary(request, response, db.sync_session)
+        async with async_unit_of_work(db):
+            yield db
+
+
+async def get_async_read_db(
+    request: Request, db: AsyncSession = Depends(get_async_db, scope="function")
+) -> AsyncSession:
+    """Async counterpart of get_read_db."""
+    if isinstance(db.sync_session, RoutingSession) and not prefers_primary(request):
+        db.sync_session.use_replica = True
+    return db
@@ -0,0 +1,298 @@
+"""
+Data Fusion Hub Service - Schema Migrations
+"""
+
+import itertools
+import logging
+from typing import Callable, Iterable, List, Set
+
+from sqlalchemy import exists, func, inspect, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models.data_object import DataObjectDB
+from app.models.user_db import UserDB
+from app.models.user_role_db import UserRoleDB
+from app.models.user_role_request_db import UserRoleRequestDB
+from app.utils.batch import chunked
+
+logger = logging.getLogger(__name__)
+
+
+def _existing_index_names(bind: Engine, table_name: str) -> Set[str]:
+    """Get the names of the indexes a table has in the database."""
+    if bind.dialect.name == "sqlite":
+        # The SQLite inspector skips expression indexes such as lower(email)
+        with bind.connect() as conn:
+            return set(conn.scalars(
+                text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"),
+                {"table": table_name},
+            ))
+    return {index["name"] for index in inspect(bind).get_indexes(table_name)}
+
+
+# Indexes removed from the models, by table, that databases created earlier still have
+OBSOLETE_INDEXES = {
+    # Covered by the unique uq_data_objects_domain_name, which orders names within a domain the same way
+    DataObjectDB.__tablename__: ["ix_data_objects_domain_name_id"],
+}
+
+
+def drop_obsolete_indexes(bind: Engine) -> List[str]:
+    """
+    Drop indexes that were removed from the models.
+
+    They only add write cost once nothing reads through them. Safe to run again.
+
+    Args:
+        bind: Engine of the database to migrate
+
+    Returns:
+        Names of the indexes that were dropped
+    """
+    inspector = inspect(bind)
+    dropped = []
+    for table_name, index_names in OBSOLETE_INDEXES.items():
+        if not inspector.has_table(table_name):
+            continue
+        existing = _existing_index_names(bind, table_name)
+        for index_name in index_names:
+            if index_name in existing:
+                with bind.begin() as conn:
+                    conn.execute(text(f"DROP INDEX {index_name}"))
+                dropped.append(index_name)
+    return dropped
+
+
+def _first_free(candidates: Iterable[str], is_taken: Callable[[str], bool]) -> str:
+    """Get the first of endless candidate values that no row holds yet."""
+    return next(candidate for candidate in candidates if not is_taken(candidate))
+
+
+def create_missing_indexes(bind: Engine) -> List[str]:
+    """
+    Create indexes declared on the models that an existing database lacks.
+
+    ``Base.metadata.create_all`` only creates indexes together with their
+    table, so databases created before an index was added to a model never
+    get it. This adds them in place and is safe to run again.
+
+    Args:
+        bind: Engine of the database to migrate
+
+    Returns:
+        Names of the indexes that were created
+    """
+    inspector = inspect(bind)
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = _existing_index_names(bind, table.name)
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name in existing:
+                continue
+            index.create(bind)
+            created.append(index.name)
+    return created
+
+
+def deny_duplicate_pending_requests(bind: Engine) -> int:
+    """
+    Deny all but the oldest pending request of each user for each role.
+
+    Databases created before pending requests had to be unique may hold
+    such duplicates, which would stop their unique index from being
+    created. Run before create_missing_indexes; safe to run again.
+
+    Args:
+        bind: Engine of the database to migrate
+
+    Returns:
+        Number of requests denied
+    """
+    if not inspect(bind).has_table(UserRoleRequestDB.__tablename__):
+        return 0
+    with Session(bind) as db:
+        request = UserRoleRequestDB
+        pending = db.execute(
+            select(request.id, request.user_id, request.role_id)
+            .where(request.status == "pending")
+            .order_by(request.user_id, request.role_id, request.created_at, request.id)
+        ).all()
+        oldest = {}
+        duplicate_ids = []
+        for id, user_id, role_id in pending:
+            if oldest.setdefault((user_id, role_id), id) != id:
+                duplicate_ids.append(id)
+        for chunk in chunked(duplicate_ids):
+            db.execute(
+                update(request).where(request.id.in_(chunk))
+                .values(status="denied", reason="Duplicate of an earlier pending request")
+            )
+        db.commit()
+    return len(duplicate_ids)
+
+
+def rename_duplicate_user_emails(bind: Engine) -> int:
+    """
+    Give all but the oldest user of each case-insensitive email a distinct address.
+
+    Databases created before emails had to be unique ignoring case may hold
+    users such as A@x.com and a@x.com, which would stop the unique lower(email)
+    index from being created. The duplicates get a +duplicate-<id> tag in the
+    local part so they can be told apart and fixed by hand, with the full ID
+    and then a counter if another user already has that address. Every
+    rename is logged. The non-unique index the unique one replaces is
+    dropped. This rewrites user data, so it only runs with
+    python -m app.core.migrations, before create_missing_indexes; running it
+    again renames nothing.
+
+    Args:
+        bind: Engine of the database to migrate
+
+    Returns:
+        Number of users whose email was changed
+    """
+    if not inspect(bind).has_table(UserDB.__tablename__):
+        return 0
+    if "ix_users_email_lower" in _existing_index_names(bind, UserDB.__tablename__):
+        with bind.begin() as conn:
+            conn.execute(text("DROP INDEX ix_users_email_lower"))
+    with Session(bind) as db:
+        duplicated = (
+            select(func.lower(UserDB.email).label("email"))
+            .group_by(func.lower(UserDB.email))
+            .having(func.count() > 1)
+            .subquery()
+        )
+        rows = db.execute(
+            select(UserDB.id, UserDB.email)
+            .join(duplicated, func.lower(UserDB.email) == duplicated.c.email)
+            .order_by(func.lower(UserDB.email), UserDB.created_at, UserDB.id)
+        ).all()
+        oldest = {}
+        renamed = 0
+        for id, email in rows:
+            if oldest.setdefault(email.lower(), id) == id:
+                continue
+            local, _, domain = email.rpartition("@")
+            new_email = _first_free(
+                itertools.chain(
+                    [f"{local}+duplicate-{id[:8]}@{domain}", f"{local}+duplicate-{id}@{domain}"],
+                    (f"{local}+duplicate-{id}-{n}@{domain}" for n in itertools.count(2)),
+                ),
+                lambda candidate: db.scalar(select(exists().where(
+                    func.lower(UserDB.email) == candidate.lower()
+                ))),
+            )
+            db.execute(update(UserDB).where(UserDB.id == id).values(email=new_email))
+            logger.warning("Renamed the email of user %s from %r to %r: it was taken ignoring case", id, email, new_email)
+            renamed += 1
+        db.commit()
+    return renamed
+
+
+def rename_duplicate_data_objects(bind: Engine) -> int:
+    """
+    Rename all but the oldest data object of each name in a domain.
+
+    Bulk creates written before data object names had to be unique within
+    their domain may have left such duplicates, which would stop their
+    unique index from being created. Each duplicate keeps its fields and
+    gets its ID appended to its name, plus a counter if another object of
+    the domain already has that name. Every rename is logged. This rewrites
+    user data, so it only runs with python -m app.core.migrations, before
+    create_missing_indexes; running it again renames nothing.
+
+    Args:
+        bind: Engine of the database to migrate
+
+    Returns:
+        Number of data objects renamed
+    """
+    if not inspect(bind).has_table(DataObjectDB.__tablename__):
+        return 0
+    with Session(bind) as db:
+        data_object = DataObjectDB
+        duplicated = (
+            select(data_object.data_domain_id, data_object.name)
+            .group_by(data_object.data_domain_id, data_object.name)
+            .having(func.count() > 1)
+            .subquery()
+        )
+        rows = db.execute(
+            select(data_object.id, data_object.data_domain_id, data_object.name)
+            .join(
+                duplicated,
+                (data_object.data_domain_id == duplicated.c.data_domain_id) & (data_object.name == duplicated.c.name),
+            )
+            .order_by(data_object.data_domain_id, data_object.name, data_object.created_at, data_object.id)
+        ).all()
+        oldest = {}
+        renamed = 0
+        for id, data_domain_id, name in rows:
+            if oldest.setdefault((data_domain_id, name), id) == id:
+                continue
+            new_name = _first_free(
+                itertools.chain([f"{name}-{id}"], (f"{name}-{id}-{n}" for n in itertools.count(2))),
+                lambda candidate: db.scalar(select(exists().where(
+                    data_object.data_domain_id == data_domain_id, data_object.name == candidate
+                ))),
+            )
+            db.execute(update(data_object).where(data_object.id == id).values(name=new_name))
+            logger.warning(
+                "Renamed data object %s in domain %s from %r to %r: its name was taken", id, data_domain_id, name, new_name
+            )
+            renamed += 1
+        db.commit()
+    return renamed
+
+
+def backfill_user_roles(bind: Engine) -> int:
+    """
+    Create the memberships of requests approved before the user_roles table existed.
+
+    Safe to run again: requests whose membership exists are skipped.
+
+    Args:
+        bind: Engine of the database to migrate
+
+    Returns:
+        Number of memberships created
+    """
+    with Session(bind) as db:
+        request = UserRoleRequestDB
+        approved = db.execute(
+            select(request.id, request.user_id, request.role_id, request.updated_by)
+            .where(
+                request.status == "approved",
+                ~exists().where(UserRoleDB.user_id == request.user_id, UserRoleDB.role_id == request.role_id),
+            )
+        ).all()
+        # A user may have several approved requests for a role but holds it once
+        memberships = {
+            (user_id, role_id): (request_id, updated_by) for request_id, user_id, role_id, updated_by in approved
+        }
+        db.add_all(
+            UserRoleDB(user_id=user_id, role_id=role_id, request_id=request_id, granted_by=updated_by)
+            for (user_id, role_id), (request_id, updated_by) in memberships.items()
+        )
+        db.commit()
+    return len(memberships)
+
+
+if __name__ == "__main__":
+    from app.core.database import engine
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    Base.metadata.create_all(bind=engine)
+    print(f"denied {deny_duplicate_pending_requests(engine)} duplicate pending requests")
+    print(f"renamed {rename_duplicate_data_objects(engine)} duplicate data objects")
+    print(f"renamed {rename_duplicate_user_emails(engine)} duplicate user emails")
+    for name in drop_obsolete_indexes(engine):
+        print(f"dropped index {name}")
+    for name in create_missing_indexes(engine):
+        print(f"created index {name}")
+    print(f"backfilled {backfill_user_roles(engine)} user roles")
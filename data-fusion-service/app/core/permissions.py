@@ -0,0 +1,184 @@
+"""
+Data Fusion Hub Service - Effective Permission Index
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.core.config import settings
+
+# Session.info key holding invalidations to repeat once the session commits
+PENDING_PERMISSION_INVALIDATIONS = "permission_index_invalidations"
+
+
+class PermissionIndex:
+    """
+    In-process index of the roles each user holds, as one bitset per user.
+
+    Every role gets a bit number the first time it is seen, and a user's
+    roles are an int with those bits set, so checking a role is a dictionary
+    lookup and a bit test. Users are loaded on demand and the least recently
+    used are dropped beyond max_users.
+
+    Changes made through this worker drop the users they affect once they
+    commit. A user's roles are reloaded after max_age_seconds, which bounds
+    how long a role granted or revoked by another worker goes unseen.
+    """
+
+    def __init__(self, max_users: int = 10000, max_age_seconds: float = 5.0):
+        self.max_users = max_users
+        self.max_age_seconds = max_age_seconds
+        self._role_bits: Dict[str, int] = {}
+        self._free_bits: List[int] = []
+        # User -> (role bitset, monotonic time it expires at)
+        self._masks: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def _bit(self, role_id: str) -> int:
+        """Get the bit of a role, assigning one if it has none. Call with the lock held."""
+        bit = self._role_bits.get(role_id)
+        if bit is None:
+            bit = self._free_bits.pop() if self._free_bits else len(self._role_bits)
+            self._role_bits[role_id] = bit
+        return bit
+
+    def _get_mask(self, user_id: str) -> Optional[int]:
+        """Get the bitset of a loaded user that has not expired. Call with the lock held."""
+        entry = self._masks.get(user_id)
+        if entry is None:
+            self._counters["misses"] += 1
+            return None
+        mask, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._masks[user_id]
+            self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+            return None
+        self._masks.move_to_end(user_id)
+        self._counters["hits"] += 1
+        return mask
+
+    def has_role(self, user_id: str, role_id: str) -> Optional[bool]:
+        """
+        Check whether a loaded user holds a role.
+
+        Returns:
+            Whether the user holds the role, or None if the user is not loaded
+        """
+        with self._lock:
+            mask = self._get_mask(user_id)
+            if mask is None:
+                return None
+            bit = self._role_bits.get(role_id)
+            return bit is not None and bool(mask >> bit & 1)
+
+    def get_role_ids(self, user_id: str) -> Optional[List[str]]:
+        """
+        Get the roles a loaded user holds.
+
+        Returns:
+            IDs of the user's roles, or None if the user is not loaded
+        """
+        with self._lock:
+            mask = self._get_mask(user_id)
+            if mask is None:
+                return None
+            return [role_id for role_id, bit in self._role_bits.items() if mask >> bit & 1]
+
+    def load(self, user_id: str, role_ids: Iterable[str]) -> None:
+        """Store the complete set of roles a user holds."""
+        with self._lock:
+            mask = 0
+            for role_id in role_ids:
+                mask |= 1 << self._bit(role_id)
+            self._masks[user_id] = (mask, time.monotonic() + self.max_age_seconds)
+            self._masks.move_to_end(user_id)
+            while len(self._masks) > self.max_users:
+                self._masks.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate_user(self, user_id: str, session: Optional[Session] = None) -> None:
+        """
+        Drop a user's roles after a membership of theirs changed.
+
+        With a session the user is dropped again once that session commits,
+        like EntityCache.invalidate, so a reader that loaded the old
+        memberships in the meantime cannot keep them.
+        """
+        with self._lock:
+            if self._masks.pop(user_id, None) is not None:
+                self._counters["invalidations"] += 1
+        self._on_commit(session, self.invalidate_user, user_id)
+
+    def invalidate_role(self, role_id: str, session: Optional[Session] = None) -> None:
+        """
+        Forget a deleted role.
+
+        Every loaded user holding it is dropped, to be reloaded from the
+        database, and its bit is then free to be given to a new role. With a
+        session this is repeated once that session commits, like
+        invalidate_user; the masks are never edited in place, so a rolled
+        back delete leaves nothing to restore.
+        """
+        with self._lock:
+            bit = self._role_bits.pop(role_id, None)
+            if bit is not None:
+                holders = [user_id for user_id, (mask, _) in self._masks.items() if mask >> bit & 1]
+                for user_id in holders:
+                    del self._masks[user_id]
+                    self._counters["invalidations"] += 1
+                self._free_bits.append(bit)
+        self._on_commit(session, self.invalidate_role, role_id)
+
+    @staticmethod
+    def _on_commit(session: Optional[Session], invalidate: Callable[[str], None], key: str) -> None:
+        """Repeat an invalidation once the session commits."""
+        if session is not None:
+            session.info.setdefault(PENDING_PERMISSION_INVALIDATIONS, []).append((invalidate, key))
+
+    def clear(self) -> None:
+        """Drop every loaded user and role."""
+        with self._lock:
+            self._masks.clear()
+            self._role_bits.clear()
+            self._free_bits.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                **self._counters,
+                "users": len(self._masks),
+                "roles": len(self._role_bits),
+                "max_users": self.max_users,
+            }
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    """Repeat the permission invalidations of a transaction once it has committed."""
+    # Also fired when a savepoint is released, before anything is committed
+    if session.in_nested_transaction():
+        return
+    for invalidate, key in session.info.pop(PENDING_PERMISSION_INVALIDATIONS, []):
+        invalidate(key)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending_invalidations(session: Session, transaction: SessionTransaction) -> None:
+    """Forget pending permission invalidations once the outermost transaction ended without committing."""
+    # A rolled back savepoint keeps the outer transaction's invalidations
+    if transaction.parent is None and not transaction.nested:
+        session.info.pop(PENDING_PERMISSION_INVALIDATIONS, None)
+
+
+permission_index = PermissionIndex(
+    max_users=settings.PERMISSION_INDEX_MAX_USERS,
+    max_age_seconds=settings.PERMISSION_INDEX_MAX_AGE_SECONDS,
+)
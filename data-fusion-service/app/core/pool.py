@@ -0,0 +1,142 @@
+"""
+Data Fusion Hub Service - Connection Pool Configuration and Telemetry
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+
+class PoolStats:
+    """Counters for connection checkouts and the time spent waiting for them."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, waited: float, timed_out: bool) -> None:
+        """Record one checkout attempt."""
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the counters as a dict."""
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds,
+                "wait_seconds_max": self.max_wait_seconds,
+                "wait_seconds_avg": self.wait_seconds / attempts if attempts else 0.0,
+            }
+
+
+class MonitoredPoolMixin:
+    """
+    Times every checkout of a queue pool.
+
+    The wait covers queueing for a free connection, opening a new one while
+    overflow allows it and the pre-ping, i.e. everything a request spends
+    before it can talk to the database.
+    """
+
+    stats: PoolStats
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start, timed_out=False)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same stats
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class MonitoredQueuePool(MonitoredPoolMixin, QueuePool):
+    """QueuePool recording checkout wait times and timeouts."""
+
+
+class MonitoredAsyncQueuePool(MonitoredPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool recording checkout wait times and timeouts."""
+
+
+def get_pool_options(database_url: str, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Get the ``create_engine`` pool arguments configured in settings.
+
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool,
+    since every new connection would open an empty database.
+
+    Args:
+        database_url: URL the engine is created for
+        is_async: Whether the engine is created with create_async_engine
+
+    Returns:
+        Keyword arguments for create_engine / create_async_engine
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": MonitoredAsyncQueuePool if is_async else MonitoredQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def get_pool_status(engine: Engine) -> Dict[str, Any]:
+    """
+    Get live statistics of an engine's connection pool.
+
+    Args:
+        engine: Sync engine, or the ``sync_engine`` of an async engine
+
+    Returns:
+        Pool occupancy and, for monitored pools, checkout wait counters
+    """
+    pool = engine.pool
+    status: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # QueuePool counts overflow from -pool_size until the pool is full
+            overflow=max(pool.overflow(), 0),
+            # QueuePool has no public accessor for it; engines get it from settings
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, MonitoredPoolMixin):
+        status.update(pool.stats.snapshot())
+    return status
+
@@ -2,13 +2,20 @@
 Security utilities for Data Fusion Hub Service.
 """
 
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Dict, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import HTTPException, status
 
+from app.core.cache import LRUCacheBackend
+from app.core.config import settings
+from app.models.user import normalize_email
+
 # Secret key to sign the JWT tokens - in production this should be stored securely
 SECRET_KEY = "your-secret-key-here"  # This should be moved to environment variables
 ALGORITHM = "HS256"
@@ -48,4 +55,81 @@ def verify_token(token: str) -> dict:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
+
+
+class TokenClaimsCache:
+    """
+    LRU cache of the claims of tokens that passed verification.
+
+    A cached token is served without decoding it or checking its signature
+    again until its ``exp`` claim passes, so the cache never accepts a token
+    that verify_token would reject. Tokens failing verification are not cached.
+    """
+
+    def __init__(self, max_entries: int = 10000, default_ttl_seconds: float = ACCESS_TOKEN_EXPIRE_MINUTES * 60):
+        self.max_entries = max_entries
+        self.default_ttl_seconds = default_ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verify and decode a JWT token, using the cached claims when possible.
+
+        Args:
+            token: Encoded JWT token
+
+        Returns:
+            The token's claims
+
+        Raises:
+            HTTPException: 401 Unauthorized if the token is invalid or expired
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                expires_at, claims = entry
+                if expires_at > now:
+                    self._entries.move_to_end(token)
+                    self._counters["hits"] += 1
+                    return claims
+                del self._entries[token]
+                self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+
+        claims = verify_token(token)
+        # Tokens without an exp claim never expire for jose; bound them anyway
+        expires_at = claims.get("exp", now + self.default_ttl_seconds)
+        with self._lock:
+            self._entries[token] = (expires_at, claims)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+        return claims
+
+    def clear(self) -> None:
+        """Remove every cached token."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters."""
+        with self._lock:
+            return {**self._counters, "size": len(self._entries), "max_entries": self.max_entries}
+
+
+def user_cache_key(email: str) -> str:
+    """Build the current-user cache key for an email address, ignoring case."""
+    return f"user:{normalize_email(email)}"
+
+
+token_claims_cache = TokenClaimsCache(max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES)
+
+# Users resolved from token subjects; kept briefly, and dropped when a user changes
+current_user_cache = LRUCacheBackend(
+    max_entries=settings.AUTH_USER_CACHE_MAX_ENTRIES, ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS
+)
@@ -2,21 +2,37 @@
 Data Fusion Hub Service - Main Application Entry Point
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from app.api.v1 import datadomains, dataconnectors, dataobjects, users, roles, auth
 from app.api.v1.routes.user_role_requests import router as user_role_requests_router
 from app.api.v1.routes.role_approver_relationships import (
     router as role_approver_relationships_router,
 )
+from app.api.v1.routes.internal import router as internal_router
 from app.core.database import engine, Base
+from app.services.bulk_jobs import bulk_job_runner
+from app.services.password_hasher import PasswordHasherSaturated, password_hasher
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create missing tables on start rather than on import, so importing the
+    # app touches no database; indexes and data fixes for existing databases
+    # are applied with python -m app.core.migrations
+    Base.metadata.create_all(bind=engine)
+    # Pick up bulk jobs left queued or running by a previous process
+    bulk_job_runner.start_polling()
+    yield
+    bulk_job_runner.shutdown()
+    password_hasher.shutdown()
 
 app = FastAPI(
     title="Data Fusion Hub Service",
     description="API for managing data domains, connectors, and objects in the Data Fusion Hub ecosystem",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Include API routers
@@ -28,6 +44,16 @@ app.include_router(roles.router)
 app.include_router(auth.router)
 app.include_router(user_role_requests_router)
 app.include_router(role_approver_relationships_router)
+app.include_router(internal_router)
+
+@app.exception_handler(PasswordHasherSaturated)
+async def password_hasher_saturated_handler(request: Request, exc: PasswordHasherSaturated):
+    # Shed load instead of queueing logins and sign-ups behind a full pool
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
 
 @app.get("/")
 def read_root():
@@ -5,7 +5,7 @@ Data Fusion Hub Service - Models Init File
 from .data_domain import DataDomain, DataDomainCreate, DataDomainUpdate, DataDomainDB
 from .data_connector import DataConnector, DataConnectorCreate, DataConnectorUpdate, DataConnectorDB
 from .data_object import DataObject, DataObjectCreate, DataObjectUpdate, DataObjectDB
-from .user import User, UserCreate, UserUpdate
+from .user import User, UserCreate, UserPublic, UserUpdate
 from .role import Role, RoleCreate, RoleUpdate
 from .login import LoginRequest
 
@@ -0,0 +1,20 @@
+"""
+Data Fusion Hub Service - Batch Get Models
+"""
+
+from pydantic import BaseModel, Field
+from typing import Generic, List, TypeVar
+
+# Largest number of IDs accepted by one batch-get request
+MAX_BATCH_GET_IDS = 10000
+
+T = TypeVar("T")
+
+class BatchGetRequest(BaseModel):
+    """Model for fetching several entities by ID in one request."""
+    ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_GET_IDS, description="IDs to fetch")
+
+class BatchGetResponse(BaseModel, Generic[T]):
+    """Model for returning the entities found for a batch-get request."""
+    data: List[T] = Field(..., description="Entities found, in the order their IDs were requested")
+    missing: List[str] = Field(..., description="Requested IDs with no matching entity")
@@ -0,0 +1,86 @@
+"""
+Data Fusion Hub Service - Bulk Ingestion Job Models
+"""
+
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+import uuid
+from sqlalchemy import Column, String, DateTime, Integer, JSON
+from app.core.database import Base
+
+# Job statuses; queued and running jobs are picked up again after a restart
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+class BulkJobDB(Base):
+    """SQLAlchemy model for database persistence."""
+    __tablename__ = "bulk_jobs"
+
+    id: str = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    mode: str = Column(String, nullable=False)  # 'create' or 'upsert', as for /data-objects/bulk
+    data_domain_id: str = Column(String, nullable=False)
+    payload: List[Dict[str, Any]] = Column(JSON, nullable=False)  # The submitted data objects
+    status: str = Column(String, nullable=False, default=JOB_QUEUED, index=True)
+    total: int = Column(Integer, nullable=False)
+    processed: int = Column(Integer, nullable=False, default=0)  # Also where a resumed job continues
+    succeeded: int = Column(Integer, nullable=False, default=0)
+    failed: int = Column(Integer, nullable=False, default=0)
+    errors: List[Dict[str, Any]] = Column(JSON, nullable=False, default=list)
+    created_by: str = Column(String, nullable=False)
+    created_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # Bumped by the worker around every chunk, so a stale running job can be taken over;
+    # the worker keeps going only while it still holds the value it last wrote
+    updated_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = Column(DateTime)
+    finished_at: Optional[datetime] = Column(DateTime)
+
+class BulkJobError(BaseModel):
+    """Model for a data object a bulk job could not write."""
+    index: int = Field(..., description="Position of the data object in the submitted list")
+    name: str = Field(..., description="Name of the data object")
+    error: str = Field(..., description="Why the data object was not written")
+
+class BulkJob(BaseModel):
+    """Model for returning the progress of a bulk job."""
+    id: str
+    mode: str
+    data_domain_id: str
+    status: str
+    total: int
+    processed: int
+    succeeded: int
+    failed: int
+    errors: List[BulkJobError]
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    progress: float = Field(..., description="Share of the data objects processed, from 0 to 1")
+    items_per_second: Optional[float] = Field(None, description="Data objects processed per second since the job started")
+
+    @classmethod
+    def from_db(cls, job: BulkJobDB) -> "BulkJob":
+        """Build the progress report of a job row."""
+        items_per_second = None
+        if job.started_at is not None:
+            end = job.finished_at or datetime.now(timezone.utc).replace(tzinfo=None)
+            elapsed = (end - job.started_at.replace(tzinfo=None)).total_seconds()
+            items_per_second = job.processed / elapsed if elapsed > 0 else None
+        return cls(
+            id=job.id,
+            mode=job.mode,
+            data_domain_id=job.data_domain_id,
+            status=job.status,
+            total=job.total,
+            processed=job.processed,
+            succeeded=job.succeeded,
+            failed=job.failed,
+            errors=job.errors,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            progress=job.processed / job.total if job.total else 1.0,
+            items_per_second=items_per_second,
+        )
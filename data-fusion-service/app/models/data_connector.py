@@ -6,7 +6,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, JSON
+from sqlalchemy import Column, String, Text, DateTime, JSON, Index
 from app.core.database import Base
 
 class DataConnectorBase(BaseModel):
@@ -39,10 +39,15 @@ class DataConnectorDB(Base):
     type: str = Column(String, nullable=False)  # e.g., 'rest', 'sftp', 'postgresql'
     configuration: Dict[str, Any] = Column(JSON, nullable=False)  # Store as JSON
     authentication: Optional[Dict[str, Any]] = Column(JSON)  # Store as JSON
-    created_by: str = Column(String, nullable=False)
+    created_by: str = Column(String, nullable=False, index=True)
     updated_by: str = Column(String, nullable=False)
     created_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    
+    # Keyset pagination walks (created_at, id) in order
+    __table_args__ = (
+        Index('ix_data_connectors_created_at_id', 'created_at', 'id'),
+    )
 
 class DataConnector(DataConnectorBase):
     """Model for returning a data connector (includes ID and timestamps)."""
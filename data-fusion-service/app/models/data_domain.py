@@ -6,7 +6,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, JSON
+from sqlalchemy import Column, String, Text, DateTime, JSON, Index
 from app.core.database import Base
 
 class DataDomainBase(BaseModel):
@@ -30,10 +30,15 @@ class DataDomainDB(Base):
     id: str = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name: str = Column(String, nullable=False, unique=True)  # Unique constraint enforced at DB level
     description: Optional[str] = Column(Text)
-    created_by: str = Column(String, nullable=False)
+    created_by: str = Column(String, nullable=False, index=True)
     updated_by: str = Column(String, nullable=False)
     created_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    
+    # Keyset pagination walks (created_at, id) in order
+    __table_args__ = (
+        Index('ix_data_domains_created_at_id', 'created_at', 'id'),
+    )
 
 class DataDomain(DataDomainBase):
     """Model for returning a data domain (includes ID and timestamps)."""
@@ -7,6 +7,7 @@ from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 import uuid
 from sqlalchemy import Column, String, Text, DateTime, JSON, Integer, ForeignKey, Boolean, UniqueConstraint
+from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class DataFieldBase(BaseModel):
@@ -47,7 +48,7 @@ class DataFieldDB(Base):
     id: str = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     
     # Foreign key to data object
-    object_id: str = Column(String, ForeignKey("data_objects.id"), nullable=False)
+    object_id: str = Column(String, ForeignKey("data_objects.id"), nullable=False, index=True)
     
     # Fields for the data field
     name: str = Column(String, nullable=False)
@@ -61,11 +62,13 @@ class DataFieldDB(Base):
     numerical_precision: Optional[int] = Column(Integer)
     numerical_scale: Optional[int] = Column(Integer)
     
-    created_by: str = Column(String, nullable=False)
+    created_by: str = Column(String, nullable=False, index=True)
     updated_by: str = Column(String, nullable=False)
     created_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
+    data_object = relationship("DataObjectDB", back_populates="data_fields")
+    
     # Composite unique constraint on (name, object_id)
     __table_args__ = (
         UniqueConstraint('name', 'object_id', name='uq_name_object_id'),
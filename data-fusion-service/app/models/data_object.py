@@ -3,11 +3,13 @@ Data Fusion Hub Service - Data Object Models
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, JSON, ForeignKey, Index
+from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.models.data_field import DataField
 
 class DataObjectBase(BaseModel):
     """Base data object model with common fields."""
@@ -35,11 +37,24 @@ class DataObjectDB(Base):
     name: str = Column(String, nullable=False)
     description: Optional[str] = Column(Text)
     type: str = Column(String, nullable=False)  # e.g., 'table', 'view'
-    data_domain_id: str = Column(String, ForeignKey("data_domains.id"), nullable=False)
-    created_by: str = Column(String, nullable=False)
+    data_domain_id: str = Column(String, ForeignKey("data_domains.id"), nullable=False, index=True)
+    created_by: str = Column(String, nullable=False, index=True)
     updated_by: str = Column(String, nullable=False)
     created_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    
+    # Load with selectinload when needed; deleting an object leaves its fields as before
+    data_fields = relationship("DataFieldDB", back_populates="data_object", passive_deletes="all")
+    
+    # Keyset pagination walks (sort column, id), across the catalog or within a domain
+    __table_args__ = (
+        Index('ix_data_objects_created_at_id', 'created_at', 'id'),
+        Index('ix_data_objects_updated_at_id', 'updated_at', 'id'),
+        Index('ix_data_objects_domain_created_at_id', 'data_domain_id', 'created_at', 'id'),
+        Index('ix_data_objects_domain_updated_at_id', 'data_domain_id', 'updated_at', 'id'),
+        # Natural key matched by bulk upserts
+        Index('uq_data_objects_domain_name', 'data_domain_id', 'name', unique=True),
+    )
 
 class DataObject(DataObjectBase):
     """Model for returning a data object (includes ID and timestamps)."""
@@ -48,4 +63,8 @@ class DataObject(DataObjectBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class DataObjectWithFields(DataObject):
+    """Model for returning a data object together with its data fields."""
+    data_fields: List[DataField]
@@ -42,6 +42,13 @@ class DataObjectBulkResponse(DataObjectBase):
     data_fields: List[DataFieldCreateBulk] = Field(..., description="List of data fields associated with this data object")
 
 
+class DataObjectBulkUpsertResponse(BaseModel):
+    """Model for returning the outcome of a bulk upsert."""
+    created: int = Field(..., description="Number of data objects that did not exist yet")
+    updated: int = Field(..., description="Number of existing data objects with changes, including to their fields")
+    unchanged: int = Field(..., description="Number of existing data objects that already matched the request")
+
+
 class DataObjectBulkCreate(BaseModel):
     """Model for bulk creating multiple data objects."""
     data_domain_id: str = Field(..., description="ID of the data domain these objects belong to")
@@ -26,9 +26,9 @@ class RoleApproverRelationshipDB(Base):
     __tablename__ = "role_approver_relationships"
     
     id: str = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    role_id: str = Column(String, nullable=False)
-    approver_role_id: str = Column(String, nullable=False)
-    created_by: str = Column(String, nullable=False)
+    role_id: str = Column(String, nullable=False, index=True)
+    approver_role_id: str = Column(String, nullable=False, index=True)
+    created_by: str = Column(String, nullable=False, index=True)
     updated_by: str = Column(String, nullable=False)
     created_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
@@ -34,14 +34,14 @@ class RoleInDBBase(RoleBase):
     class Config:
         from_attributes = True
 
-class RoleDB(RoleInDBBase):
+class RoleDB(Base):
     """SQLAlchemy model for database persistence."""
     __tablename__ = "roles"
     
     id: str = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name: str = Column(String, nullable=False, unique=True)  # Unique constraint enforced at DB level
     description: Optional[str] = Column(Text)
-    created_by: str = Column(String, nullable=False)
+    created_by: str = Column(String, nullable=False, index=True)
     updated_by: str = Column(String, nullable=False)
     created_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
@@ -3,11 +3,19 @@ Data Fusion Hub Service - User Model
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 import uuid
 
 from pydantic import BaseModel, EmailStr, Field
 
+# Largest number of users accepted by one bulk import request
+MAX_BULK_USERS = 5000
+
+
+def normalize_email(email: str) -> str:
+    """Get the form of an email that users are matched and kept unique on."""
+    return email.strip().lower()
+
 
 class UserBase(BaseModel):
     """Base user model for shared fields."""
@@ -27,6 +35,11 @@ class UserUpdate(UserBase):
     password: Optional[str] = Field(None, min_length=6, max_length=255)
 
 
+class UserBulkCreate(BaseModel):
+    """User model for importing several users in one request."""
+    users: List[UserCreate] = Field(..., min_length=1, max_length=MAX_BULK_USERS, description="Users to create")
+
+
 class UserInDBBase(UserBase):
     """Base user model for database operations."""
     id: str = Field(..., description="UUID of the user")
@@ -39,6 +52,10 @@ class UserInDBBase(UserBase):
         from_attributes = True
 
 
+class UserPublic(UserInDBBase):
+    """User model for responses and caches that must not carry the password hash."""
+
+
 class User(UserInDBBase):
     """User model for API responses."""
     password_hash: Optional[str] = Field(None, max_length=255)
@@ -6,7 +6,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, JSON
+from sqlalchemy import Column, String, Text, DateTime, JSON, Index, func
 from app.core.database import Base
 
 class UserBase(BaseModel):
@@ -30,14 +30,20 @@ class UserDB(Base):
     __tablename__ = "users"
     
     id: str = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    username: str = Column(String, nullable=False, unique=True)  # Unique constraint enforced at DB level
     email: str = Column(String, nullable=False, unique=True)  # Unique constraint enforced at DB level
-    full_name: str = Column(String, nullable=False)
-    hashed_password: str = Column(String, nullable=False)
-    created_by: str = Column(String, nullable=False)
-    updated_by: str = Column(String, nullable=False)
+    first_name: str = Column(String, nullable=False)
+    middle_name: Optional[str] = Column(String)
+    last_name: str = Column(String, nullable=False)
+    password_hash: Optional[str] = Column(String)  # Null for social login users
+    created_by: Optional[str] = Column(String, index=True)
+    updated_by: Optional[str] = Column(String)
     created_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    
+    # Login looks users up by case-normalized email, so it must be unique too
+    __table_args__ = (
+        Index('uq_users_email_lower', func.lower(email), unique=True),
+    )
 
 class User(UserBase):
     """Model for returning a user (includes ID and timestamps)."""
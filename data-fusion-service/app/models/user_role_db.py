@@ -0,0 +1,32 @@
+"""
+Data Fusion Hub Service - User Role Membership Database Model
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+import uuid
+
+from sqlalchemy import Column, DateTime, Index, String
+from app.core.database import Base
+
+
+class UserRoleDB(Base):
+    """
+    A role held by a user.
+
+    Rows are written in the transaction that approves a role request, so
+    authorization checks read memberships instead of scanning requests.
+    """
+    __tablename__ = "user_roles"
+
+    id: str = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id: str = Column(String, nullable=False)
+    role_id: str = Column(String, nullable=False, index=True)
+    request_id: Optional[str] = Column(String)
+    granted_by: str = Column(String, nullable=False)
+    created_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    # Also serves "roles of a user" lookups through its leading column
+    __table_args__ = (
+        Index('uq_user_roles_user_role', 'user_id', 'role_id', unique=True),
+    )
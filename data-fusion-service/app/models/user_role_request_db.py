@@ -3,10 +3,10 @@ Data Fusion Hub Service - User Role Request Database Model
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Literal
 from datetime import datetime, timezone
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, Enum
+from sqlalchemy import Column, String, Text, DateTime, Enum, Index, text
 from app.core.database import Base
 
 
@@ -29,20 +29,55 @@ class UserRoleRequestUpdate(BaseModel):
     reason: Optional[str] = None
 
 
+# Largest number of requests decided by one bulk decision
+MAX_BULK_DECISION_IDS = 10000
+
+
+class UserRoleRequestBulkDecision(BaseModel):
+    """Model for approving or denying several pending requests at once."""
+    request_ids: List[str] = Field(
+        ..., min_length=1, max_length=MAX_BULK_DECISION_IDS, description="Requests to decide"
+    )
+    status: Literal["approved", "denied"] = Field(..., description="Decision applied to every request")
+    reason: Optional[str] = Field(None, description="Optional reason for approval/denial")
+
+
+class UserRoleRequestBulkDecisionResponse(BaseModel):
+    """Model for reporting the outcome of a bulk decision."""
+    status: str
+    updated: List[str] = Field(..., description="Requests that were pending and now carry the decision")
+    skipped: List[str] = Field(..., description="Requests that were not found or no longer pending")
+
+
 class UserRoleRequestDB(Base):
     """SQLAlchemy model for database persistence."""
     __tablename__ = "user_role_requests"
     
     id: str = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id: str = Column(String, nullable=False)
+    user_id: str = Column(String, nullable=False, index=True)
     role_id: str = Column(String, nullable=False)  
     justification: str = Column(Text, nullable=False)
     reason: Optional[str] = Column(Text)
-    status: str = Column(String, nullable=False, default="pending")
-    created_by: str = Column(String, nullable=False)
+    status: str = Column(String, nullable=False, default="pending", index=True)
+    created_by: str = Column(String, nullable=False, index=True)
     updated_by: str = Column(String, nullable=False)
     created_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    
+    __table_args__ = (
+        # Approver inboxes look up pending requests for a set of roles
+        Index('ix_user_role_requests_status_role_id', 'status', 'role_id'),
+        # Queue listings filter on these columns and page through (created_at, id)
+        Index('ix_user_role_requests_created_at_id', 'created_at', 'id'),
+        Index('ix_user_role_requests_status_created_at_id', 'status', 'created_at', 'id'),
+        Index('ix_user_role_requests_role_status_created_at_id', 'role_id', 'status', 'created_at', 'id'),
+        Index('ix_user_role_requests_user_created_at_id', 'user_id', 'created_at', 'id'),
+        # At most one pending request per user and role, so retries do not pile up in queues
+        Index(
+            'uq_user_role_requests_pending_user_role', 'user_id', 'role_id', unique=True,
+            sqlite_where=text("status = 'pending'"), postgresql_where=text("status = 'pending'")
+        ),
+    )
 
 
 class UserRoleRequest(UserRoleRequestBase):
@@ -0,0 +1,159 @@
+"""
+Data Fusion Hub Service - Async Concrete Role Repository Implementation
+"""
+
+from typing import List, Optional
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+
+from app.core.permissions import permission_index
+from app.models.role import Role, RoleCreate, RoleUpdate
+from app.models.role_db import RoleDB
+from app.models.user_role_db import UserRoleDB
+from app.repositories.role_repository import RoleRepository
+from app.utils.batch import chunked, unique_ids
+
+
+class AsyncConcreteRoleRepository(RoleRepository):
+    """Concrete implementation of role repository on top of an async session."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create(self, role: RoleCreate, created_by: Optional[str] = None) -> Role:
+        """
+        Create a new role.
+        
+        Args:
+            role: Role data to create
+            created_by: Identifier of the user/system that created the role
+            
+        Returns:
+            Created role with generated ID
+        """
+        db_role = RoleDB(
+            name=role.name,
+            description=role.description,
+            created_by=created_by,
+            updated_by=created_by
+        )
+        
+        try:
+            async with self.db.begin_nested():
+                self.db.add(db_role)
+        except IntegrityError:
+            raise ValueError(f"Role with name '{role.name}' already exists")
+        
+        return Role.model_validate(db_role)
+    
+    async def get_by_id(self, role_id: str) -> Optional[Role]:
+        """
+        Get role by ID.
+        
+        Args:
+            role_id: UUID of the role to retrieve
+            
+        Returns:
+            Role if found, None otherwise
+        """
+        db_role = await self._get_db_role(role_id)
+        return Role.model_validate(db_role) if db_role else None
+    
+    async def get_many(self, role_ids: List[str]) -> List[Role]:
+        """
+        Get the roles with the given IDs with one IN query per chunk of IDs.
+        
+        Args:
+            role_ids: UUIDs of the roles to retrieve
+            
+        Returns:
+            The roles found, in no particular order
+        """
+        roles = []
+        for chunk in chunked(unique_ids(role_ids)):
+            result = await self.db.execute(select(RoleDB).where(RoleDB.id.in_(chunk)))
+            roles.extend(Role.model_validate(db_role) for db_role in result.scalars().all())
+        return roles
+    
+    async def get_all(self, skip: int = 0, limit: Optional[int] = None) -> List[Role]:
+        """
+        Get all roles.
+        
+        Args:
+            skip: Number of roles to skip
+            limit: Maximum number of roles to return, or None for all
+            
+        Returns:
+            List of roles
+        """
+        result = await self.db.execute(select(RoleDB).offset(skip).limit(limit))
+        return [Role.model_validate(role) for role in result.scalars().all()]
+    
+    async def update(self, role_id: str, role_update: RoleUpdate, updated_by: Optional[str] = None) -> Optional[Role]:
+        """
+        Update an existing role.
+        
+        Args:
+            role_id: UUID of the role to update
+            role_update: Updated role data
+            updated_by: Identifier of the user/system that updated the role
+            
+        Returns:
+            Updated role if found, None otherwise
+        """
+        db_role = await self._get_db_role(role_id)
+        if not db_role:
+            return None
+        
+        try:
+            async with self.db.begin_nested():
+                for key, value in role_update.model_dump(exclude_unset=True).items():
+                    setattr(db_role, key, value)
+                
+                if updated_by is not None:
+                    db_role.updated_by = updated_by
+        except IntegrityError:
+            raise ValueError(f"Role with name '{role_update.name}' already exists")
+        
+        return Role.model_validate(db_role)
+    
+    async def delete(self, role_id: str) -> bool:
+        """
+        Delete a role.
+        
+        Args:
+            role_id: UUID of the role to delete
+            
+        Returns:
+            True if deleted, False if not found
+        """
+        db_role = await self._get_db_role(role_id)
+        if not db_role:
+            return False
+        
+        # Memberships go with the role, and so does its bit in the permission index
+        await self.db.execute(delete(UserRoleDB).where(UserRoleDB.role_id == role_id))
+        await self.db.delete(db_role)
+        await self.db.flush()
+        permission_index.invalidate_role(role_id, self.db.sync_session)
+        return True
+    
+    async def get_by_name(self, name: str) -> Optional[Role]:
+        """
+        Get role by name.
+        
+        Args:
+            name: Name of the role to retrieve
+            
+        Returns:
+            Role if found, None otherwise
+        """
+        result = await self.db.execute(select(RoleDB).where(RoleDB.name == name))
+        db_role = result.scalars().first()
+        return Role.model_validate(db_role) if db_role else None
+    
+    async def _get_db_role(self, role_id: str) -> Optional[RoleDB]:
+        """Load the ORM row for a role ID."""
+        result = await self.db.execute(select(RoleDB).where(RoleDB.id == role_id))
+        return result.scalars().first()
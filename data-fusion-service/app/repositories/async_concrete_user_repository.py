@@ -0,0 +1,247 @@
+"""
+Data Fusion Hub Service - Async Concrete User Repository Implementation
+"""
+
+from collections import Counter
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+
+from app.core.cache import invalidate_on_commit
+from app.core.security import current_user_cache, user_cache_key
+from app.models.user import User, UserCreate, UserUpdate, normalize_email
+from app.models.user_db import UserDB
+from app.repositories.user_repository import UserRepository
+from app.utils.batch import chunked, unique_ids
+from app.services.password_hasher import password_hasher
+
+
+class AsyncConcreteUserRepository(UserRepository):
+    """Concrete implementation of user repository on top of an async session."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create(self, user: UserCreate, created_by: Optional[str] = None) -> User:
+        """
+        Create a new user.
+        
+        Args:
+            user: User data to create
+            created_by: Identifier of the entity that created this user
+            
+        Returns:
+            Created user object
+        """
+        if await self._find_taken_emails([user.email]):
+            raise ValueError(f"User with email '{user.email}' already exists")
+        
+        # Handle password hashing if provided
+        password_hash = None
+        if hasattr(user, 'password') and user.password:
+            password_hash = await password_hasher.hash(user.password)
+        
+        db_user = UserDB(
+            email=user.email,
+            first_name=user.first_name,
+            middle_name=user.middle_name,
+            last_name=user.last_name,
+            password_hash=password_hash,
+            created_by=created_by,
+            updated_by=created_by
+        )
+        
+        try:
+            async with self.db.begin_nested():
+                self.db.add(db_user)
+        except IntegrityError:
+            raise ValueError(f"User with email '{user.email}' already exists")
+        
+        return User.model_validate(db_user)
+    
+    async def create_many(self, users: List[UserCreate], created_by: Optional[str] = None) -> List[User]:
+        """
+        Create several users, hashing their passwords in parallel.
+
+        Emails already taken, or repeated in the request, are found before
+        any password is hashed and reported together. The users are then
+        inserted with one flush.
+        
+        Args:
+            users: User data to create
+            created_by: Identifier of the entity that created these users
+            
+        Returns:
+            Created user objects, in the order given
+        """
+        emails = [normalize_email(user.email) for user in users]
+        conflicts = {email for email, count in Counter(emails).items() if count > 1}
+        conflicts.update(await self._find_taken_emails(emails))
+        if conflicts:
+            raise ValueError(f"Users with these emails already exist or are repeated: {', '.join(sorted(conflicts))}")
+        
+        password_hashes = await password_hasher.hash_many([user.password for user in users])
+        db_users = [
+            UserDB(
+                email=user.email,
+                first_name=user.first_name,
+                middle_name=user.middle_name,
+                last_name=user.last_name,
+                password_hash=password_hash,
+                created_by=created_by,
+                updated_by=created_by
+            )
+            for user, password_hash in zip(users, password_hashes)
+        ]
+        
+        try:
+            async with self.db.begin_nested():
+                self.db.add_all(db_users)
+        except IntegrityError:
+            raise ValueError("A user with one of these emails was created concurrently")
+        
+        return [User.model_validate(db_user) for db_user in db_users]
+    
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        """
+        Get a user by ID.
+        
+        Args:
+            user_id: UUID of the user to retrieve
+            
+        Returns:
+            User if found, None otherwise
+        """
+        db_user = await self._get_db_user(user_id)
+        return User.model_validate(db_user) if db_user else None
+    
+    async def get_many(self, user_ids: List[str]) -> List[User]:
+        """
+        Get the users with the given IDs with one IN query per chunk of IDs.
+        
+        Args:
+            user_ids: UUIDs of the users to retrieve
+            
+        Returns:
+            The users found, in no particular order
+        """
+        users = []
+        for chunk in chunked(unique_ids(user_ids)):
+            result = await self.db.execute(select(UserDB).where(UserDB.id.in_(chunk)))
+            users.extend(User.model_validate(db_user) for db_user in result.scalars().all())
+        return users
+    
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """
+        Get a user by email, ignoring case.
+        
+        Args:
+            email: Email address of the user to retrieve
+            
+        Returns:
+            User if found, None otherwise
+        """
+        result = await self.db.execute(
+            select(UserDB).where(func.lower(UserDB.email) == normalize_email(email))
+        )
+        db_user = result.scalars().first()
+        return User.model_validate(db_user) if db_user else None
+    
+    async def get_all(self) -> List[User]:
+        """
+        Get all users.
+        
+        Returns:
+            List of all users
+        """
+        result = await self.db.execute(select(UserDB))
+        return [User.model_validate(user) for user in result.scalars().all()]
+    
+    async def update(self, user_id: str, user_update: UserUpdate, updated_by: Optional[str] = None) -> Optional[User]:
+        """
+        Update an existing user.
+        
+        Args:
+            user_id: UUID of the user to update
+            user_update: Updated user data
+            updated_by: Identifier of the entity that updated this user
+            
+        Returns:
+            Updated user if found, None otherwise
+        """
+        db_user = await self._get_db_user(user_id)
+        if not db_user:
+            return None
+        if await self._find_taken_emails([user_update.email], exclude_user_id=user_id):
+            raise ValueError(f"User with email '{user_update.email}' already exists")
+        self._invalidate_cached_user(db_user.email)
+        
+        # Handle password hashing if provided in update
+        password_hash = getattr(user_update, 'password', None)
+        if password_hash is not None:
+            password_hash = await password_hasher.hash(password_hash)
+        
+        try:
+            async with self.db.begin_nested():
+                # The plain-text password is never stored on the row
+                for key, value in user_update.model_dump(exclude_unset=True, exclude={"password"}).items():
+                    setattr(db_user, key, value)
+                
+                if updated_by is not None:
+                    db_user.updated_by = updated_by
+                
+                if password_hash is not None:
+                    db_user.password_hash = password_hash
+        except IntegrityError:
+            raise ValueError(f"User with email '{user_update.email}' already exists")
+        
+        return User.model_validate(db_user)
+    
+    async def delete(self, user_id: str) -> bool:
+        """
+        Delete a user.
+        
+        Args:
+            user_id: UUID of the user to delete
+            
+        Returns:
+            True if deleted, False if not found
+        """
+        db_user = await self._get_db_user(user_id)
+        if not db_user:
+            return False
+        self._invalidate_cached_user(db_user.email)
+        
+        await self.db.delete(db_user)
+        await self.db.flush()
+        return True
+    
+    async def _find_taken_emails(self, emails: Iterable[str], exclude_user_id: Optional[str] = None) -> Set[str]:
+        """
+        Get which emails existing users hold, ignoring case, with one IN query per chunk.
+        
+        Create, bulk create and update all check emails here, so they agree
+        on what counts as taken; the unique lower(email) index backs them up.
+        
+        Returns:
+            The normalized emails that are taken
+        """
+        taken = set()
+        for chunk in chunked(unique_ids(normalize_email(email) for email in emails)):
+            query = select(func.lower(UserDB.email)).where(func.lower(UserDB.email).in_(chunk))
+            if exclude_user_id is not None:
+                query = query.where(UserDB.id != exclude_user_id)
+            taken.update((await self.db.execute(query)).scalars())
+        return taken
+    
+    async def _get_db_user(self, user_id: str) -> Optional[UserDB]:
+        """Load the ORM row for a user ID."""
+        result = await self.db.execute(select(UserDB).where(UserDB.id == user_id))
+        return result.scalars().first()
+    
+    def _invalidate_cached_user(self, email: str) -> None:
+        """Drop a user from the current-user cache now and once the change commits."""
+        key = user_cache_key(email)
+        current_user_cache.delete(key)
+        invalidate_on_commit(current_user_cache, key, self.db.sync_session)
@@ -0,0 +1,102 @@
+"""
+Data Fusion Hub Service - Bulk Job Repository
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import Session
+
+from app.models.bulk_job import BulkJobDB, JOB_QUEUED, JOB_RUNNING
+from app.models.data_object_bulk import DataObjectCreateBulk
+
+
+class BulkJobRepository:
+    """Repository for bulk ingestion job operations."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(
+        self, mode: str, data_domain_id: str, data_objects: List[DataObjectCreateBulk], created_by: str
+    ) -> BulkJobDB:
+        """Queue a bulk job holding the data objects to write."""
+        job = BulkJobDB(
+            mode=mode,
+            data_domain_id=data_domain_id,
+            payload=[data_object.model_dump() for data_object in data_objects],
+            status=JOB_QUEUED,
+            total=len(data_objects),
+            processed=0,
+            succeeded=0,
+            failed=0,
+            errors=[],
+            created_by=created_by,
+        )
+        self.db.add(job)
+        self.db.flush()
+        return job
+
+    def get_by_id(self, id: str) -> Optional[BulkJobDB]:
+        """Get a bulk job by ID."""
+        return self.db.query(BulkJobDB).filter(BulkJobDB.id == id).first()
+
+    def get_resumable_ids(self, stale_after: float) -> List[str]:
+        """Get the IDs of queued jobs and of running jobs whose worker stopped reporting progress."""
+        return [row.id for row in self.db.query(BulkJobDB.id).filter(self._claimable(stale_after))]
+
+    def claim(self, id: str, stale_after: float) -> bool:
+        """
+        Mark a job as running by this worker.
+
+        The check and the update are one statement, so when several workers
+        try to claim the same job only one of them gets it.
+
+        Args:
+            id: ID of the job
+            stale_after: Seconds without progress after which a running job
+                is considered abandoned
+
+        Returns:
+            True if the job was claimed
+        """
+        now = datetime.now(timezone.utc)
+        result = self.db.execute(
+            update(BulkJobDB)
+            .where(BulkJobDB.id == id, self._claimable(stale_after))
+            .values(status=JOB_RUNNING, updated_at=now)
+        )
+        return result.rowcount == 1
+
+    def heartbeat(self, id: str, seen: datetime, now: datetime) -> bool:
+        """
+        Record that the worker running a job is alive, if the job is still its own.
+
+        The job is only touched if its updated_at is still the value this
+        worker last wrote; a different value means another worker has taken
+        the job over. Check and update are one statement, like claim.
+
+        Args:
+            id: ID of the job
+            seen: updated_at as this worker last wrote or read it
+            now: New updated_at
+
+        Returns:
+            True if the job is still owned and was touched
+        """
+        result = self.db.execute(
+            update(BulkJobDB)
+            .where(BulkJobDB.id == id, BulkJobDB.status == JOB_RUNNING, BulkJobDB.updated_at == seen)
+            .values(updated_at=now)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def _claimable(stale_after: float):
+        """Condition matching the jobs a worker may take."""
+        stale = datetime.now(timezone.utc) - timedelta(seconds=stale_after)
+        return or_(
+            BulkJobDB.status == JOB_QUEUED,
+            and_(BulkJobDB.status == JOB_RUNNING, BulkJobDB.updated_at < stale),
+        )
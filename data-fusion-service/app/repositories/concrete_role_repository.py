@@ -4,12 +4,16 @@ Data Fusion Hub Service - Concrete Role Repository Implementation
 
 from typing import List, Optional
 from uuid import UUID
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
+from app.core.permissions import permission_index
 from app.models.role import Role, RoleCreate, RoleUpdate
 from app.models.role_db import RoleDB
+from app.models.user_role_db import UserRoleDB
 from app.repositories.role_repository import RoleRepository
+from app.utils.batch import chunked, unique_ids
 
 
 class ConcreteRoleRepository(RoleRepository):
@@ -37,12 +41,10 @@ class ConcreteRoleRepository(RoleRepository):
             updated_by=created_by
         )
         
-        self.db.add(db_role)
         try:
-            self.db.commit()
-            self.db.refresh(db_role)
+            with self.db.begin_nested():
+                self.db.add(db_role)
         except IntegrityError:
-            self.db.rollback()
             raise ValueError(f"Role with name '{role.name}' already exists")
         
         # Convert back to Pydantic model using automatic conversion
@@ -61,6 +63,22 @@ class ConcreteRoleRepository(RoleRepository):
         db_role = self.db.query(RoleDB).filter(RoleDB.id == role_id).first()
         return Role.model_validate(db_role) if db_role else None
     
+    async def get_many(self, role_ids: List[str]) -> List[Role]:
+        """
+        Get the roles with the given IDs with one IN query per chunk of IDs.
+        
+        Args:
+            role_ids: UUIDs of the roles to retrieve
+            
+        Returns:
+            The roles found, in no particular order
+        """
+        roles = []
+        for chunk in chunked(unique_ids(role_ids)):
+            db_roles = self.db.query(RoleDB).filter(RoleDB.id.in_(chunk)).all()
+            roles.extend(Role.model_validate(db_role) for db_role in db_roles)
+        return roles
+    
     async def get_all(self) -> List[Role]:
         """
         Get all roles.
@@ -87,19 +105,16 @@ class ConcreteRoleRepository(RoleRepository):
         if not db_role:
             return None
         
-        # Update fields
-        for key, value in role_update.dict(exclude_unset=True).items():
-            setattr(db_role, key, value)
-        
-        # Set updated_by field
-        if updated_by is not None:
-            db_role.updated_by = updated_by
-        
         try:
-            self.db.commit()
-            self.db.refresh(db_role)
+            with self.db.begin_nested():
+                # Update fields
+                for key, value in role_update.dict(exclude_unset=True).items():
+                    setattr(db_role, key, value)
+                
+                # Set updated_by field
+                if updated_by is not None:
+                    db_role.updated_by = updated_by
         except IntegrityError:
-            self.db.rollback()
             raise ValueError(f"Role with name '{role_update.name}' already exists")
         
         return Role.model_validate(db_role)
@@ -118,8 +133,11 @@ class ConcreteRoleRepository(RoleRepository):
         if not db_role:
             return False
         
+        # Memberships go with the role, and so does its bit in the permission index
+        self.db.execute(delete(UserRoleDB).where(UserRoleDB.role_id == role_id))
         self.db.delete(db_role)
-        self.db.commit()
+        self.db.flush()
+        permission_index.invalidate_role(role_id, self.db)
         return True
     
     async def get_by_name(self, name: str) -> Optional[Role]:
@@ -3,13 +3,17 @@ Data Fusion Hub Service - Concrete User Repository Implementation
 """
 
 from typing import List, Optional
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
-from app.models.user import User, UserCreate, UserUpdate
+from app.core.cache import invalidate_on_commit
+from app.core.security import current_user_cache, user_cache_key
+from app.models.user import User, UserCreate, UserUpdate, normalize_email
 from app.models.user_db import UserDB
 from app.repositories.user_repository import UserRepository
-from app.utils.password_utils import hash_password
+from app.services.password_hasher import password_hasher
+from app.utils.batch import chunked, unique_ids
 
 
 class ConcreteUserRepository(UserRepository):
@@ -29,7 +33,7 @@ class ConcreteUserRepository(UserRepository):
         # Handle password hashing if provided
         password_hash = None
         if hasattr(user, 'password') and user.password:
-            password_hash = hash_password(user.password)
+            password_hash = await password_hasher.hash(user.password)
         
         # Convert Pydantic model to database model
         db_user = UserDB(
@@ -42,12 +46,10 @@ class ConcreteUserRepository(UserRepository):
             updated_by=created_by
         )
         
-        self.db.add(db_user)
         try:
-            self.db.commit()
-            self.db.refresh(db_user)
+            with self.db.begin_nested():
+                self.db.add(db_user)
         except IntegrityError:
-            self.db.rollback()
             raise ValueError(f"User with email '{user.email}' already exists")
         
         # Convert back to Pydantic model - now using automatic conversion
@@ -66,9 +68,25 @@ class ConcreteUserRepository(UserRepository):
         db_user = self.db.query(UserDB).filter(UserDB.id == user_id).first()
         return User.model_validate(db_user) if db_user else None
     
+    async def get_many(self, user_ids: List[str]) -> List[User]:
+        """
+        Get the users with the given IDs with one IN query per chunk of IDs.
+        
+        Args:
+            user_ids: UUIDs of the users to retrieve
+            
+        Returns:
+            The users found, in no particular order
+        """
+        users = []
+        for chunk in chunked(unique_ids(user_ids)):
+            db_users = self.db.query(UserDB).filter(UserDB.id.in_(chunk)).all()
+            users.extend(User.model_validate(db_user) for db_user in db_users)
+        return users
+    
     async def get_by_email(self, email: str) -> Optional[User]:
         """
-        Get a user by email.
+        Get a user by email, ignoring case.
         
         Args:
             email: Email address of the user to retrieve
@@ -76,7 +94,7 @@ class ConcreteUserRepository(UserRepository):
         Returns:
             User if found, None otherwise
         """
-        db_user = self.db.query(UserDB).filter(UserDB.email == email).first()
+        db_user = self.db.query(UserDB).filter(func.lower(UserDB.email) == normalize_email(email)).first()
         return User.model_validate(db_user) if db_user else None
     
     async def get_all(self) -> List[User]:
@@ -105,28 +123,26 @@ class ConcreteUserRepository(UserRepository):
         db_user = self.db.query(UserDB).filter(UserDB.id == user_id).first()
         if not db_user:
             return None
+        self._invalidate_cached_user(db_user.email)
         
         # Handle password hashing if provided in update
         password_hash = getattr(user_update, 'password', None)
         if password_hash is not None:
-            password_hash = hash_password(password_hash)
-        
-        # Update fields
-        for key, value in user_update.dict(exclude_unset=True).items():
-            setattr(db_user, key, value)
-        
-        # Set updated_by field and password_hash if needed
-        if updated_by is not None:
-            db_user.updated_by = updated_by
+            password_hash = await password_hasher.hash(password_hash)
         
-        if password_hash is not None:
-            db_user.password_hash = password_hash
-            
         try:
-            self.db.commit()
-            self.db.refresh(db_user)
+            with self.db.begin_nested():
+                # The plain-text password is never stored on the row
+                for key, value in user_update.model_dump(exclude_unset=True, exclude={"password"}).items():
+                    setattr(db_user, key, value)
+                
+                # Set updated_by field and password_hash if needed
+                if updated_by is not None:
+                    db_user.updated_by = updated_by
+                
+                if password_hash is not None:
+                    db_user.password_hash = password_hash
         except IntegrityError:
-            self.db.rollback()
             raise ValueError(f"User with email '{user_update.email}' already exists")
         
         return User.model_validate(db_user)
@@ -144,7 +160,14 @@ class ConcreteUserRepository(UserRepository):
         db_user = self.db.query(UserDB).filter(UserDB.id == user_id).first()
         if not db_user:
             return False
+        self._invalidate_cached_user(db_user.email)
         
         self.db.delete(db_user)
-        self.db.commit()
-        return True
\ No newline at end of file
+        self.db.flush()
+        return True
+    
+    def _invalidate_cached_user(self, email: str) -> None:
+        """Drop a user from the current-user cache now and once the change commits."""
+        key = user_cache_key(email)
+        current_user_cache.delete(key)
+        invalidate_on_commit(current_user_cache, key, self.db)
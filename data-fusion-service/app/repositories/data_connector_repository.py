@@ -2,24 +2,42 @@
 Data Fusion Hub Service - Data Connector Repository
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from app.core.cache import EntityCache, entity_cache
 from app.models.data_connector import DataConnectorDB, DataConnectorCreate, DataConnectorUpdate
+from app.utils.pagination import paginate_keyset
 from datetime import datetime, timezone
 
 
 class DataConnectorRepository:
     """Repository for data connector operations."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: EntityCache = entity_cache):
         self.db = db
+        self.cache = cache
     
     def get_all(self) -> List[DataConnectorDB]:
         """Get all data connectors."""
         return self.db.query(DataConnectorDB).all()
     
+    def get_page(self, limit: int, cursor: Optional[str] = None, offset: int = 0) -> Tuple[List[DataConnectorDB], Optional[str]]:
+        """Get one page of data connectors ordered by (created_at, id), plus the next page cursor."""
+        return paginate_keyset(
+            self.db.query(DataConnectorDB), DataConnectorDB.created_at, DataConnectorDB.id, limit, cursor=cursor, offset=offset
+        )
+    
+    def count(self) -> int:
+        """Count all data connectors."""
+        return self.db.query(func.count(DataConnectorDB.id)).scalar()
+    
     def get_by_id(self, id: str) -> Optional[DataConnectorDB]:
-        """Get a data connector by ID."""
+        """Get a data connector by ID, served from the entity cache when possible."""
+        return self.cache.get_or_load(DataConnectorDB, id, lambda: self._get_db_row(id), self.db)
+    
+    def _get_db_row(self, id: str) -> Optional[DataConnectorDB]:
+        """Load a data connector row attached to this session."""
         return self.db.query(DataConnectorDB).filter(DataConnectorDB.id == id).first()
     
     def create(self, data_connector_create: DataConnectorCreate, created_by: str) -> DataConnectorDB:
@@ -36,13 +54,12 @@ class DataConnectorRepository:
         )
         
         self.db.add(db_data_connector)
-        self.db.commit()
-        self.db.refresh(db_data_connector)
+        self.db.flush()
         return db_data_connector
     
     def update(self, id: str, data_connector_update: DataConnectorUpdate, updated_by: str) -> Optional[DataConnectorDB]:
         """Update an existing data connector."""
-        db_data_connector = self.get_by_id(id)
+        db_data_connector = self._get_db_row(id)
         if not db_data_connector:
             return None
         
@@ -61,16 +78,17 @@ class DataConnectorRepository:
         db_data_connector.updated_by = updated_by
         db_data_connector.updated_at = datetime.now(timezone.utc)
         
-        self.db.commit()
-        self.db.refresh(db_data_connector)
+        self.db.flush()
+        self.cache.invalidate(DataConnectorDB, id, self.db)
         return db_data_connector
     
     def delete(self, id: str) -> bool:
         """Delete a data connector."""
-        db_data_connector = self.get_by_id(id)
+        db_data_connector = self._get_db_row(id)
         if not db_data_connector:
             return False
         
         self.db.delete(db_data_connector)
-        self.db.commit()
+        self.db.flush()
+        self.cache.invalidate(DataConnectorDB, id, self.db)
         return True
\ No newline at end of file
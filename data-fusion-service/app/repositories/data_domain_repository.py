@@ -2,24 +2,50 @@
 Data Fusion Hub Service - Data Domain Repository
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from app.core.cache import EntityCache, entity_cache
 from app.models.data_domain import DataDomainDB, DataDomainCreate, DataDomainUpdate
+from app.utils.batch import chunked, unique_ids
+from app.utils.pagination import paginate_keyset
 from datetime import datetime, timezone
 
 
 class DataDomainRepository:
     """Repository for data domain operations."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: EntityCache = entity_cache):
         self.db = db
+        self.cache = cache
     
     def get_all(self) -> List[DataDomainDB]:
         """Get all data domains."""
         return self.db.query(DataDomainDB).all()
     
+    def get_page(self, limit: int, cursor: Optional[str] = None, offset: int = 0) -> Tuple[List[DataDomainDB], Optional[str]]:
+        """Get one page of data domains ordered by (created_at, id), plus the next page cursor."""
+        return paginate_keyset(
+            self.db.query(DataDomainDB), DataDomainDB.created_at, DataDomainDB.id, limit, cursor=cursor, offset=offset
+        )
+    
+    def count(self) -> int:
+        """Count all data domains."""
+        return self.db.query(func.count(DataDomainDB.id)).scalar()
+    
     def get_by_id(self, id: str) -> Optional[DataDomainDB]:
-        """Get a data domain by ID."""
+        """Get a data domain by ID, served from the entity cache when possible."""
+        return self.cache.get_or_load(DataDomainDB, id, lambda: self._get_db_row(id), self.db)
+    
+    def get_many(self, ids: List[str]) -> List[DataDomainDB]:
+        """Get the data domains with the given IDs, in no particular order, with one IN query per chunk of IDs."""
+        rows = []
+        for chunk in chunked(unique_ids(ids)):
+            rows.extend(self.db.query(DataDomainDB).filter(DataDomainDB.id.in_(chunk)).all())
+        return rows
+    
+    def _get_db_row(self, id: str) -> Optional[DataDomainDB]:
+        """Load a data domain row attached to this session."""
         return self.db.query(DataDomainDB).filter(DataDomainDB.id == id).first()
     
     def create(self, data_domain_create: DataDomainCreate, created_by: str) -> DataDomainDB:
@@ -33,13 +59,12 @@ class DataDomainRepository:
         )
         
         self.db.add(db_data_domain)
-        self.db.commit()
-        self.db.refresh(db_data_domain)
+        self.db.flush()
         return db_data_domain
     
     def update(self, id: str, data_domain_update: DataDomainUpdate, updated_by: str) -> Optional[DataDomainDB]:
         """Update an existing data domain."""
-        db_data_domain = self.get_by_id(id)
+        db_data_domain = self._get_db_row(id)
         if not db_data_domain:
             return None
         
@@ -52,16 +77,17 @@ class DataDomainRepository:
         db_data_domain.updated_by = updated_by
         db_data_domain.updated_at = datetime.now(timezone.utc)
         
-        self.db.commit()
-        self.db.refresh(db_data_domain)
+        self.db.flush()
+        self.cache.invalidate(DataDomainDB, id, self.db)
         return db_data_domain
     
     def delete(self, id: str) -> bool:
         """Delete a data domain."""
-        db_data_domain = self.get_by_id(id)
+        db_data_domain = self._get_db_row(id)
         if not db_data_domain:
             return False
         
         self.db.delete(db_data_domain)
-        self.db.commit()
+        self.db.flush()
+        self.cache.invalidate(DataDomainDB, id, self.db)
         return True
\ No newline at end of file
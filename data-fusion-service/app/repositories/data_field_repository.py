@@ -11,8 +11,7 @@ class DataFieldRepository:
         # Create the database model instance
         data_field = DataFieldDB(**data_field_data)
         self.db_session.add(data_field)
-        self.db_session.commit()
-        self.db_session.refresh(data_field)
+        self.db_session.flush()
         return data_field
     
     def get_by_id(self, id: UUID) -> DataFieldDB:
@@ -36,8 +35,7 @@ class DataFieldRepository:
         if data_field:
             for key, value in data_field_data.items():
                 setattr(data_field, key, value)
-            self.db_session.commit()
-            self.db_session.refresh(data_field)
+            self.db_session.flush()
         return data_field
     
     def delete(self, id: UUID) -> bool:
@@ -45,6 +43,6 @@ class DataFieldRepository:
         data_field = self.get_by_id(id)
         if data_field:
             self.db_session.delete(data_field)
-            self.db_session.commit()
+            self.db_session.flush()
             return True
         return False
\ No newline at end of file
@@ -2,75 +2,424 @@
 Data Fusion Hub Service - Data Object Repository
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from itertools import groupby
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Query, Session, selectinload
+from app.core.cache import EntityCache, entity_cache
 from sqlalchemy.exc import IntegrityError
-from app.models.data_object import DataObject, DataObjectCreate, DataObjectUpdate
+from app.models.data_object import DataObjectDB, DataObjectCreate, DataObjectUpdate
+from app.models.data_object_bulk import DataFieldCreateBulk, DataObjectCreateBulk
+from app.models.data_field import DataFieldDB
+from app.utils.batch import chunked, unique_ids
+from app.utils.pagination import paginate_keyset
+from app.utils.upsert import upsert_statement
 from datetime import datetime, timezone
+import uuid
+
+# Rows per multi-row INSERT statement issued by create_bulk
+BULK_INSERT_CHUNK_SIZE = 1000
+
+# Rows per fetch from the server-side cursor used by iter_with_fields
+EXPORT_BATCH_SIZE = 1000
+
+# Columns overwritten when upsert_bulk finds an existing object or field
+OBJECT_UPSERT_COLUMNS = ("description", "type", "updated_by", "updated_at")
+FIELD_UPSERT_COLUMNS = tuple(DataFieldCreateBulk.model_fields) + ("updated_by", "updated_at")
+
+# Columns get_page can order by, each backed by a (data_domain_id, column, id) index
+SORT_KEYS = ("created_at", "updated_at", "name")
+
+
+def _differs(row: Any, values: Dict[str, Any]) -> bool:
+    """Check whether any of the given values differs from the row's."""
+    return any(getattr(row, key) != value for key, value in values.items())
 
 
 class DataObjectRepository:
     """Repository for data object operations."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: EntityCache = entity_cache):
         self.db = db
+        self.cache = cache
     
-    def get_all(self) -> List[DataObject]:
+    def get_all(self) -> List[DataObjectDB]:
         """Get all data objects."""
-        return self.db.query(DataObject).all()
+        return self.db.query(DataObjectDB).all()
+    
+    def _filtered_query(
+        self,
+        data_domain_id: Optional[str] = None,
+        type: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+        updated_since: Optional[datetime] = None,
+    ) -> Query:
+        """Build a data object query with the given filters pushed into SQL."""
+        query = self.db.query(DataObjectDB)
+        if data_domain_id is not None:
+            query = query.filter(DataObjectDB.data_domain_id == data_domain_id)
+        if type is not None:
+            query = query.filter(DataObjectDB.type == type)
+        if name_prefix:
+            query = query.filter(DataObjectDB.name.startswith(name_prefix, autoescape=True))
+        if updated_since is not None:
+            query = query.filter(DataObjectDB.updated_at >= updated_since)
+        return query
+    
+    def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        sort: str = "created_at",
+        with_fields: bool = False,
+        **filters: Any,
+    ) -> Tuple[List[DataObjectDB], Optional[str]]:
+        """
+        Get one page of filtered data objects, plus the next page cursor.
+    
+        Args:
+            limit: Maximum number of objects to return
+            cursor: Cursor returned with the previous page, if any
+            offset: Objects to skip when no cursor is given
+            sort: One of SORT_KEYS, prefixed with '-' for descending order
+            with_fields: Whether to load each object's data_fields in one
+                extra query for the whole page
+            **filters: data_domain_id, type, name_prefix and/or updated_since
+    
+        Returns:
+            The objects of the page and the cursor for the next page, or None
+            if this is the last page
+    
+        Raises:
+            ValueError: If the sort key or the cursor is invalid
+        """
+        descending = sort.startswith("-")
+        sort_key = sort.lstrip("-")
+        if sort_key not in SORT_KEYS:
+            raise ValueError(f"Invalid sort key '{sort_key}', expected one of {', '.join(SORT_KEYS)}")
+        query = self._filtered_query(**filters)
+        if with_fields:
+            query = query.options(selectinload(DataObjectDB.data_fields))
+        return paginate_keyset(
+            query, getattr(DataObjectDB, sort_key), DataObjectDB.id, limit,
+            cursor=cursor, offset=offset, descending=descending
+        )
+    
+    def iter_with_fields(
+        self, batch_size: int = EXPORT_BATCH_SIZE, **filters: Any
+    ) -> Iterator[Tuple[DataObjectDB, List[DataFieldDB]]]:
+        """
+        Stream filtered data objects together with their data fields.
+    
+        Objects and fields come from a single outer join read ``batch_size``
+        rows at a time through a server-side cursor (``yield_per``), so memory
+        use stays flat however large the catalog is.
+    
+        Args:
+            batch_size: Rows fetched from the cursor at a time
+            **filters: data_domain_id, type, name_prefix and/or updated_since
+    
+        Returns:
+            Iterator of (data object, its data fields) in (created_at, id) order
+        """
+        query = (
+            self._filtered_query(**filters)
+            .outerjoin(DataFieldDB, DataFieldDB.object_id == DataObjectDB.id)
+            .add_entity(DataFieldDB)
+            .order_by(DataObjectDB.created_at, DataObjectDB.id)
+            .yield_per(batch_size)
+        )
+        # Rows of one object are adjacent, since the ordering ends with its id
+        for _, rows in groupby(query, key=lambda row: row[0].id):
+            rows = list(rows)
+            yield rows[0][0], [data_field for _, data_field in rows if data_field is not None]
+    
+    def count(self, **filters: Any) -> int:
+        """Count the data objects matching the filters accepted by get_page."""
+        return self._filtered_query(**filters).with_entities(func.count(DataObjectDB.id)).scalar()
+    
+    def get_by_id(self, id: str) -> Optional[DataObjectDB]:
+        """Get a data object by ID, served from the entity cache when possible."""
+        return self.cache.get_or_load(DataObjectDB, id, lambda: self._get_db_row(id), self.db)
+    
+    def get_with_fields(self, id: str) -> Optional[DataObjectDB]:
+        """Get a data object by ID with its data_fields loaded, bypassing the entity cache."""
+        return self.db.query(DataObjectDB).options(
+            selectinload(DataObjectDB.data_fields)
+        ).filter(DataObjectDB.id == id).first()
+    
+    def get_many(self, ids: List[str], with_fields: bool = False) -> List[DataObjectDB]:
+        """
+        Get the data objects with the given IDs with one IN query per chunk of IDs.
+    
+        Args:
+            ids: IDs of the data objects to retrieve
+            with_fields: Whether to also load each object's data_fields
+    
+        Returns:
+            The data objects found, in no particular order
+        """
+        query = self.db.query(DataObjectDB)
+        if with_fields:
+            query = query.options(selectinload(DataObjectDB.data_fields))
+        rows = []
+        for chunk in chunked(unique_ids(ids)):
+            rows.extend(query.filter(DataObjectDB.id.in_(chunk)).all())
+        return rows
     
-    def get_by_id(self, id: str) -> Optional[DataObject]:
-        """Get a data object by ID."""
-        return self.db.query(DataObject).filter(DataObject.id == id).first()
+    def _get_db_row(self, id: str) -> Optional[DataObjectDB]:
+        """Load a data object row attached to this session."""
+        return self.db.query(DataObjectDB).filter(DataObjectDB.id == id).first()
     
-    def get_by_domain_id(self, domain_id: str) -> List[DataObject]:
+    def get_by_domain_id(self, domain_id: str) -> List[DataObjectDB]:
         """Get all data objects for a specific domain."""
-        return self.db.query(DataObject).filter(DataObject.data_domain_id == domain_id).all()
+        return self.db.query(DataObjectDB).filter(DataObjectDB.data_domain_id == domain_id).all()
     
-    def create(self, data_object_create: DataObjectCreate, created_by: str) -> DataObject:
+    def create(self, data_object_create: DataObjectCreate, created_by: str) -> DataObjectDB:
         """Create a new data object."""
         # Set the creator and updater
-        data_object_data = data_object_create.dict()
+        data_object_data = data_object_create.model_dump()
         data_object_data["created_by"] = created_by
         data_object_data["updated_by"] = created_by
         
-        db_data_object = DataObject(**data_object_data)
+        db_data_object = DataObjectDB(**data_object_data)
         self.db.add(db_data_object)
-        self.db.commit()
-        self.db.refresh(db_data_object)
+        self.db.flush()
         return db_data_object
     
-    def update(self, id: str, data_object_update: DataObjectUpdate, updated_by: str) -> Optional[DataObject]:
+    def find_bulk_conflicts(
+        self,
+        data_domain_id: str,
+        data_objects: List[DataObjectCreateBulk],
+        check_existing: bool = True,
+        chunk_size: int = BULK_INSERT_CHUNK_SIZE,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find every data object of a bulk request that would violate a unique key.
+    
+        Repeated object names and repeated field names within an object are
+        found with hash sets. Names already taken in the domain are found with
+        one IN query per chunk of names. Fields of new objects cannot clash
+        with existing rows, so they need no query.
+    
+        Args:
+            data_domain_id: ID of the data domain every object belongs to
+            data_objects: Data objects of the request
+            check_existing: Whether names already in the domain are conflicts,
+                which they are not when upserting
+            chunk_size: Maximum number of names per query
+    
+        Returns:
+            One error per conflict with the object's index and name, the field
+            name for field conflicts, and a message, ordered by index
+        """
+        errors = []
+        first_index: Dict[str, int] = {}
+        for index, data_object in enumerate(data_objects):
+            if data_object.name in first_index:
+                errors.append({
+                    "index": index, "name": data_object.name,
+                    "error": f"Duplicate data object name, first used at index {first_index[data_object.name]}"
+                })
+            else:
+                first_index[data_object.name] = index
+            field_names = set()
+            for field in data_object.data_fields:
+                if field.name in field_names:
+                    errors.append({
+                        "index": index, "name": data_object.name, "field": field.name, "error": "Duplicate field name"
+                    })
+                field_names.add(field.name)
+    
+        if check_existing:
+            for chunk in chunked(list(first_index), chunk_size):
+                existing = self.db.query(DataObjectDB.name).filter(
+                    DataObjectDB.data_domain_id == data_domain_id, DataObjectDB.name.in_(chunk)
+                )
+                errors.extend(
+                    {"index": first_index[name], "name": name, "error": "Data object already exists in the domain"}
+                    for name, in existing
+                )
+        return sorted(errors, key=lambda error: error["index"])
+    
+    def create_bulk(
+        self,
+        data_domain_id: str,
+        data_objects: List[DataObjectCreateBulk],
+        created_by: str,
+        chunk_size: int = BULK_INSERT_CHUNK_SIZE,
+    ) -> List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Create data objects and their fields in the session's transaction.
+    
+        IDs and timestamps are generated up front, so rows are written with
+        chunked multi-row INSERTs and nothing has to be read back afterwards.
+        Nothing is committed here; the request's unit of work commits every
+        row at once or none of them.
+    
+        Args:
+            data_domain_id: ID of the data domain every object belongs to
+            data_objects: Data objects to create, each with its data fields
+            created_by: Identifier of the entity creating the objects
+            chunk_size: Maximum number of rows per INSERT statement
+    
+        Returns:
+            One (object row, field rows) pair per data object, in request order
+        """
+        now = datetime.now(timezone.utc)
+        audit = {"created_by": created_by, "updated_by": created_by, "created_at": now, "updated_at": now}
+    
+        created = []
+        object_rows = []
+        field_rows = []
+        for data_object in data_objects:
+            object_row = data_object.model_dump(exclude={"data_fields"})
+            object_row.update(audit, id=str(uuid.uuid4()), data_domain_id=data_domain_id)
+            rows = [
+                {**field.model_dump(), **audit, "id": str(uuid.uuid4()), "object_id": object_row["id"]}
+                for field in data_object.data_fields
+            ]
+            object_rows.append(object_row)
+            field_rows.extend(rows)
+            created.append((object_row, rows))
+    
+        for start in range(0, len(object_rows), chunk_size):
+            self.db.execute(insert(DataObjectDB), object_rows[start:start + chunk_size])
+        for start in range(0, len(field_rows), chunk_size):
+            self.db.execute(insert(DataFieldDB), field_rows[start:start + chunk_size])
+    
+        return created
+    
+    def upsert_bulk(
+        self,
+        data_domain_id: str,
+        data_objects: List[DataObjectCreateBulk],
+        updated_by: str,
+        chunk_size: int = BULK_INSERT_CHUNK_SIZE,
+    ) -> Dict[str, int]:
+        """
+        Create or update data objects and their fields by natural key.
+    
+        Objects are matched on (data_domain_id, name) and fields on
+        (name, object_id). Existing objects are read first, so only new or
+        changed rows are written, through chunked INSERT ... ON CONFLICT DO
+        UPDATE statements; re-registering an unchanged schema writes nothing.
+        Fields missing from the request are left in place.
+    
+        Args:
+            data_domain_id: ID of the data domain every object belongs to
+            data_objects: Data objects to register, each with its data fields
+            updated_by: Identifier of the entity registering the objects
+            chunk_size: Maximum number of names or rows per statement
+    
+        Returns:
+            Number of objects that were created, updated and left unchanged
+    
+        Raises:
+            ValueError: If two objects in the request have the same name
+        """
+        names = [data_object.name for data_object in data_objects]
+        if len(set(names)) != len(names):
+            raise ValueError("Data object names must be unique within the request")
+    
+        existing = {}
+        for chunk in chunked(names, chunk_size):
+            rows = self.db.query(DataObjectDB).options(selectinload(DataObjectDB.data_fields)).filter(
+                DataObjectDB.data_domain_id == data_domain_id, DataObjectDB.name.in_(chunk)
+            )
+            existing.update((row.name, row) for row in rows)
+    
+        now = datetime.now(timezone.utc)
+        counts = {"created": 0, "updated": 0, "unchanged": 0}
+        object_rows = []
+        field_rows = []
+        stale = []
+        for data_object in data_objects:
+            values = data_object.model_dump(exclude={"data_fields", "data_domain_id"})
+            current = existing.get(data_object.name)
+            if current is None:
+                counts["created"] += 1
+                fields = data_object.data_fields
+                object_rows.append({
+                    **values, "id": str(uuid.uuid4()), "data_domain_id": data_domain_id,
+                    "created_by": updated_by, "updated_by": updated_by, "created_at": now, "updated_at": now
+                })
+            else:
+                current_fields = {field.name: field for field in current.data_fields}
+                fields = [
+                    field for field in data_object.data_fields
+                    if field.name not in current_fields or _differs(current_fields[field.name], field.model_dump())
+                ]
+                if not fields and not _differs(current, values):
+                    counts["unchanged"] += 1
+                    continue
+                counts["updated"] += 1
+                stale.append(current)
+                object_rows.append({
+                    **values, "id": current.id, "data_domain_id": data_domain_id,
+                    "created_by": current.created_by, "updated_by": updated_by,
+                    "created_at": current.created_at, "updated_at": now
+                })
+            field_rows.extend((data_object.name, {
+                **field.model_dump(), "id": str(uuid.uuid4()),
+                "created_by": updated_by, "updated_by": updated_by, "created_at": now, "updated_at": now
+            }) for field in fields)
+    
+        # Objects created concurrently keep their own ID, so fields use the IDs returned
+        object_ids = {}
+        for chunk in chunked(object_rows, chunk_size):
+            result = self.db.execute(upsert_statement(
+                self.db, DataObjectDB, chunk, ("data_domain_id", "name"), OBJECT_UPSERT_COLUMNS,
+                returning=(DataObjectDB.name, DataObjectDB.id)
+            ))
+            object_ids.update((name, id) for name, id in result)
+        field_rows = [{**row, "object_id": object_ids[name]} for name, row in field_rows]
+        for chunk in chunked(field_rows, chunk_size):
+            self.db.execute(upsert_statement(
+                self.db, DataFieldDB, chunk, ("name", "object_id"), FIELD_UPSERT_COLUMNS
+            ))
+    
+        # The upserts bypassed the ORM, so reload updated rows on next access
+        for row in stale:
+            for field in row.data_fields:
+                self.db.expire(field)
+            self.db.expire(row)
+            self.cache.invalidate(DataObjectDB, row.id, self.db)
+        return counts
+    
+    def update(self, id: str, data_object_update: DataObjectUpdate, updated_by: str) -> Optional[DataObjectDB]:
         """Update an existing data object."""
-        db_data_object = self.get_by_id(id)
+        db_data_object = self._get_db_row(id)
         if not db_data_object:
             return None
         
         # Update fields
-        update_data = data_object_update.dict(exclude_unset=True)
+        update_data = data_object_update.model_dump(exclude_unset=True)
         update_data["updated_by"] = updated_by
         update_data["updated_at"] = datetime.now(timezone.utc)
         
         for key, value in update_data.items():
             setattr(db_data_object, key, value)
         
-        self.db.commit()
-        self.db.refresh(db_data_object)
+        self.db.flush()
+        self.cache.invalidate(DataObjectDB, id, self.db)
         return db_data_object
     
     def delete(self, id: str) -> bool:
         """Delete a data object."""
-        db_data_object = self.get_by_id(id)
+        db_data_object = self._get_db_row(id)
         if not db_data_object:
             return False
         
         self.db.delete(db_data_object)
-        self.db.commit()
+        self.db.flush()
+        self.cache.invalidate(DataObjectDB, id, self.db)
         return True
     
-    def get_by_full_qualified_name_and_domain(self, full_qualified_name: str, domain_id: str) -> Optional[DataObject]:
+    def get_by_full_qualified_name_and_domain(self, full_qualified_name: str, domain_id: str) -> Optional[DataObjectDB]:
         """Get a data object by its full qualified name within a specific domain."""
-        return self.db.query(DataObject).filter(
-            DataObject.full_qualified_name == full_qualified_name,
-            DataObject.data_domain_id == domain_id
+        return self.db.query(DataObjectDB).filter(
+            DataObjectDB.full_qualified_name == full_qualified_name,
+            DataObjectDB.data_domain_id == domain_id
         ).first()
\ No newline at end of file
@@ -35,6 +35,18 @@ class RoleRepository:
         """
         raise NotImplementedError
     
+    async def get_many(self, role_ids: List[str]) -> List[Role]:
+        """
+        Get the roles with the given IDs.
+        
+        Args:
+            role_ids: UUIDs of the roles to retrieve
+            
+        Returns:
+            The roles found, in no particular order
+        """
+        raise NotImplementedError
+    
     async def get_all(self) -> List[Role]:
         """
         Get all roles.
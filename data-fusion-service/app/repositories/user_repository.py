@@ -39,6 +39,18 @@ class UserRepository:
         """
         raise NotImplementedError
     
+    async def get_many(self, user_ids: List[str]) -> List[User]:
+        """
+        Get the users with the given IDs.
+        
+        Args:
+            user_ids: UUIDs of the users to retrieve
+            
+        Returns:
+            The users found, in no particular order
+        """
+        raise NotImplementedError
+    
     async def get_by_email(self, email: str) -> Optional[User]:
         """
         Get a user by email.
@@ -0,0 +1,118 @@
+"""
+Data Fusion Hub Service - User Role Membership Repository
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.permissions import PermissionIndex, permission_index
+from app.models.user_role_db import UserRoleDB
+
+
+class UserRoleRepository:
+    """Repository for the roles users hold, backed by the permission index."""
+
+    def __init__(self, db: AsyncSession, index: PermissionIndex = permission_index):
+        self.db = db
+        self.index = index
+
+    async def grant(self, user_id: str, role_id: str, granted_by: str, request_id: Optional[str] = None) -> bool:
+        """
+        Give a user a role, in the caller's transaction.
+
+        Args:
+            user_id: UUID of the user
+            role_id: UUID of the role
+            granted_by: Identifier of the entity granting the role
+            request_id: UUID of the approved role request, if any
+
+        Returns:
+            True if the user did not hold the role yet
+        """
+        existing = await self.db.execute(
+            select(UserRoleDB.id).where(UserRoleDB.user_id == user_id, UserRoleDB.role_id == role_id)
+        )
+        if existing.first() is not None:
+            return False
+
+        self.db.add(UserRoleDB(user_id=user_id, role_id=role_id, request_id=request_id, granted_by=granted_by))
+        await self.db.flush()
+        self.index.invalidate_user(user_id, self.db.sync_session)
+        return True
+
+    async def grant_many(self, grants: Iterable[Tuple[str, str, Optional[str]]], granted_by: str) -> int:
+        """
+        Give several users roles, in the caller's transaction.
+
+        Memberships that already exist are found with one query and the rest
+        are inserted with one executemany INSERT.
+
+        Args:
+            grants: (user ID, role ID, request ID) of each membership
+            granted_by: Identifier of the entity granting the roles
+
+        Returns:
+            Number of memberships created
+        """
+        # Several approved requests for the same role give one membership
+        requests = {(user_id, role_id): request_id for user_id, role_id, request_id in grants}
+        if not requests:
+            return 0
+
+        existing = await self.db.execute(
+            select(UserRoleDB.user_id, UserRoleDB.role_id)
+            .where(tuple_(UserRoleDB.user_id, UserRoleDB.role_id).in_(list(requests)))
+        )
+        for user_id, role_id in existing:
+            del requests[(user_id, role_id)]
+
+        self.db.add_all(
+            UserRoleDB(user_id=user_id, role_id=role_id, request_id=request_id, granted_by=granted_by)
+            for (user_id, role_id), request_id in requests.items()
+        )
+        await self.db.flush()
+        for user_id in {user_id for user_id, _ in requests}:
+            self.index.invalidate_user(user_id, self.db.sync_session)
+        return len(requests)
+
+    async def revoke(self, user_id: str, role_id: str) -> bool:
+        """
+        Take a role from a user, in the caller's transaction.
+
+        Returns:
+            True if the user held the role
+        """
+        result = await self.db.execute(
+            delete(UserRoleDB).where(UserRoleDB.user_id == user_id, UserRoleDB.role_id == role_id)
+        )
+        self.index.invalidate_user(user_id, self.db.sync_session)
+        return result.rowcount > 0
+
+    async def get_role_ids(self, user_id: str) -> List[str]:
+        """Get the IDs of the roles a user holds, from the database."""
+        result = await self.db.execute(select(UserRoleDB.role_id).where(UserRoleDB.user_id == user_id))
+        return list(result.scalars())
+
+    async def get_held_role_ids(self, user_id: str) -> List[str]:
+        """Get the IDs of the roles a user holds, from the permission index when loaded."""
+        role_ids = self.index.get_role_ids(user_id)
+        if role_ids is None:
+            role_ids = await self.get_role_ids(user_id)
+            self.index.load(user_id, role_ids)
+        return role_ids
+
+    async def has_role(self, user_id: str, role_id: str) -> bool:
+        """
+        Check whether a user holds a role.
+
+        Answered from the permission index; a user not in the index is
+        loaded with one query first.
+        """
+        holds = self.index.has_role(user_id, role_id)
+        if holds is None:
+            role_ids = await self.get_role_ids(user_id)
+            self.index.load(user_id, role_ids)
+            holds = role_id in role_ids
+        return holds
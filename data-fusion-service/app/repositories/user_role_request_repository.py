@@ -0,0 +1,75 @@
+"""
+Data Fusion Hub Service - User Role Request Repository
+"""
+
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
+
+from app.models.user_role_request_db import UserRoleRequestDB
+from app.utils.pagination import paginate_keyset
+
+
+class UserRoleRequestRepository:
+    """Repository for listing user role requests."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _filtered_query(
+        self,
+        status: Optional[str] = None,
+        role_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> Query:
+        """Build a role request query with the given filters pushed into SQL."""
+        query = self.db.query(UserRoleRequestDB)
+        if status is not None:
+            query = query.filter(UserRoleRequestDB.status == status)
+        if role_id is not None:
+            query = query.filter(UserRoleRequestDB.role_id == role_id)
+        if user_id is not None:
+            query = query.filter(UserRoleRequestDB.user_id == user_id)
+        if created_after is not None:
+            query = query.filter(UserRoleRequestDB.created_at >= created_after)
+        if created_before is not None:
+            query = query.filter(UserRoleRequestDB.created_at < created_before)
+        return query
+
+    def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        descending: bool = False,
+        **filters: Any,
+    ) -> Tuple[List[UserRoleRequestDB], Optional[str]]:
+        """
+        Get one page of filtered role requests in (created_at, id) order, plus the next page cursor.
+
+        Args:
+            limit: Maximum number of requests to return
+            cursor: Cursor returned with the previous page, if any
+            offset: Requests to skip when no cursor is given
+            descending: Whether to list the newest requests first
+            **filters: status, role_id, user_id, created_after and/or created_before
+
+        Returns:
+            The requests of the page and the cursor for the next page, or None
+            if this is the last page
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        return paginate_keyset(
+            self._filtered_query(**filters), UserRoleRequestDB.created_at, UserRoleRequestDB.id, limit,
+            cursor=cursor, offset=offset, descending=descending
+        )
+
+    def count(self, **filters: Any) -> int:
+        """Count the role requests matching the filters."""
+        return self._filtered_query(**filters).with_entities(func.count(UserRoleRequestDB.id)).scalar()
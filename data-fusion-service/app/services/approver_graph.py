@@ -0,0 +1,201 @@
+"""
+Data Fusion Hub Service - Transitive Approver Graph
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, select, text
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.core.config import settings
+from app.models.role_approver_relationship_db import RoleApproverRelationshipDB
+
+# Session.info key holding graph changes to apply once the session commits
+PENDING_GRAPH_CHANGES = "approver_graph_changes"
+
+
+class ApproverGraph:
+    """
+    In-process copy of the role approver relationships with their transitive closure.
+
+    An edge (role, approver) means holders of the approver role may approve
+    requests for the role. Approval is transitive: whoever may approve the
+    approver role may also approve the role. Both directions of the closure
+    are kept, so the roles a set of roles can approve is a union of
+    precomputed sets, and edge changes update only the nodes they reach.
+
+    The graph is loaded from the database on first use and reloaded after
+    max_age_seconds, which bounds how long changes made by other workers go
+    unseen. Changes made through this worker apply as soon as they commit.
+    Being possibly stale, it only serves reads; writes check for cycles
+    with approved_role_ids instead.
+    """
+
+    def __init__(self, max_age_seconds: float = 60.0):
+        self.max_age_seconds = max_age_seconds
+        # Direct edges: role -> its approver roles, and approver role -> roles it approves
+        self._approvers: Dict[str, Set[str]] = {}
+        self._approves: Dict[str, Set[str]] = {}
+        # Transitive closures of the two maps above
+        self._all_approvers: Dict[str, Set[str]] = {}
+        self._all_approves: Dict[str, Set[str]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Load the graph if it was never loaded or is older than max_age_seconds."""
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.max_age_seconds:
+                return
+        edges = db.execute(
+            select(RoleApproverRelationshipDB.role_id, RoleApproverRelationshipDB.approver_role_id)
+        ).all()
+        self.load(edges)
+
+    def load(self, edges: Iterable[Tuple[str, str]]) -> None:
+        """Replace the graph with the given (role, approver role) edges and compute its closure."""
+        with self._lock:
+            self._approvers, self._approves = {}, {}
+            for role_id, approver_role_id in edges:
+                self._approvers.setdefault(role_id, set()).add(approver_role_id)
+                self._approves.setdefault(approver_role_id, set()).add(role_id)
+            self._all_approvers = {role_id: self._reachable(self._approvers, role_id) for role_id in self._approvers}
+            self._all_approves = {role_id: self._reachable(self._approves, role_id) for role_id in self._approves}
+            self._loaded_at = time.monotonic()
+
+    @staticmethod
+    def _reachable(edges: Dict[str, Set[str]], start: str) -> Set[str]:
+        """Get the nodes reachable from start, excluding start unless it is on a cycle."""
+        seen: Set[str] = set()
+        stack = list(edges.get(start, ()))
+        while stack:
+            node = stack.pop()
+            if node not in seen:
+                seen.add(node)
+                stack.extend(edges.get(node, ()))
+        return seen
+
+    def approvable_roles(self, role_ids: Iterable[str]) -> Set[str]:
+        """Get the roles that holders of any of the given roles may approve requests for."""
+        with self._lock:
+            approvable: Set[str] = set()
+            for role_id in role_ids:
+                approvable |= self._all_approves.get(role_id, set())
+            return approvable
+
+    def approvers_of(self, role_id: str) -> Set[str]:
+        """Get the roles that may approve requests for a role, directly or transitively."""
+        with self._lock:
+            return set(self._all_approvers.get(role_id, set()))
+
+    def add_edge(self, role_id: str, approver_role_id: str) -> None:
+        """Add an edge, extending the closure of the roles on either side of it."""
+        with self._lock:
+            if approver_role_id in self._approvers.get(role_id, set()):
+                return
+            self._approvers.setdefault(role_id, set()).add(approver_role_id)
+            self._approves.setdefault(approver_role_id, set()).add(role_id)
+
+            approvers = {approver_role_id} | self._all_approvers.get(approver_role_id, set())
+            approved = {role_id} | self._all_approves.get(role_id, set())
+            for node in approved:
+                self._all_approvers.setdefault(node, set()).update(approvers)
+            for node in approvers:
+                self._all_approves.setdefault(node, set()).update(approved)
+
+    def remove_edge(self, role_id: str, approver_role_id: str) -> None:
+        """Remove an edge, recomputing the closure of only the roles whose paths may have used it."""
+        with self._lock:
+            if approver_role_id not in self._approvers.get(role_id, set()):
+                return
+            self._approvers[role_id].discard(approver_role_id)
+            self._approves[approver_role_id].discard(role_id)
+
+            approved = {role_id} | self._all_approves.get(role_id, set())
+            approvers = {approver_role_id} | self._all_approvers.get(approver_role_id, set())
+            for node in approved:
+                self._all_approvers[node] = self._reachable(self._approvers, node)
+            for node in approvers:
+                self._all_approves[node] = self._reachable(self._approves, node)
+
+    def apply_on_commit(self, session: Session, added: bool, role_id: str, approver_role_id: str) -> None:
+        """
+        Add or remove an edge once the session that wrote the change commits.
+
+        Changes of a rolled-back transaction are never applied, and a graph
+        that was not loaded yet will read them from the database instead.
+        """
+        session.info.setdefault(PENDING_GRAPH_CHANGES, []).append((self, added, role_id, approver_role_id))
+
+    def clear(self) -> None:
+        """Forget the graph, so the next use loads it again."""
+        with self._lock:
+            self._approvers, self._approves = {}, {}
+            self._all_approvers, self._all_approves = {}, {}
+            self._loaded_at = None
+
+    def _apply(self, added: bool, role_id: str, approver_role_id: str) -> None:
+        """Apply a committed change if the graph is loaded."""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if added:
+                self.add_edge(role_id, approver_role_id)
+            else:
+                self.remove_edge(role_id, approver_role_id)
+
+
+def lock_approver_relationships(db: Session) -> None:
+    """
+    Keep other transactions from writing approver edges until the session's transaction ends.
+
+    Two assignments checked for cycles concurrently could otherwise each
+    add half of a cycle, under READ COMMITTED neither seeing the other's
+    edge. Locking only the roles involved is not enough, as the halves may
+    touch disjoint roles joined by existing edges. On PostgreSQL the table
+    is locked in SHARE ROW EXCLUSIVE mode, which blocks other writers of it
+    but not its readers; SQLite already serializes writers on the database
+    file, so nothing is done there.
+    """
+    if db.get_bind(RoleApproverRelationshipDB).dialect.name == "postgresql":
+        db.execute(text(f"LOCK TABLE {RoleApproverRelationshipDB.__tablename__} IN SHARE ROW EXCLUSIVE MODE"))
+
+
+def approved_role_ids(db: Session, role_id: str) -> Set[str]:
+    """
+    Get the roles a role may approve, directly or transitively, from the database.
+
+    Walks role_approver_relationships with one recursive query in the
+    session's transaction, so edges it has flushed are included. Called
+    after lock_approver_relationships and writing new edges, it also sees
+    every edge other writers committed; the role approves itself exactly
+    when the edges form a cycle through it.
+    """
+    edge = RoleApproverRelationshipDB
+    approved = select(edge.role_id).where(edge.approver_role_id == role_id).cte("approved", recursive=True)
+    # UNION rather than UNION ALL drops rows already seen, so cycles end the walk
+    approved = approved.union(select(edge.role_id).join(approved, edge.approver_role_id == approved.c.role_id))
+    return set(db.scalars(select(approved.c.role_id)))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_changes(session: Session) -> None:
+    """Apply the approver edge changes of a transaction once it has committed."""
+    # Also fired when a savepoint is released, before anything is committed
+    if session.in_nested_transaction():
+        return
+    for graph, added, role_id, approver_role_id in session.info.pop(PENDING_GRAPH_CHANGES, []):
+        graph._apply(added, role_id, approver_role_id)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending_changes(session: Session, transaction: SessionTransaction) -> None:
+    """Forget the approver edge changes once the outermost transaction ended without committing."""
+    # A rolled back savepoint keeps the outer transaction's changes
+    if transaction.parent is None and not transaction.nested:
+        session.info.pop(PENDING_GRAPH_CHANGES, None)
+
+
+approver_graph = ApproverGraph(max_age_seconds=settings.APPROVER_GRAPH_MAX_AGE_SECONDS)
@@ -0,0 +1,125 @@
+"""
+Data Fusion Hub Service - Authentication Service
+"""
+
+import time
+from datetime import timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi import HTTPException, status
+
+from app.core.cache import CacheBackend
+from app.core.security import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    TokenClaimsCache,
+    create_access_token,
+    current_user_cache,
+    token_claims_cache,
+    user_cache_key,
+)
+from app.models.login import Token
+from app.models.user import User, UserPublic
+from app.repositories.async_concrete_user_repository import AsyncConcreteUserRepository
+from app.services.password_hasher import PasswordHasher, password_hasher
+
+
+class AuthService:
+    """Authenticates users by email and password and issues access tokens."""
+    
+    def __init__(
+        self,
+        db: AsyncSession,
+        hasher: PasswordHasher = password_hasher,
+        token_cache: TokenClaimsCache = token_claims_cache,
+        user_cache: CacheBackend = current_user_cache,
+    ):
+        self.repository = AsyncConcreteUserRepository(db)
+        self.hasher = hasher
+        self.token_cache = token_cache
+        self.user_cache = user_cache
+    
+    async def authenticate(self, email: str, password: str) -> Tuple[Optional[User], float]:
+        """
+        Check a user's credentials.
+        
+        The user is looked up through the case-insensitive email index and the
+        password is verified in the password hasher's worker pool.
+        
+        Args:
+            email: Email address to log in with (any case)
+            password: Plain text password
+            
+        Returns:
+            The authenticated user, or None if the credentials are wrong, and
+            the seconds spent verifying the password
+        """
+        user = await self.repository.get_by_email(email)
+        
+        start = time.perf_counter()
+        matches = await self.hasher.verify(password, user.password_hash if user else None)
+        hash_seconds = time.perf_counter() - start
+        
+        return (user if matches else None), hash_seconds
+    
+    def issue_token(self, user: User) -> Token:
+        """
+        Create an access token for an authenticated user.
+        
+        Args:
+            user: User the token is issued to
+            
+        Returns:
+            Token object with access_token and token_type
+        """
+        access_token = create_access_token(
+            data={"sub": user.email},
+            expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
+        return Token(access_token=access_token, token_type="bearer")
+    
+    async def get_user_for_token(self, token: str) -> UserPublic:
+        """
+        Resolve the user an access token was issued to.
+        
+        Verified claims and resolved users are both cached, so a repeated
+        token costs two dictionary lookups rather than a signature check and
+        a database query. The password hash is left out, so it is never
+        kept in the cache.
+        
+        Args:
+            token: Encoded access token
+            
+        Returns:
+            The user named by the token's ``sub`` claim
+            
+        Raises:
+            HTTPException: 401 Unauthorized if the token is invalid or expired,
+                or its user no longer exists
+        """
+        claims = self.token_cache.verify(token)
+        email = claims.get("sub")
+        if not email:
+            raise _credentials_error()
+        
+        key = user_cache_key(email)
+        values = self.user_cache.get(key)
+        if values is not None:
+            return UserPublic.model_construct(**values)
+        
+        user = await self.repository.get_by_email(email)
+        if user is None:
+            raise _credentials_error()
+        values = user.model_dump(exclude={"password_hash"})
+        self.user_cache.set(key, values)
+        return UserPublic.model_construct(**values)
+
+
+def _credentials_error() -> HTTPException:
+    """Build the 401 raised for tokens that do not resolve to a user."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
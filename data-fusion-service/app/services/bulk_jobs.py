@@ -0,0 +1,264 @@
+"""
+Data Fusion Hub Service - Bulk Ingestion Job Runner
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.core import database
+from app.core.config import settings
+from app.models.bulk_job import BulkJobDB, JOB_COMPLETED, JOB_FAILED
+from app.models.data_object_bulk import DataObjectCreateBulk
+from app.repositories.bulk_job_repository import BulkJobRepository
+from app.repositories.data_object_repository import DataObjectRepository
+
+logger = logging.getLogger(__name__)
+
+# Session.info key holding the IDs of jobs to start once the session commits
+PENDING_JOBS = "pending_bulk_jobs"
+
+
+class BulkJobRunner:
+    """
+    Processes queued bulk jobs on a small pool of worker threads.
+
+    A job is written in chunks, and each chunk is committed together with the
+    job's progress. A job interrupted by a restart therefore resumes after its
+    last committed chunk without writing anything twice.
+
+    Before each chunk the worker commits a heartbeat, and the chunk's own
+    transaction touches the job again first, so a claim by another worker
+    waits for the chunk to commit and then finds the job fresh, however
+    long the chunk took. Every heartbeat only matches if the job's
+    updated_at is still the worker's last one; a worker whose job was
+    taken over anyway stops without writing its chunk.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        chunk_size: int = 500,
+        stale_seconds: float = 60.0,
+        session_factory: Optional[Callable[[], Session]] = None,
+    ):
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.stale_seconds = stale_seconds
+        self.session_factory = session_factory
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._poller: Optional[threading.Thread] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the worker pool on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bulk-job")
+            return self._executor
+
+    def _new_session(self) -> Session:
+        """Open a session for a worker."""
+        return (self.session_factory or database.SessionLocal)()
+
+    def enqueue(self, job_id: str, session: Session) -> None:
+        """
+        Start a job once the session that created it commits.
+
+        Starting it right away could let a worker look for the job before
+        its row is visible.
+
+        Args:
+            job_id: ID of the queued job
+            session: Session holding the uncommitted job row
+        """
+        session.info.setdefault(PENDING_JOBS, []).append(job_id)
+
+    def start(self, job_id: str) -> None:
+        """Hand a committed job to the worker pool."""
+        self._get_executor().submit(self._run, job_id)
+
+    def resume(self) -> List[str]:
+        """
+        Start queued jobs and running jobs abandoned by a stopped worker.
+
+        Returns:
+            IDs of the jobs handed to the worker pool
+        """
+        with self._new_session() as db:
+            job_ids = BulkJobRepository(db).get_resumable_ids(self.stale_seconds)
+        for job_id in job_ids:
+            self.start(job_id)
+        return job_ids
+
+    def start_polling(self) -> None:
+        """Resume abandoned jobs now and then every stale_seconds in the background."""
+        def poll():
+            while True:
+                try:
+                    self.resume()
+                except Exception:
+                    logger.exception("Resuming bulk jobs failed")
+                if self._stop.wait(self.stale_seconds):
+                    return
+
+        with self._lock:
+            if self._poller is None:
+                self._stop.clear()
+                self._poller = threading.Thread(target=poll, name="bulk-job-poller", daemon=True)
+                self._poller.start()
+
+    def _run(self, job_id: str) -> None:
+        """Claim a job and write its remaining chunks."""
+        with self._new_session() as db:
+            repository = BulkJobRepository(db)
+            if not repository.claim(job_id, self.stale_seconds):
+                db.rollback()
+                return
+            db.commit()
+
+            job = repository.get_by_id(job_id)
+            try:
+                self._process(db, job)
+            except Exception as e:
+                logger.exception("Bulk job %s failed", job_id)
+                db.rollback()
+                job.status = JOB_FAILED
+                job.errors = job.errors + [{"index": job.processed, "name": "", "error": f"Job failed: {e}"}]
+                job.finished_at = datetime.now(timezone.utc)
+                db.commit()
+
+    def _process(self, db: Session, job: BulkJobDB) -> None:
+        """Write a claimed job chunk by chunk, committing its progress with each chunk."""
+        if job.started_at is None:
+            job.started_at = datetime.now(timezone.utc)
+        objects = [DataObjectCreateBulk(**data_object) for data_object in job.payload]
+        repository = DataObjectRepository(db)
+        jobs = BulkJobRepository(db)
+
+        while job.processed < job.total:
+            # Committed before the chunk, so other workers see the job alive while it is written
+            if not self._heartbeat(db, jobs, job):
+                return
+            db.commit()
+            # Touched again to open the chunk's transaction, so the savepoints
+            # below nest inside it and the chunk commits together with the progress
+            if not self._heartbeat(db, jobs, job):
+                return
+
+            start = job.processed
+            chunk = objects[start:start + self.chunk_size]
+            errors = self._write_chunk(db, repository, job, chunk, start)
+            # Still ours only if no other worker claimed the job meanwhile
+            if not self._heartbeat(db, jobs, job):
+                return
+            job.processed = start + len(chunk)
+            job.succeeded += len(chunk) - len(errors)
+            job.failed += len(errors)
+            job.errors = job.errors + errors
+            db.commit()
+
+        if not self._heartbeat(db, jobs, job):
+            return
+        job.status = JOB_COMPLETED
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+
+    @staticmethod
+    def _heartbeat(db: Session, jobs: BulkJobRepository, job: BulkJobDB) -> bool:
+        """
+        Touch a job this worker still owns, in the session's transaction.
+
+        Returns:
+            False, with the transaction rolled back, if another worker took the job over
+        """
+        # Pending changes to the job would bump updated_at when flushed, so flush them first
+        db.flush()
+        now = datetime.now(timezone.utc)
+        if not jobs.heartbeat(job.id, job.updated_at, now):
+            logger.warning("Bulk job %s was taken over by another worker; dropping its current chunk", job.id)
+            db.rollback()
+            return False
+        # Set explicitly, so flushing the progress writes this value rather than a newer one
+        job.updated_at = now
+        return True
+
+    def _write_chunk(
+        self,
+        db: Session,
+        repository: DataObjectRepository,
+        job: BulkJobDB,
+        chunk: List[DataObjectCreateBulk],
+        start: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Write one chunk, falling back to one object at a time if it fails.
+
+        Returns:
+            Errors of the data objects that could not be written
+        """
+        try:
+            with db.begin_nested():
+                self._write(repository, job, chunk)
+            return []
+        except Exception:
+            pass
+
+        errors = []
+        for offset, data_object in enumerate(chunk):
+            try:
+                with db.begin_nested():
+                    self._write(repository, job, [data_object])
+            except Exception as e:
+                errors.append({"index": start + offset, "name": data_object.name, "error": str(e)})
+        return errors
+
+    @staticmethod
+    def _write(repository: DataObjectRepository, job: BulkJobDB, data_objects: List[DataObjectCreateBulk]) -> None:
+        """Write data objects the way /data-objects/bulk does in the job's mode."""
+        if job.mode == "upsert":
+            repository.upsert_bulk(job.data_domain_id, data_objects, updated_by=job.created_by)
+        else:
+            repository.create_bulk(job.data_domain_id, data_objects, created_by=job.created_by)
+
+    def shutdown(self) -> None:
+        """Stop polling and wait for the running jobs to finish."""
+        self._stop.set()
+        with self._lock:
+            poller, self._poller = self._poller, None
+            executor, self._executor = self._executor, None
+        if poller is not None:
+            poller.join()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+@event.listens_for(Session, "after_commit")
+def _start_committed_jobs(session: Session) -> None:
+    """Start the jobs queued in a session once their rows are committed."""
+    # Also fired when a savepoint is released, before anything is committed
+    if session.in_nested_transaction():
+        return
+    for job_id in session.info.pop(PENDING_JOBS, []):
+        bulk_job_runner.start(job_id)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_rolled_back_jobs(session: Session, transaction: SessionTransaction) -> None:
+    """Forget the jobs queued in a session once the outermost transaction ended without committing."""
+    # A rolled back savepoint keeps the jobs the outer transaction queued
+    if transaction.parent is None and not transaction.nested:
+        session.info.pop(PENDING_JOBS, None)
+
+
+bulk_job_runner = BulkJobRunner(
+    max_workers=settings.BULK_JOB_WORKERS,
+    chunk_size=settings.BULK_JOB_CHUNK_SIZE,
+    stale_seconds=settings.BULK_JOB_STALE_SECONDS,
+)
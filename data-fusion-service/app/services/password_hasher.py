@@ -0,0 +1,199 @@
+"""
+Data Fusion Hub Service - Password Hashing Service
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+
+from app.core.config import settings
+from app.utils.password_utils import hash_password, verify_password
+
+
+class PasswordHasherSaturated(Exception):
+    """Raised when more bcrypt calls are waiting than the hasher accepts."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification off the event loop.
+
+    The work runs in a process pool with one worker per core by default, so
+    hashing is bound by the cores and never by the GIL or the event loop of
+    this worker. At most max_pending calls may be running or queued; beyond
+    that PasswordHasherSaturated is raised straight away, which the API
+    turns into a 429, instead of letting the queue and its latency grow.
+    """
+
+    def __init__(
+        self,
+        rounds: int = 12,
+        max_workers: Optional[int] = None,
+        max_pending: int = 64,
+        use_processes: bool = True,
+    ):
+        self.rounds = rounds
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max(max_pending, self.max_workers)
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._dummy_hash: Optional[str] = None
+        self._stats = {"hashes": 0, "verifications": 0, "rejections": 0, "hash_seconds": 0.0, "verify_seconds": 0.0}
+
+    def _get_executor(self) -> Executor:
+        """Create the worker pool on first use."""
+        with self._lock:
+            if self._executor is None:
+                if self.use_processes:
+                    # Spawned rather than forked: the parent runs threads
+                    # (bulk jobs, thread pools) that a fork would copy mid-state
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="password-hasher"
+                    )
+            return self._executor
+
+    @contextmanager
+    def _admit(self, count: int):
+        """
+        Hold count of the max_pending slots for the duration of the block.
+
+        Raises:
+            PasswordHasherSaturated: If the slots are not free
+        """
+        with self._lock:
+            if self._pending + count > self.max_pending:
+                self._stats["rejections"] += 1
+                raise PasswordHasherSaturated(
+                    f"Password hashing is saturated ({self._pending} of {self.max_pending} slots in use)"
+                )
+            self._pending += count
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pending -= count
+
+    async def _run(self, kind: str, func, *args):
+        """Run a bcrypt call in the pool and record how long it took."""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        result = await loop.run_in_executor(self._get_executor(), func, *args)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._stats[f"{kind}_seconds"] += elapsed
+            self._stats["hashes" if kind == "hash" else "verifications"] += 1
+        return result, elapsed
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password with the configured bcrypt cost.
+
+        Args:
+            password: Plain text password to hash
+
+        Returns:
+            Hashed password string
+        """
+        with self._admit(1):
+            hashed, _ = await self._run("hash", hash_password, password, self.rounds)
+        return hashed
+
+    async def hash_many(self, passwords: Sequence[Optional[str]]) -> List[Optional[str]]:
+        """
+        Hash several passwords in parallel.
+
+        The batch holds one slot per worker, at most, and feeds the passwords
+        through them, so a large import keeps every core busy without
+        taking the whole queue from other requests.
+
+        Args:
+            passwords: Plain text passwords; None or empty entries stay None
+
+        Returns:
+            Hashed passwords, in the order given
+        """
+        hashed: List[Optional[str]] = [None] * len(passwords)
+        indexes = iter([index for index, password in enumerate(passwords) if password])
+        slots = min(self.max_workers, sum(1 for password in passwords if password))
+        if not slots:
+            return hashed
+
+        async def drain():
+            for index in indexes:
+                hashed[index], _ = await self._run("hash", hash_password, passwords[index], self.rounds)
+
+        with self._admit(slots):
+            await asyncio.gather(*(drain() for _ in range(slots)))
+        return hashed
+
+    async def verify(self, password: str, hashed_password: Optional[str]) -> bool:
+        """
+        Verify a password against its hash.
+
+        When there is no stored hash (unknown user or social login) a dummy
+        hash is checked instead, so the response time does not reveal
+        whether the account exists.
+
+        Args:
+            password: Plain text password to verify
+            hashed_password: Stored hashed password, if any
+
+        Returns:
+            True if password matches, False otherwise
+        """
+        if not hashed_password:
+            if self._dummy_hash is None:
+                self._dummy_hash = await self.hash("dummy-password")
+            with self._admit(1):
+                await self._run("verify", verify_password, password, self._dummy_hash)
+            return False
+
+        with self._admit(1):
+            matches, _ = await self._run("verify", verify_password, password, hashed_password)
+        return matches
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get hashing counters.
+
+        Returns:
+            Counts and cumulative/average seconds for hashes and verifications,
+            rejected calls and the slots in use
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = self._pending
+        stats["avg_hash_seconds"] = stats["hash_seconds"] / stats["hashes"] if stats["hashes"] else 0.0
+        stats["avg_verify_seconds"] = (
+            stats["verify_seconds"] / stats["verifications"] if stats["verifications"] else 0.0
+        )
+        stats["rounds"] = self.rounds
+        stats["max_workers"] = self.max_workers
+        stats["max_pending"] = self.max_pending
+        return stats
+
+    def shutdown(self):
+        """Stop the worker pool."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    use_processes=settings.PASSWORD_HASH_USE_PROCESSES,
+)
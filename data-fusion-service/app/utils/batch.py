@@ -0,0 +1,41 @@
+"""
+Data Fusion Hub Service - Batch Lookup Utilities
+"""
+
+from typing import Any, Callable, Iterable, Iterator, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# IDs per IN (...) clause; keeps each statement well under SQLite's bound parameter limit
+BATCH_GET_CHUNK_SIZE = 500
+
+
+def unique_ids(ids: Iterable[str]) -> List[str]:
+    """Drop repeated IDs, keeping the first occurrence of each."""
+    return list(dict.fromkeys(ids))
+
+
+def chunked(items: Sequence[T], size: int = BATCH_GET_CHUNK_SIZE) -> Iterator[Sequence[T]]:
+    """Split a sequence into consecutive slices of at most size items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def order_by_ids(
+    rows: Iterable[T], ids: Sequence[str], key: Callable[[T], Any] = lambda row: row.id
+) -> Tuple[List[T], List[str]]:
+    """
+    Match rows loaded with an IN (...) query back to the requested IDs.
+
+    Args:
+        rows: Rows in any order
+        ids: Requested IDs, possibly repeated
+        key: Gets the ID of a row
+
+    Returns:
+        The rows in the order of their first requested ID, and the
+        requested IDs that have no row
+    """
+    by_id = {key(row): row for row in rows}
+    ids = unique_ids(ids)
+    return [by_id[id] for id in ids if id in by_id], [id for id in ids if id not in by_id]
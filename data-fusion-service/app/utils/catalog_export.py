@@ -0,0 +1,108 @@
+"""
+Data Fusion Hub Service - Catalog Export Serializers
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from sqlalchemy import inspect
+
+from app.models.data_field import DataFieldDB
+from app.models.data_object import DataObjectDB
+
+# Output is sent in chunks of about this many bytes rather than one per row
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+OBJECT_COLUMNS = [column.key for column in inspect(DataObjectDB).column_attrs]
+FIELD_COLUMNS = [column.key for column in inspect(DataFieldDB).column_attrs]
+
+
+def _row_to_dict(row: Any, columns: List[str]) -> Dict[str, Any]:
+    """Get the column values of an ORM row."""
+    return {column: getattr(row, column) for column in columns}
+
+
+def _to_json(value: Any) -> Any:
+    """JSON hook writing datetimes as ISO 8601."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _chunked(lines: Iterable[str], chunk_bytes: int = EXPORT_CHUNK_BYTES) -> Iterator[str]:
+    """Join lines into chunks of roughly chunk_bytes."""
+    buffer = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def ndjson_export(items: Iterable[Tuple[DataObjectDB, List[DataFieldDB]]]) -> Iterator[str]:
+    """
+    Serialize data objects as NDJSON, one object with its fields per line.
+
+    Args:
+        items: (data object, data fields) pairs, e.g. from iter_with_fields
+
+    Returns:
+        Iterator of text chunks
+    """
+    def lines():
+        for data_object, data_fields in items:
+            record = _row_to_dict(data_object, OBJECT_COLUMNS)
+            record["data_fields"] = [_row_to_dict(field, FIELD_COLUMNS) for field in data_fields]
+            yield json.dumps(record, default=_to_json) + "\n"
+
+    return _chunked(lines())
+
+
+def csv_export(items: Iterable[Tuple[DataObjectDB, List[DataFieldDB]]]) -> Iterator[str]:
+    """
+    Serialize data objects as CSV with one row per data field.
+
+    Object columns are prefixed with ``object_`` and field columns with
+    ``field_``. An object without fields gets one row with empty field columns.
+
+    Args:
+        items: (data object, data fields) pairs, e.g. from iter_with_fields
+
+    Returns:
+        Iterator of text chunks
+    """
+    def lines():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def flush() -> str:
+            line = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return line
+
+        writer.writerow([f"object_{column}" for column in OBJECT_COLUMNS] + [f"field_{column}" for column in FIELD_COLUMNS])
+        yield flush()
+        for data_object, data_fields in items:
+            object_values = [getattr(data_object, column) for column in OBJECT_COLUMNS]
+            for field in data_fields or [None]:
+                field_values = [getattr(field, column) for column in FIELD_COLUMNS] if field else [None] * len(FIELD_COLUMNS)
+                writer.writerow(object_values + field_values)
+            yield flush()
+
+    return _chunked(lines())
+
+
+# Export format name -> (serializer, media type, file extension)
+EXPORT_FORMATS = {
+    "ndjson": (ndjson_export, "application/x-ndjson", "ndjson"),
+    "csv": (csv_export, "text/csv", "csv"),
+}
@@ -0,0 +1,56 @@
+"""
+Data Fusion Hub Service - Incremental NDJSON Reading
+"""
+
+import zlib
+from typing import AsyncIterable, AsyncIterator, Iterator, Optional
+
+# Media types accepted for newline-delimited JSON request bodies
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
+# Longest line accepted; also the most data a gzip chunk is inflated to at once
+MAX_LINE_BYTES = 8 * 1024 * 1024
+
+
+def _inflate(decompressor: "zlib._Decompress", data: bytes, max_bytes: int) -> Iterator[bytes]:
+    """Decompress data in pieces of at most max_bytes, so a small chunk cannot inflate unbounded."""
+    while data:
+        yield decompressor.decompress(data, max_bytes)
+        data = decompressor.unconsumed_tail
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterable[bytes], gzipped: bool = False, max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[bytes]:
+    """
+    Split a streamed body into lines as it arrives.
+
+    Only the current line is held in memory, whatever the size of the body.
+
+    Args:
+        chunks: Body chunks, e.g. ``request.stream()``
+        gzipped: Whether the body is gzip encoded
+        max_line_bytes: Longest line accepted
+
+    Returns:
+        Iterator of lines without their line break, including blank lines
+
+    Raises:
+        ValueError: If a line is too long or the gzip stream is truncated
+        zlib.error: If the body is not valid gzip
+    """
+    decompressor: Optional["zlib._Decompress"] = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else None
+    buffer = b""
+    async for chunk in chunks:
+        pieces = _inflate(decompressor, chunk, max_line_bytes) if decompressor else [chunk]
+        for piece in pieces:
+            *lines, buffer = (buffer + piece).split(b"\n")
+            for line in lines:
+                yield line
+            if len(buffer) > max_line_bytes:
+                raise ValueError(f"Line longer than {max_line_bytes} bytes")
+
+    if decompressor is not None and not decompressor.eof:
+        raise ValueError("Truncated gzip body")
+    if buffer:
+        yield buffer
@@ -0,0 +1,105 @@
+"""
+Data Fusion Hub Service - Keyset Pagination Utilities
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(value: Any, id: str) -> str:
+    """
+    Encode a (sort value, id) position as an opaque cursor token.
+
+    Args:
+        value: Sort column value of the last row on the page
+        id: ID of the last row on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([value, id]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, value_type: type = datetime) -> Tuple[Any, str]:
+    """
+    Decode a cursor token produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+        value_type: Python type of the sort column the cursor was made for
+
+    Returns:
+        The (sort value, id) position the cursor points at
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if value_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, value_type):
+            raise TypeError(f"Expected a {value_type.__name__} sort value")
+        return value, str(id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor}") from e
+
+
+def paginate_keyset(
+    query: Query,
+    sort_column: Any,
+    id_column: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    descending: bool = False,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of a query ordered by (sort column, id).
+
+    With a cursor the page starts right after the cursor position, which the
+    database resolves with a range scan on a (sort column, id) index. Without
+    one it falls back to ``offset`` from the start of the ordering.
+
+    Args:
+        query: Query to paginate
+        sort_column: Non-nullable column to order by, e.g. created_at
+        id_column: Primary key column used as a tie-breaker
+        limit: Maximum number of rows to return
+        cursor: Cursor returned with the previous page, if any
+        offset: Rows to skip when no cursor is given
+        descending: Whether to walk the ordering from the end
+
+    Returns:
+        The rows of the page and the cursor for the next page, or None if
+        this is the last page
+    """
+    if cursor:
+        value, id = decode_cursor(cursor, sort_column.type.python_type)
+        position = tuple_(sort_column, id_column)
+        after = position < tuple_(value, id) if descending else position > tuple_(value, id)
+        query = query.filter(after)
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column, id_column)
+    if offset and not cursor:
+        query = query.offset(offset)
+
+    # Fetch one extra row to find out whether another page follows
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
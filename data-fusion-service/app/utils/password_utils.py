@@ -6,12 +6,13 @@ import bcrypt
 from typing import Optional
 
 
-def hash_password(password: str) -> str:
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
     """
     Hash a password using bcrypt.
     
     Args:
         password: Plain text password to hash
+        rounds: bcrypt cost factor, or None for the bcrypt default
         
     Returns:
         Hashed password string
@@ -19,7 +20,7 @@ def hash_password(password: str) -> str:
     if not password:
         return None
     # Generate salt and hash the password
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds) if rounds is not None else bcrypt.gensalt()
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
@@ -0,0 +1,50 @@
+"""
+Data Fusion Hub Service - Dialect-Native Upserts
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# Dialects whose INSERT supports ON CONFLICT ... DO UPDATE
+_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def upsert_statement(
+    db: Session,
+    model: Any,
+    rows: Iterable[Dict[str, Any]],
+    conflict_columns: Iterable[str],
+    update_columns: Iterable[str],
+    returning: Optional[Iterable[Any]] = None,
+) -> Any:
+    """
+    Build a multi-row INSERT ... ON CONFLICT DO UPDATE for the session's database.
+
+    Args:
+        db: Session the statement will run on
+        model: SQLAlchemy model of the table
+        rows: Column values of each row
+        conflict_columns: Columns of the unique index that identifies a row
+        update_columns: Columns overwritten from the new row on conflict
+        returning: Columns to return for every inserted or updated row
+
+    Returns:
+        The statement, ready to pass to ``db.execute``
+
+    Raises:
+        NotImplementedError: If the database has no ON CONFLICT support
+    """
+    dialect = db.get_bind(model).dialect.name
+    if dialect not in _INSERTS:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+
+    statement = _INSERTS[dialect](model).values(list(rows))
+    statement = statement.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_={column: statement.excluded[column] for column in update_columns},
+    )
+    if returning is not None:
+        statement = statement.returning(*returning)
+    return statement
@@ -0,0 +1,154 @@
+"""
+Data Fusion Hub Service - Sync vs Async Session Latency Benchmark
+
+Drives ``GET /users/{id}`` at a fixed concurrency through two handlers that
+differ only in how they reach the database:
+
+* ``before``: ``async def`` handler using the blocking ``Session`` from ``get_db``
+* ``after``: ``async def`` handler using ``AsyncSession`` from ``get_async_db``
+
+Each request also runs a query that takes ``--query-ms`` inside SQLite, so the
+cost of blocking the event loop on a slow query shows up in the tail latency.
+
+Usage:
+    python -m benchmarks.bench_async_db --concurrency 32 --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.database import Base
+from app.models.user_db import UserDB
+from app.repositories.async_concrete_user_repository import AsyncConcreteUserRepository
+from app.repositories.concrete_user_repository import ConcreteUserRepository
+
+
+def _register_sleep(dbapi_connection, connection_record):
+    """Expose ``sleep_ms(n)`` to SQL so a query can take a known amount of time."""
+    dbapi_connection.create_function("sleep_ms", 1, lambda ms: time.sleep(ms / 1000.0) or ms)
+
+
+def build_app(database_path: str, query_ms: float, pool_size: int):
+    """Build an app exposing the blocking and the async variant of the user lookup."""
+    # Both engines get a pool large enough for every in-flight request
+    sync_engine = create_engine(
+        f"sqlite:///{database_path}", connect_args={"check_same_thread": False}, pool_size=pool_size
+    )
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", pool_size=pool_size)
+    event.listen(sync_engine, "connect", _register_sleep)
+    event.listen(async_engine.sync_engine, "connect", _register_sleep)
+    SyncSession = sessionmaker(bind=sync_engine, autoflush=False)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+    slow_query = text("SELECT sleep_ms(:ms)")
+
+    def get_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/before/{user_id}")
+    async def get_user_before(user_id: str, db: Session = Depends(get_db)):
+        db.execute(slow_query, {"ms": query_ms})
+        user = await ConcreteUserRepository(db).get_by_id(user_id)
+        return {"id": user.id}
+
+    @app.get("/after/{user_id}")
+    async def get_user_after(user_id: str, db: AsyncSession = Depends(get_async_db)):
+        await db.execute(slow_query, {"ms": query_ms})
+        user = await AsyncConcreteUserRepository(db).get_by_id(user_id)
+        return {"id": user.id}
+
+    async def dispose():
+        sync_engine.dispose()
+        await async_engine.dispose()
+
+    return app, dispose
+
+
+def seed(database_path: str, users: int) -> list:
+    """Create the schema and insert test users, returning their IDs."""
+    engine = create_engine(f"sqlite:///{database_path}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        rows = [
+            UserDB(email=f"user{i}@example.com", first_name="Bench", last_name=f"User{i}", created_by="bench")
+            for i in range(users)
+        ]
+        db.add_all(rows)
+        db.commit()
+        ids = [row.id for row in rows]
+    engine.dispose()
+    return ids
+
+
+async def run(client: httpx.AsyncClient, path: str, user_ids: list, concurrency: int, total: int) -> list:
+    """Issue ``total`` requests with ``concurrency`` in flight, returning latencies in ms."""
+    latencies = []
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            response = await client.get(f"/{path}/{user_ids[i % len(user_ids)]}")
+            latencies.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1)]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--query-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = os.path.join(tmp, "bench.db")
+        user_ids = seed(database_path, args.users)
+        app, dispose = build_app(database_path, args.query_ms, args.concurrency)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"concurrency={args.concurrency} requests={args.requests} query_ms={args.query_ms}")
+            for path in ("before", "after"):
+                await run(client, path, user_ids, args.concurrency, min(100, args.requests))  # warm-up
+                start = time.perf_counter()
+                latencies = await run(client, path, user_ids, args.concurrency, args.requests)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{path:>6}: p50={percentile(latencies, 50):8.2f}ms "
+                    f"p99={percentile(latencies, 99):8.2f}ms "
+                    f"mean={statistics.mean(latencies):8.2f}ms "
+                    f"throughput={args.requests / elapsed:8.1f} req/s"
+                )
+        await dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,152 @@
+"""
+Data Fusion Hub Service - SQLite Profile Multi-Process Benchmark
+
+Runs reader and writer processes against one SQLite file, once per
+``SQLITE_PROFILE``, the way several uvicorn workers share the database on a
+single node:
+
+* readers look up random data domains by ID
+* writers create data domains, one unit of work (one commit) each
+
+Every process builds its own engine with ``configure_sqlite``, so each
+connection gets the profile's pragmas. "locked" counts operations that
+failed with ``database is locked`` after waiting out the busy timeout.
+
+Usage:
+    python -m benchmarks.bench_sqlite_profile --readers 4 --writers 2 --seconds 10
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import EntityCache, NullCacheBackend
+from app.core.database import Base, configure_sqlite, unit_of_work
+from app.models.data_domain import DataDomainCreate
+from app.repositories.data_domain_repository import DataDomainRepository
+
+PROFILES = ("default", "production")
+
+
+def open_session_factory(database_path: str, profile: str):
+    """Create an engine with the profile applied and a session factory for it."""
+    engine = create_engine(f"sqlite:///{database_path}")
+    configure_sqlite(engine, profile)
+    return engine, sessionmaker(bind=engine, autoflush=False)
+
+
+def seed(database_path: str, profile: str, domains: int) -> list:
+    """Create the schema and insert data domains, returning their IDs."""
+    engine, Session = open_session_factory(database_path, profile)
+    Base.metadata.create_all(bind=engine)
+    with Session() as db, unit_of_work(db):
+        repository = DataDomainRepository(db)
+        ids = [repository.create(DataDomainCreate(name=f"seed_{i}"), "bench").id for i in range(domains)]
+    engine.dispose()
+    return ids
+
+
+def worker(role: str, number: int, database_path: str, profile: str, domain_ids: list,
+           seconds: float, start, results):
+    """Run reads or writes until the time is up and report latencies."""
+    engine, Session = open_session_factory(database_path, profile)
+    # No entity cache, so every read reaches SQLite
+    cache = EntityCache(NullCacheBackend())
+    latencies = []
+    locked = 0
+    counter = 0
+
+    start.wait()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        began = time.perf_counter()
+        try:
+            with Session() as db:
+                repository = DataDomainRepository(db, cache=cache)
+                if role == "reader":
+                    repository.get_by_id(random.choice(domain_ids))
+                else:
+                    with unit_of_work(db):
+                        repository.create(DataDomainCreate(name=f"{role}_{number}_{counter}"), "bench")
+                    counter += 1
+        except OperationalError:
+            locked += 1
+            continue
+        latencies.append((time.perf_counter() - began) * 1000)
+
+    engine.dispose()
+    results.put((role, latencies, locked))
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1)]
+
+
+def run_profile(profile: str, args, tmp: str) -> None:
+    """Benchmark one profile on a fresh database file."""
+    database_path = os.path.join(tmp, f"{profile}.db")
+    domain_ids = seed(database_path, profile, args.domains)
+
+    ctx = multiprocessing.get_context("spawn")
+    start = ctx.Event()
+    results = ctx.Queue()
+    roles = [("reader", i) for i in range(args.readers)] + [("writer", i) for i in range(args.writers)]
+    processes = [
+        ctx.Process(
+            target=worker,
+            args=(role, number, database_path, profile, domain_ids, args.seconds, start, results),
+        )
+        for role, number in roles
+    ]
+    for process in processes:
+        process.start()
+    # Give every process time to import the app before the clock starts
+    time.sleep(args.warmup)
+    start.set()
+
+    collected = {"reader": ([], 0), "writer": ([], 0)}
+    for _ in processes:
+        role, latencies, locked = results.get()
+        previous, previous_locked = collected[role]
+        collected[role] = (previous + latencies, previous_locked + locked)
+    for process in processes:
+        process.join()
+
+    for role in ("reader", "writer"):
+        latencies, locked = collected[role]
+        print(
+            f"{profile:>10} {role + 's':>7}: {len(latencies) / args.seconds:9.1f} ops/s "
+            f"p50={percentile(latencies, 50):8.2f}ms p99={percentile(latencies, 99):8.2f}ms "
+            f"locked={locked}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=PROFILES, action="append", help="Defaults to every profile")
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--domains", type=int, default=1000)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"readers={args.readers} writers={args.writers} seconds={args.seconds}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in args.profile or PROFILES:
+            run_profile(profile, args, tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1 @@
-uvicorn app.main:app --host 0.0.0.0 --port 8000
+python -m app.core.migrations && uvicorn app.main:app --host 0.0.0.0 --port 8000
@@ -0,0 +1,86 @@
+"""
+Data Fusion Hub Service - Shared Test Fixtures
+"""
+
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+
+# Point the app's own engines at a scratch file before app.core.database
+# creates them, so no test writes to the tracked data_fusion_hub.db
+TEST_DATABASE_DIR = tempfile.mkdtemp(prefix="data-fusion-hub-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DATABASE_DIR, 'app.db')}"
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.auth import get_current_user
+from app.core import database
+from app.core.database import Base, async_unit_of_work, get_async_db, get_db, unit_of_work
+from app.main import app
+from app.models.user import UserPublic
+
+
+@pytest.fixture(scope="session", autouse=True)
+def app_database():
+    """Create the tables of the scratch database and remove it after the run."""
+    Base.metadata.create_all(bind=database.engine)
+    yield
+    database.engine.dispose()
+    shutil.rmtree(TEST_DATABASE_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+async def app_db(tmp_path):
+    """
+    Serve get_db and get_async_db from a test database file.
+
+    Yields a sync session on the file for seeding and checking rows; its
+    session_factory attribute opens async sessions on the same file. Both
+    engines are disposed afterwards, so no connection outlives the test.
+    """
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+    AsyncTestingSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    def override_get_db():
+        with SessionLocal() as db:
+            with unit_of_work(db):
+                yield db
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            async with async_unit_of_work(db):
+                yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    db = SessionLocal()
+    db.session_factory = AsyncTestingSessionLocal
+    try:
+        yield db
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_async_db, None)
+        db.close()
+        await async_engine.dispose()
+        engine.dispose()
+
+
+@pytest.fixture
+def current_user():
+    """Serve get_current_user a fixed user, for routes that only need someone signed in."""
+    now = datetime.now(timezone.utc)
+    user = UserPublic(
+        id="current-user", email="current@example.com", first_name="Current", last_name="User",
+        created_at=now, updated_at=now
+    )
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield user
+    app.dependency_overrides.pop(get_current_user, None)
@@ -0,0 +1,208 @@
+"""
+Data Fusion Hub Service - Approver Graph and Inbox Tests
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.permissions import permission_index
+from app.core.security import create_access_token, current_user_cache
+from app.main import app
+from app.models.role_approver_relationship_db import RoleApproverRelationshipDB
+from app.models.role_db import RoleDB
+from app.models.user_db import UserDB
+from app.models.user_role_db import UserRoleDB
+from app.models.user_role_request_db import UserRoleRequestDB
+from app.services.approver_graph import ApproverGraph, approver_graph
+
+client = TestClient(app)
+
+
+def test_closure_follows_approvers_transitively():
+    """Test that a role approves what its approved roles approve."""
+    graph = ApproverGraph()
+    graph.load([("viewer", "editor"), ("editor", "admin"), ("auditor", "admin")])
+
+    assert graph.approvable_roles(["admin"]) == {"editor", "viewer", "auditor"}
+    assert graph.approvable_roles(["editor"]) == {"viewer"}
+    assert graph.approvers_of("viewer") == {"editor", "admin"}
+
+
+def test_incremental_updates_match_a_rebuild():
+    """Test that adding and removing edges one at a time keeps the closure a full load would compute."""
+    rng = random.Random(7)
+    roles = [f"role-{i}" for i in range(12)]
+    graph = ApproverGraph()
+    graph.load([])
+    edges = set()
+
+    for _ in range(300):
+        role_id, approver_role_id = rng.sample(roles, 2)
+        if (role_id, approver_role_id) in edges:
+            graph.remove_edge(role_id, approver_role_id)
+            edges.discard((role_id, approver_role_id))
+        elif approver_role_id not in graph.approvable_roles([role_id]):
+            graph.add_edge(role_id, approver_role_id)
+            edges.add((role_id, approver_role_id))
+
+        rebuilt = ApproverGraph()
+        rebuilt.load(edges)
+        for role_id in roles:
+            assert graph.approvable_roles([role_id]) == rebuilt.approvable_roles([role_id])
+            assert graph.approvers_of(role_id) == rebuilt.approvers_of(role_id)
+
+
+def test_changes_wait_for_outermost_commit(app_db):
+    """Test that an edge change outlives savepoints and is applied only at the real commit."""
+    graph = ApproverGraph()
+    graph.load([])
+    graph.apply_on_commit(app_db, True, "viewer", "editor")
+    with app_db.begin_nested():
+        pass
+    with pytest.raises(ValueError):
+        with app_db.begin_nested():
+            raise ValueError("contained failure")
+    assert graph.approvers_of("viewer") == set()
+    app_db.commit()
+
+    assert graph.approvers_of("viewer") == {"editor"}
+
+
+@pytest.fixture
+def test_db(app_db):
+    """Seed the test database with an approver, a member, three roles and their requests."""
+    approver_graph.clear()
+    permission_index.clear()
+    current_user_cache.clear()
+    now = datetime.now(timezone.utc)
+    app_db.add_all([
+        UserDB(id="approver", email="approver@example.com", first_name="Ada", last_name="Approver"),
+        UserDB(id="member", email="member@example.com", first_name="Max", last_name="Member"),
+        *(RoleDB(id=name, name=name, created_by="test", updated_by="test") for name in ("admin", "editor", "viewer")),
+        UserRoleDB(user_id="approver", role_id="admin", granted_by="test"),
+        *(
+            UserRoleRequestDB(
+                id=f"{user_id}-{role_id}-{status}", user_id=user_id, role_id=role_id, justification="Work",
+                status=status, created_by="test", updated_by="test", created_at=now + timedelta(seconds=offset)
+            )
+            for offset, (user_id, role_id, status) in enumerate([
+                ("member", "viewer", "pending"),
+                ("member", "editor", "pending"),
+                ("member", "admin", "pending"),
+                ("approver", "viewer", "pending"),
+                ("member", "viewer", "denied"),
+            ])
+        ),
+    ])
+    app_db.commit()
+    yield app_db
+    approver_graph.clear()
+    permission_index.clear()
+
+
+def inbox():
+    """Get the IDs of the requests in the approver's inbox."""
+    token = create_access_token({"sub": "approver@example.com"})
+    response = client.get("/user-role-requests/inbox", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    return [request["id"] for request in response.json()]
+
+
+def test_inbox_follows_approver_changes(test_db):
+    """Test that the inbox reflects approver edges as they are assigned and removed."""
+    assert inbox() == []
+
+    assert client.put("/roles/viewer/approver-roles/", json=["editor"]).status_code == 200
+    assert client.put("/roles/editor/approver-roles/", json=["admin"]).status_code == 200
+    assert inbox() == ["member-viewer-pending", "member-editor-pending"]
+
+    response = client.put("/roles/admin/approver-roles/", json=["viewer"])
+    assert response.status_code == 400
+    assert "cycle" in response.json()["detail"]
+
+    assert client.delete("/roles/editor/approver-roles/admin").status_code == 200
+    assert inbox() == []
+    assert client.put("/roles/viewer/approver-roles/", json=["admin"]).status_code == 200
+    assert inbox() == ["member-viewer-pending"]
+
+
+def test_cycle_check_reads_committed_edges(test_db):
+    """Test that an edge committed behind the cached graph's back still blocks a cycle."""
+    assert client.put("/roles/viewer/approver-roles/", json=["editor"]).status_code == 200
+    assert inbox() == []
+    # Written by another worker: this worker's graph does not know about it
+    test_db.add(RoleApproverRelationshipDB(
+        id="other-worker", role_id="editor", approver_role_id="admin", created_by="test", updated_by="test"
+    ))
+    test_db.commit()
+    assert approver_graph.approvers_of("viewer") == {"editor"}
+
+    response = client.put("/roles/admin/approver-roles/", json=["editor", "viewer"])
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Assigning role editor as an approver would create an approval cycle"
+    assert client.get("/roles/admin/approver-roles/").json() == []
+
+
+def test_assignment_to_role_on_existing_cycle(test_db):
+    """Test that adding approvers to a role already on a cycle is rejected as a conflict."""
+    # Written before cycles were checked
+    test_db.add_all(
+        RoleApproverRelationshipDB(
+            id=f"legacy-{role_id}", role_id=role_id, approver_role_id=approver_role_id, created_by="test", updated_by="test"
+        )
+        for role_id, approver_role_id in [("editor", "admin"), ("admin", "editor")]
+    )
+    test_db.commit()
+
+    response = client.put("/roles/admin/approver-roles/", json=["editor", "viewer"])
+
+    assert response.status_code == 409
+    assert "cycle" in response.json()["detail"]
+    assert [relationship["approver_role_id"] for relationship in client.get("/roles/admin/approver-roles/").json()] == [
+        "editor"
+    ]
+
+
+def test_inbox_requires_a_token(test_db):
+    """Test that the inbox is only served to authenticated users."""
+    assert client.get("/user-role-requests/inbox").status_code == 401
+
+
+def test_assignment_writes_only_the_diff(test_db):
+    """Test that reassigning approvers keeps unchanged relationships and runs a fixed number of statements."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    test_db.add_all(RoleDB(id=f"extra-{i}", name=f"extra-{i}", created_by="test", updated_by="test") for i in range(5))
+    test_db.commit()
+    inbox()  # Loads the graph, so committed changes are applied to it
+    first = client.put("/roles/viewer/approver-roles/", json=["editor", "extra-0", "extra-1"]).json()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0])
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = client.put("/roles/viewer/approver-roles/", json=["extra-1", "editor", "extra-2", "extra-3", "extra-4"])
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert [relationship["approver_role_id"] for relationship in response.json()] == [
+        "extra-1", "editor", "extra-2", "extra-3", "extra-4"
+    ]
+    kept = {relationship["approver_role_id"]: relationship["id"] for relationship in first}
+    assert [relationship["id"] for relationship in response.json()[:2]] == [kept["extra-1"], kept["editor"]]
+    assert statements == ["SELECT", "SELECT", "DELETE", "INSERT", "WITH"]
+    assert approver_graph.approvers_of("viewer") == {"extra-1", "editor", "extra-2", "extra-3", "extra-4"}
+
+    # A failed assignment changes nothing
+    response = client.put("/roles/viewer/approver-roles/", json=["extra-2", "missing"])
+    assert response.status_code == 404
+    assert len(client.get("/roles/viewer/approver-roles/").json()) == 5
@@ -84,4 +84,253 @@ def test_login_with_nonexistent_user(test_client):
     )
     
     assert response.status_code == 401
-    assert response.json()["detail"] == "Incorrect email or password"
\ No newline at end of file
+    assert response.json()["detail"] == "Incorrect email or password"
+
+@pytest.fixture
+async def async_client():
+    """Create an async client backed by an in-memory database and a cheap bcrypt cost."""
+    import httpx
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import StaticPool
+    from app.core.database import Base, async_unit_of_work, get_async_db
+    from app.services.password_hasher import password_hasher
+    
+    test_engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    TestingSessionLocal = async_sessionmaker(bind=test_engine, expire_on_commit=False)
+    
+    async def override_get_async_db():
+        async with TestingSessionLocal() as db:
+            async with async_unit_of_work(db):
+                yield db
+    
+    original_rounds = password_hasher.rounds
+    password_hasher.rounds = 4
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    try:
+        async with TestingSessionLocal() as db:
+            from app.repositories.async_concrete_user_repository import AsyncConcreteUserRepository
+            await AsyncConcreteUserRepository(db).create(
+                UserCreate(email="Login@Example.com", first_name="Login", last_name="User", password="password123"),
+                "test_creator"
+            )
+            await db.commit()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+        password_hasher.rounds = original_rounds
+        await test_engine.dispose()
+
+
+async def test_login_ignores_email_case(async_client):
+    """Test that login matches emails case-insensitively and reports hash time."""
+    response = await async_client.post(
+        "/auth/login", json={"email": "login@EXAMPLE.com", "password": "password123"}
+    )
+    
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
+    assert response.headers["Server-Timing"].startswith("hash;dur=")
+
+
+async def test_login_rejects_wrong_password(async_client):
+    """Test that a wrong password is rejected on both login routes."""
+    for path in ("/auth/login", "/users/login"):
+        response = await async_client.post(path, json={"email": "login@example.com", "password": "wrongpassword"})
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Incorrect email or password"
+        assert "Server-Timing" in response.headers
+
+
+async def test_password_verification_does_not_block_event_loop():
+    """Test that concurrent verifications leave the event loop free to run other work."""
+    import asyncio
+    import time
+    from app.services.password_hasher import PasswordHasher
+    
+    hasher = PasswordHasher(rounds=10, max_workers=2)
+    hashed = await hasher.hash("password123")
+    
+    ticks = 0
+    done = False
+    
+    async def ticker():
+        nonlocal ticks
+        while not done:
+            ticks += 1
+            await asyncio.sleep(0.001)
+    
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    results = await asyncio.gather(*(hasher.verify("password123", hashed) for _ in range(4)))
+    elapsed = time.perf_counter() - start
+    done = True
+    await ticker_task
+    hasher.shutdown()
+    
+    assert all(results)
+    # The loop kept ticking while bcrypt ran in the pool
+    assert ticks >= max(5, int(elapsed / 0.001 * 0.2))
+    stats = hasher.stats()
+    assert stats["verifications"] == 4
+    assert stats["hashes"] == 1
+    assert stats["avg_verify_seconds"] > 0
+
+
+async def test_current_user_is_served_from_caches(async_client):
+    """Test that a repeated token resolves its user without a query until the user changes."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from app.core.security import current_user_cache, token_claims_cache
+    
+    token_claims_cache.clear()
+    current_user_cache.clear()
+    token = (await async_client.post(
+        "/auth/login", json={"email": "login@example.com", "password": "password123"}
+    )).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    def counts():
+        return [(cache.stats()["hits"], cache.stats()["misses"]) for cache in (token_claims_cache, current_user_cache)]
+    
+    before = counts()
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        first = await async_client.get("/auth/me", headers=headers)
+        queries_on_miss = len(statements)
+        second = await async_client.get("/auth/me", headers=headers)
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert second.json()["email"].lower() == "login@example.com"
+    assert queries_on_miss == 1
+    assert len(statements) == queries_on_miss
+    # One miss then one hit on each cache
+    assert [(hits - b[0], misses - b[1]) for (hits, misses), b in zip(counts(), before)] == [(1, 1), (1, 1)]
+    # The hash is neither returned nor kept in memory
+    from app.core.security import user_cache_key
+    assert "password_hash" not in first.json()
+    assert "password_hash" not in current_user_cache.get(user_cache_key("login@example.com"))
+    
+    # Deleting the user drops it from the cache, so the token stops working
+    from app.core.database import get_async_db
+    from app.repositories.async_concrete_user_repository import AsyncConcreteUserRepository
+    async for db in app.dependency_overrides[get_async_db]():
+        await AsyncConcreteUserRepository(db).delete(first.json()["id"])
+        await db.commit()
+    assert (await async_client.get("/auth/me", headers=headers)).status_code == 401
+
+
+async def test_token_claims_cache_expires_with_token(monkeypatch):
+    """Test that cached claims are dropped once the token expires and bad tokens are not cached."""
+    from datetime import timedelta
+    from fastapi import HTTPException
+    from app.core import security
+    
+    cache = security.TokenClaimsCache(max_entries=1)
+    token = security.create_access_token({"sub": "a@example.com"}, expires_delta=timedelta(minutes=5))
+    assert cache.verify(token)["sub"] == "a@example.com"
+    assert cache.verify(token)["sub"] == "a@example.com"
+    
+    expires_at = cache.verify(token)["exp"]
+    monkeypatch.setattr(security.time, "time", lambda: expires_at + 1)
+    cache.verify(token)
+    with pytest.raises(HTTPException):
+        cache.verify("not-a-token")
+    
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["size"]) == (2, 3, 1, 1)
+
+
+async def test_hash_many_keeps_order_in_process_pool():
+    """Test that a batch is hashed in worker processes and returned in input order."""
+    from app.services.password_hasher import PasswordHasher
+    from app.utils.password_utils import verify_password
+    
+    hasher = PasswordHasher(rounds=4, max_workers=2)
+    try:
+        hashed = await hasher.hash_many(["password-0", None, "password-2", "password-3"])
+    finally:
+        hasher.shutdown()
+    
+    assert hashed[1] is None
+    assert [verify_password(f"password-{i}", hashed[i]) for i in (0, 2, 3)] == [True, True, True]
+    stats = hasher.stats()
+    assert (stats["hashes"], stats["pending"]) == (3, 0)
+
+
+async def test_saturated_hasher_answers_429(async_client):
+    """Test that logins and sign-ups are shed with a 429 while every hashing slot is taken."""
+    from app.services.password_hasher import password_hasher
+    
+    rejections = password_hasher.stats()["rejections"]
+    with password_hasher._admit(password_hasher.max_pending):
+        login = await async_client.post("/auth/login", json={"email": "login@example.com", "password": "password123"})
+        create = await async_client.post("/users/create", json={
+            "email": "busy@example.com", "first_name": "Busy", "last_name": "User", "password": "password123"
+        })
+    
+    for response in (login, create):
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+    assert password_hasher.stats()["rejections"] - rejections == 2
+    response = await async_client.post("/auth/login", json={"email": "login@example.com", "password": "password123"})
+    assert response.status_code == 200
+
+
+async def test_emails_are_unique_ignoring_case(async_client):
+    """Test that single creates and updates reject an email taken in another case, like bulk imports."""
+    user = {"email": "LOGIN@example.com", "first_name": "Other", "last_name": "User", "password": "password123"}
+    
+    response = await async_client.post("/users/create", json=user)
+    
+    assert response.status_code == 400
+    assert "already exists" in response.json()["detail"]
+    other = await async_client.post("/users/create", json={**user, "email": "other@example.com"})
+    assert other.status_code == 201
+    response = await async_client.put(f"/users/{other.json()['id']}", json=user)
+    assert response.status_code == 400
+    response = await async_client.put(f"/users/{other.json()['id']}", json={**user, "email": "OTHER@example.com"})
+    assert response.status_code == 200
+
+
+async def test_bulk_user_import(async_client):
+    """Test that a bulk import hashes every password and rejects taken or repeated emails atomically."""
+    users = [
+        {"email": f"import{i}@example.com", "first_name": "Import", "last_name": str(i), "password": f"secret-{i}"}
+        for i in range(5)
+    ]
+    
+    response = await async_client.post("/users/bulk", json={"users": users})
+    
+    assert response.status_code == 201
+    assert [user["email"] for user in response.json()] == [user["email"] for user in users]
+    login = await async_client.post("/auth/login", json={"email": "import3@example.com", "password": "secret-3"})
+    assert login.status_code == 200
+    
+    retry = [users[0], {**users[1], "email": "new@example.com"}, {**users[1], "email": "NEW@example.com"}]
+    response = await async_client.post("/users/bulk", json={"users": retry})
+    assert response.status_code == 400
+    assert "import0@example.com" in response.json()["detail"]
+    assert "new@example.com" in response.json()["detail"]
+    assert len((await async_client.get("/users/")).json()) == 6
+
+
+async def test_bulk_user_import_omits_password_hashes(async_client):
+    """Test that the users returned by a bulk import carry no password hash."""
+    users = [{"email": "hidden@example.com", "first_name": "Hidden", "last_name": "Hash", "password": "secret-1"}]
+    
+    response = await async_client.post("/users/bulk", json={"users": users})
+    
+    assert response.status_code == 201
+    assert "password_hash" not in response.json()[0]
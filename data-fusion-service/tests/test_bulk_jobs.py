@@ -0,0 +1,246 @@
+"""
+Data Fusion Hub Service - Bulk Ingestion Job Tests
+
+Jobs run on the worker threads against a database file, like in production,
+and each test waits for them by shutting the runner down.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import entity_cache
+from app.core.database import Base, get_db, unit_of_work
+from app.main import app
+from app.models.bulk_job import BulkJobDB, JOB_COMPLETED, JOB_RUNNING
+from app.models.data_domain import DataDomainCreate
+from app.models.data_field import DataFieldDB
+from app.models.data_object import DataObjectDB
+from app.models.data_object_bulk import DataObjectCreateBulk
+from app.repositories.bulk_job_repository import BulkJobRepository
+from app.repositories.data_domain_repository import DataDomainRepository
+from app.repositories.data_object_repository import DataObjectRepository
+from app.services.bulk_jobs import BulkJobRunner, bulk_job_runner
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    """Point the API and the job workers at one test database file."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        with TestingSessionLocal() as db:
+            with unit_of_work(db):
+                yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    monkeypatch.setattr(bulk_job_runner, "session_factory", TestingSessionLocal)
+    monkeypatch.setattr(bulk_job_runner, "chunk_size", 2)
+    try:
+        yield TestingSessionLocal
+    finally:
+        bulk_job_runner.shutdown()
+        app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+
+
+@pytest.fixture
+def domain_id(session_factory):
+    """Create a data domain to register objects under."""
+    with session_factory() as db:
+        domain_id = DataDomainRepository(db).create(DataDomainCreate(name="Jobs Domain"), "test_user").id
+        db.commit()
+    return domain_id
+
+
+def make_objects(count):
+    """Build bulk object payloads with two fields each."""
+    return [
+        {
+            "name": f"table_{i}",
+            "type": "table",
+            "data_domain_id": "ignored",
+            "data_fields": [{"name": "id", "type": "integer"}, {"name": "value", "type": "string"}],
+        }
+        for i in range(count)
+    ]
+
+
+def test_bulk_job_writes_objects_in_background(session_factory, domain_id):
+    """Test that a submitted job is processed in chunks and reports its progress."""
+    response = client.post("/data-objects/bulk-jobs", json={"data_domain_id": domain_id, "data_objects": make_objects(5)})
+
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    assert response.json()["total"] == 5
+
+    bulk_job_runner.shutdown()
+    job = client.get(f"/data-objects/bulk-jobs/{job_id}").json()
+    assert job["status"] == JOB_COMPLETED
+    assert (job["processed"], job["succeeded"], job["failed"]) == (5, 5, 0)
+    assert job["progress"] == 1.0
+    assert job["items_per_second"] > 0
+    with session_factory() as db:
+        assert db.query(DataObjectDB).count() == 5
+        assert db.query(DataFieldDB).count() == 10
+
+
+def test_bulk_job_reports_failed_items(session_factory, domain_id):
+    """Test that an item failing inside a chunk does not stop the rest of the chunk."""
+    objects = make_objects(4)
+    # Duplicate field name violates uq_name_object_id, like a row written after submission would
+    objects[2]["data_fields"].append({"name": "id", "type": "string"})
+
+    with patch.object(DataObjectRepository, "find_bulk_conflicts", return_value=[]):
+        job_id = client.post(
+            "/data-objects/bulk-jobs", json={"data_domain_id": domain_id, "data_objects": objects}
+        ).json()["id"]
+    bulk_job_runner.shutdown()
+
+    job = client.get(f"/data-objects/bulk-jobs/{job_id}").json()
+    assert job["status"] == JOB_COMPLETED
+    assert (job["succeeded"], job["failed"]) == (3, 1)
+    assert [(error["index"], error["name"]) for error in job["errors"]] == [(2, "table_2")]
+    with session_factory() as db:
+        assert sorted(row.name for row in db.query(DataObjectDB)) == ["table_0", "table_1", "table_3"]
+
+
+def test_failed_item_keeps_cache_invalidations_of_its_chunk(session_factory, domain_id):
+    """Test that objects updated in a chunk with a failing item are dropped from the cache at commit."""
+    with session_factory() as db:
+        repository = DataObjectRepository(db)
+        repository.create_bulk(
+            domain_id, [DataObjectCreateBulk(**data_object) for data_object in make_objects(2)], created_by="test_user"
+        )
+        db.commit()
+        updated_id = db.query(DataObjectDB.id).filter(DataObjectDB.name == "table_0").scalar()
+        stale = {column: getattr(repository.get_by_id(updated_id), column) for column in ("id", "name", "type")}
+    objects = make_objects(2)
+    objects[0]["type"] = "view"
+    write = BulkJobRunner._write
+    write_chunk = BulkJobRunner._write_chunk
+
+    def write_or_fail(repository, job, data_objects):
+        if any(data_object.name == "table_1" for data_object in data_objects):
+            raise ValueError("Rejected row")
+        write(repository, job, data_objects)
+
+    def write_chunk_then_read(self, *args):
+        errors = write_chunk(self, *args)
+        # A concurrent reader caches the committed row again before the chunk commits
+        entity_cache.backend.set(entity_cache.key(DataObjectDB, updated_id), stale)
+        return errors
+
+    with (
+        patch.object(BulkJobRunner, "_write", staticmethod(write_or_fail)),
+        patch.object(BulkJobRunner, "_write_chunk", write_chunk_then_read),
+    ):
+        job_id = client.post(
+            "/data-objects/bulk-jobs?mode=upsert", json={"data_domain_id": domain_id, "data_objects": objects}
+        ).json()["id"]
+        bulk_job_runner.shutdown()
+
+    job = client.get(f"/data-objects/bulk-jobs/{job_id}").json()
+    assert (job["succeeded"], job["failed"]) == (1, 1)
+    with session_factory() as db:
+        assert DataObjectRepository(db).get_by_id(updated_id).type == "view"
+
+
+def test_resume_continues_abandoned_jobs(session_factory, domain_id):
+    """Test that a job left running by a stopped worker resumes after its last chunk."""
+    stale = datetime.now(timezone.utc) - timedelta(seconds=bulk_job_runner.stale_seconds + 1)
+    with session_factory() as db:
+        for job_id, updated_at in [("abandoned", stale), ("in-progress", datetime.now(timezone.utc))]:
+            db.add(BulkJobDB(
+                id=job_id, mode="create", data_domain_id=domain_id, payload=make_objects(4), status=JOB_RUNNING,
+                total=4, processed=2, succeeded=2, failed=0, errors=[], created_by="test_user",
+                started_at=stale, updated_at=updated_at
+            ))
+        db.commit()
+
+    assert bulk_job_runner.resume() == ["abandoned"]
+    bulk_job_runner.shutdown()
+
+    assert client.get("/data-objects/bulk-jobs/abandoned").json()["processed"] == 4
+    assert client.get("/data-objects/bulk-jobs/in-progress").json()["status"] == JOB_RUNNING
+    with session_factory() as db:
+        assert sorted(row.name for row in db.query(DataObjectDB)) == ["table_2", "table_3"]
+
+
+def add_job(session_factory, domain_id, job_id, count):
+    """Queue a job row without starting it."""
+    with session_factory() as db:
+        db.add(BulkJobDB(
+            id=job_id, mode="create", data_domain_id=domain_id, payload=make_objects(count), total=count,
+            errors=[], created_by="test_user"
+        ))
+        db.commit()
+
+
+def test_slow_chunk_is_not_reclaimed(session_factory, domain_id):
+    """Test that a job whose chunk outlasts stale_seconds cannot be claimed by another worker meanwhile."""
+    import threading
+    import time
+    from app.services.bulk_jobs import BulkJobRunner
+
+    add_job(session_factory, domain_id, "slow", 2)
+    claims = []
+
+    def reclaim():
+        with session_factory() as other:
+            claims.append(BulkJobRepository(other).claim("slow", stale_after=0.1))
+            other.commit()
+
+    write = BulkJobRunner._write
+
+    def slow_write(repository, job, data_objects):
+        write(repository, job, data_objects)
+        other_worker = threading.Thread(target=reclaim)
+        other_worker.start()
+        time.sleep(0.3)
+        slow_write.other_worker = other_worker
+
+    with patch.object(BulkJobRunner, "_write", staticmethod(slow_write)):
+        bulk_job_runner._run("slow")
+    slow_write.other_worker.join()
+
+    assert claims == [False]
+    job = client.get("/data-objects/bulk-jobs/slow").json()
+    assert (job["status"], job["processed"], job["succeeded"]) == (JOB_COMPLETED, 2, 2)
+
+
+def test_job_taken_over_between_chunks_stops(session_factory, domain_id):
+    """Test that a worker whose job was reclaimed since its last heartbeat writes nothing more."""
+    add_job(session_factory, domain_id, "taken", 4)
+    heartbeat = BulkJobRepository.heartbeat
+    calls = []
+
+    def heartbeat_after_takeover(self, id, seen, now):
+        calls.append(id)
+        if len(calls) == 2:
+            # Another worker claims the job right after the first heartbeat committed
+            with session_factory() as other:
+                assert BulkJobRepository(other).claim(id, stale_after=-1)
+                other.commit()
+        return heartbeat(self, id, seen, now)
+
+    with patch.object(BulkJobRepository, "heartbeat", heartbeat_after_takeover):
+        bulk_job_runner._run("taken")
+
+    job = client.get("/data-objects/bulk-jobs/taken").json()
+    assert (job["status"], job["processed"]) == (JOB_RUNNING, 0)
+    with session_factory() as db:
+        assert db.query(DataObjectDB).count() == 0
+
+
+def test_unknown_bulk_job(session_factory):
+    """Test that an unknown job ID is a 404."""
+    assert client.get("/data-objects/bulk-jobs/missing").status_code == 404
@@ -19,7 +19,7 @@ def test_db():
     Base.metadata.create_all(bind=engine)
     
     # Create a new engine and session for testing
-    test_engine = create_engine(TEST_DATABASE_URL)
+    test_engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
     
     # Create tables in the test database
@@ -162,5 +162,55 @@ def test_get_all_data_connectors(repository):
     
     assert len(all_connectors) >= 2  # May be more due to previous tests
 
+def test_get_page_walks_all_connectors_with_cursor(repository):
+    """Test that following next_cursor visits every connector exactly once in (created_at, id) order."""
+    for i in range(5):
+        repository.create(DataConnectorCreate(name=f"Paged Connector {i}", type="rest", configuration={"endpoint_url": "https://api.example.com"}), "test_user")
+    
+    expected = sorted(repository.get_all(), key=lambda row: (row.created_at, row.id))
+    
+    seen = []
+    cursor = None
+    while True:
+        rows, cursor = repository.get_page(2, cursor=cursor)
+        assert len(rows) <= 2
+        seen.extend(rows)
+        if cursor is None:
+            break
+    
+    assert [row.id for row in seen] == [row.id for row in expected]
+    assert repository.count() == len(expected)
+
+def test_get_page_rejects_malformed_cursor(repository):
+    """Test that a malformed cursor is reported as a ValueError."""
+    with pytest.raises(ValueError):
+        repository.get_page(2, cursor="not-a-cursor")
+
+def test_list_connectors_returns_next_cursor(test_db):
+    """Test the list endpoint's cursor and optional total."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.core.database import get_db
+    
+    app.dependency_overrides[get_db] = lambda: test_db
+    try:
+        client = TestClient(app)
+        first = client.get("/dataconnectors/", params={"size": 1}).json()
+        assert len(first["data"]) == 1
+        assert first["pagination"]["total"] >= 2
+        assert first["pagination"]["next_cursor"] is not None
+        
+        second = client.get(
+            "/dataconnectors/",
+            params={"size": 1, "cursor": first["pagination"]["next_cursor"], "include_total": False}
+        ).json()
+        assert second["data"][0]["id"] != first["data"][0]["id"]
+        assert second["pagination"]["total"] is None
+        assert second["pagination"]["pages"] is None
+        
+        assert client.get("/dataconnectors/", params={"cursor": "not-a-cursor"}).status_code == 400
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
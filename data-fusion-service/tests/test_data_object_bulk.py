@@ -5,10 +5,72 @@ Test cases for bulk data object creation functionality.
 import pytest
 from unittest.mock import Mock, patch
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from app.main import app
+from app.core.database import Base, get_db, unit_of_work
+from app.models.data_domain import DataDomainCreate
+from app.models.data_field import DataFieldDB
+from app.models.data_object import DataObjectDB
+from app.models.data_object_bulk import DataObjectCreateBulk
+from app.repositories.data_domain_repository import DataDomainRepository
+from app.repositories.data_object_repository import DataObjectRepository
 
 client = TestClient(app)
 
+# Create a test database in memory
+TEST_DATABASE_URL = "sqlite:///:memory:"
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database session shared with the API through get_db."""
+    test_engine = create_engine(
+        TEST_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=test_engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    
+    db = TestingSessionLocal()
+    
+    def override_get_db():
+        with unit_of_work(db):
+            yield db
+    
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield db
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        db.close()
+
+
+@pytest.fixture
+def domain_id(test_db):
+    """Create a data domain to register objects under."""
+    repository = DataDomainRepository(test_db)
+    domain_id = repository.create(DataDomainCreate(name="Bulk Domain"), "test_user").id
+    test_db.commit()
+    return domain_id
+
+
+def make_objects(domain_id, count, fields_per_object):
+    """Build bulk object payloads with the given shape."""
+    return [
+        {
+            "name": f"table_{i}",
+            "description": f"Table {i}",
+            "type": "table",
+            "data_domain_id": domain_id,
+            "data_fields": [
+                {"name": f"column_{j}", "type": "string", "is_required": j == 0}
+                for j in range(fields_per_object)
+            ]
+        }
+        for i in range(count)
+    ]
+
 def test_bulk_create_with_fields():
     """Test creating multiple data objects with associated fields."""
     
@@ -97,6 +159,165 @@ def test_bulk_create_with_domain_validation():
     assert response_data["data_domain_id"] == "valid-domain-id"
     assert len(response_data["data_objects"]) == 1
 
+def test_bulk_create_persists_objects_and_fields(test_db, domain_id):
+    """Test that the bulk endpoint writes every object and field."""
+    response = client.post(
+        "/data-objects/bulk",
+        json={"data_domain_id": domain_id, "data_objects": make_objects(domain_id, 3, 4)}
+    )
+    
+    assert response.status_code == 200
+    created = response.json()
+    assert [obj["name"] for obj in created] == ["table_0", "table_1", "table_2"]
+    assert all(len(obj["data_fields"]) == 4 for obj in created)
+    assert all(obj["data_domain_id"] == domain_id for obj in created)
+    
+    assert test_db.query(DataObjectDB).count() == 3
+    assert test_db.query(DataFieldDB).count() == 12
+    fields = test_db.query(DataFieldDB).filter(DataFieldDB.object_id == created[0]["id"]).all()
+    assert sorted(field.name for field in fields) == ["column_0", "column_1", "column_2", "column_3"]
+
+
+def test_bulk_create_is_atomic(test_db, domain_id):
+    """Test that a failing row rolls back the whole batch."""
+    objects = make_objects(domain_id, 3, 2)
+    # Duplicate field name violates uq_name_object_id on the last object
+    objects[-1]["data_fields"].append({"name": "column_0", "type": "string"})
+    
+    # Skip the pre-validation that would report the duplicate, so the database rejects it
+    with patch.object(DataObjectRepository, "find_bulk_conflicts", return_value=[]):
+        response = client.post(
+            "/data-objects/bulk",
+            json={"data_domain_id": domain_id, "data_objects": objects}
+        )
+    
+    assert response.status_code == 500
+    assert test_db.query(DataObjectDB).count() == 0
+    assert test_db.query(DataFieldDB).count() == 0
+
+
+def test_bulk_create_commits_once(test_db, domain_id):
+    """Test that a bulk request is written by a single commit."""
+    commits = []
+    event.listen(test_db, "after_commit", commits.append)
+    
+    response = client.post(
+        "/data-objects/bulk",
+        json={"data_domain_id": domain_id, "data_objects": make_objects(domain_id, 5, 4)}
+    )
+    
+    assert response.status_code == 200
+    assert len(commits) == 1
+    test_db.rollback()
+    assert test_db.query(DataObjectDB).count() == 5
+    assert test_db.query(DataFieldDB).count() == 20
+
+
+def test_create_bulk_chunks_inserts(test_db, domain_id):
+    """Test that create_bulk spans several INSERT chunks without losing rows."""
+    repository = DataObjectRepository(test_db)
+    objects = [DataObjectCreateBulk(**obj) for obj in make_objects(domain_id, 7, 3)]
+    
+    created = repository.create_bulk(domain_id, objects, created_by="test_user", chunk_size=2)
+    
+    assert len(created) == 7
+    assert test_db.query(DataObjectDB).count() == 7
+    assert test_db.query(DataFieldDB).count() == 21
+    object_row, field_rows = created[0]
+    assert {row["object_id"] for row in field_rows} == {object_row["id"]}
+    assert object_row["created_by"] == "test_user"
+
+
+def test_bulk_create_reports_every_conflict(test_db, domain_id):
+    """Test that all duplicates, in the request and in the domain, are reported at once."""
+    client.post("/data-objects/bulk", json={"data_domain_id": domain_id, "data_objects": make_objects(domain_id, 2, 1)})
+    objects = make_objects(domain_id, 5, 2)
+    objects[3]["name"] = "table_2"
+    objects[4]["data_fields"].append({"name": "column_1", "type": "string"})
+    
+    selects = []
+    
+    def record_selects(conn, cursor, statement, parameters, context, executemany):
+        if "FROM data_objects" in statement:
+            selects.append(statement)
+    
+    engine = test_db.get_bind()
+    event.listen(engine, "before_cursor_execute", record_selects)
+    try:
+        response = client.post("/data-objects/bulk", json={"data_domain_id": domain_id, "data_objects": objects})
+    finally:
+        event.remove(engine, "before_cursor_execute", record_selects)
+    
+    assert response.status_code == 400
+    assert [(error["index"], error["name"], error.get("field")) for error in response.json()["detail"]] == [
+        (0, "table_0", None), (1, "table_1", None), (3, "table_2", None), (4, "table_4", "column_1")
+    ]
+    assert len(selects) == 1
+    assert test_db.query(DataObjectDB).count() == 2
+
+
+def upsert(domain_id, objects):
+    """Register objects through the bulk endpoint in upsert mode."""
+    return client.post(
+        "/data-objects/bulk", params={"mode": "upsert"},
+        json={"data_domain_id": domain_id, "data_objects": objects}
+    )
+
+
+def test_bulk_upsert_of_unchanged_schema_writes_nothing(test_db, domain_id):
+    """Test that re-registering the same schema only reads."""
+    objects = make_objects(domain_id, 3, 4)
+    assert upsert(domain_id, objects).json() == {"created": 3, "updated": 0, "unchanged": 0}
+    
+    writes = []
+    
+    def record_writes(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith("SELECT"):
+            writes.append(statement)
+    
+    engine = test_db.get_bind()
+    event.listen(engine, "before_cursor_execute", record_writes)
+    try:
+        response = upsert(domain_id, objects)
+    finally:
+        event.remove(engine, "before_cursor_execute", record_writes)
+    
+    assert response.json() == {"created": 0, "updated": 0, "unchanged": 3}
+    assert writes == []
+    assert test_db.query(DataObjectDB).count() == 3
+    assert test_db.query(DataFieldDB).count() == 12
+
+
+def test_bulk_upsert_applies_only_changes(test_db, domain_id):
+    """Test that changed objects and fields are updated in place and new ones created."""
+    upsert(domain_id, make_objects(domain_id, 3, 2))
+    before = {row.name: (row.id, row.updated_at) for row in test_db.query(DataObjectDB)}
+    
+    objects = make_objects(domain_id, 4, 2)
+    objects[0]["description"] = "Renamed"
+    objects[1]["data_fields"][1]["type"] = "integer"
+    objects[1]["data_fields"].append({"name": "column_new", "type": "string"})
+    response = upsert(domain_id, objects)
+    
+    assert response.json() == {"created": 1, "updated": 2, "unchanged": 1}
+    test_db.expire_all()
+    rows = {row.name: row for row in test_db.query(DataObjectDB)}
+    assert rows["table_0"].id == before["table_0"][0]
+    assert rows["table_0"].description == "Renamed"
+    assert rows["table_2"].updated_at == before["table_2"][1]
+    fields = {field.name: field.type for field in rows["table_1"].data_fields}
+    assert fields == {"column_0": "string", "column_1": "integer", "column_new": "string"}
+    assert test_db.query(DataFieldDB).count() == 4 * 2 + 1
+
+
+def test_bulk_upsert_rejects_repeated_names(test_db, domain_id):
+    """Test that an object name may appear only once per upsert."""
+    objects = make_objects(domain_id, 2, 1)
+    objects[1]["name"] = objects[0]["name"]
+    
+    assert upsert(domain_id, objects).status_code == 400
+
+
 if __name__ == "__main__":
     test_bulk_create_with_fields()
     test_bulk_create_without_fields() 
@@ -0,0 +1,162 @@
+"""
+Data Fusion Hub Service - Streaming NDJSON Ingestion Tests
+"""
+
+import gzip
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.api.v1 import dataobjects
+from app.main import app
+from app.models.data_domain import DataDomainCreate
+from app.models.data_field import DataFieldDB
+from app.models.data_object import DataObjectDB
+from app.repositories.data_domain_repository import DataDomainRepository
+from app.repositories.data_object_repository import DataObjectRepository
+from app.utils.ndjson import iter_ndjson_lines
+
+client = TestClient(app)
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+@pytest.fixture
+def domain_id(app_db):
+    """Create a data domain to ingest objects into."""
+    domain_id = DataDomainRepository(app_db).create(DataDomainCreate(name="Ingest Domain"), "test_user").id
+    app_db.commit()
+    return domain_id
+
+
+def make_body(domain_id, count):
+    """Build an NDJSON body with one data object per line."""
+    return b"".join(
+        json.dumps({
+            "name": f"table_{i}", "type": "table", "data_domain_id": domain_id,
+            "data_fields": [{"name": "id", "type": "integer"}]
+        }).encode() + b"\n"
+        for i in range(count)
+    )
+
+
+def in_chunks(body, size=7):
+    """Send a body in small pieces, splitting lines across chunks."""
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def test_ingest_writes_objects_in_batches(app_db, domain_id, monkeypatch):
+    """Test that a chunked gzip body is written in fixed-size batches."""
+    monkeypatch.setattr(dataobjects, "INGEST_BATCH_SIZE", 2)
+    inserts = []
+
+    def record_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO data_objects"):
+            inserts.append(statement)
+
+    # The async test engine is local to the fixture, so listen on all engines
+    event.listen(Engine, "before_cursor_execute", record_inserts)
+    try:
+        response = client.post(
+            "/data-objects/ingest",
+            content=in_chunks(gzip.compress(make_body(domain_id, 5))),
+            headers={**NDJSON, "Content-Encoding": "gzip"},
+        )
+    finally:
+        event.remove(Engine, "before_cursor_execute", record_inserts)
+
+    assert response.status_code == 200
+    assert response.json() == {"created": 5, "updated": 0, "unchanged": 0}
+    assert len(inserts) == 3
+    assert app_db.query(DataObjectDB).count() == 5
+    assert app_db.query(DataFieldDB).count() == 5
+
+
+def test_ingest_upsert_mode(app_db, domain_id):
+    """Test that re-ingesting the same body in upsert mode changes nothing."""
+    body = make_body(domain_id, 3)
+    client.post("/data-objects/ingest", content=body, headers=NDJSON)
+
+    response = client.post("/data-objects/ingest", params={"mode": "upsert"}, content=body, headers=NDJSON)
+
+    assert response.json() == {"created": 0, "updated": 0, "unchanged": 3}
+    assert app_db.query(DataObjectDB).count() == 3
+
+
+def test_ingest_rejects_bad_lines_atomically(app_db, domain_id, monkeypatch):
+    """Test that an invalid line rejects the whole body, including written batches."""
+    monkeypatch.setattr(dataobjects, "INGEST_BATCH_SIZE", 2)
+    body = make_body(domain_id, 3) + b'{"name": "broken"}\n'
+
+    response = client.post("/data-objects/ingest", content=body, headers=NDJSON)
+
+    assert response.status_code == 422
+    assert response.json()["detail"]["line"] == 4
+    assert app_db.query(DataObjectDB).count() == 0
+
+    response = client.post("/data-objects/ingest", content=make_body("missing-domain", 1), headers=NDJSON)
+    assert response.status_code == 400
+    assert client.post("/data-objects/ingest", content=make_body(domain_id, 1)).status_code == 415
+    truncated = gzip.compress(make_body(domain_id, 3))[:-10]
+    response = client.post("/data-objects/ingest", content=truncated, headers={**NDJSON, "Content-Encoding": "gzip"})
+    assert response.status_code == 400
+
+
+def test_ingest_rejects_repeated_names(app_db, domain_id, monkeypatch):
+    """Test that a name repeated in the body is a 409 naming its line, within a batch or in a later one."""
+    monkeypatch.setattr(dataobjects, "INGEST_BATCH_SIZE", 2)
+    first, second, third = make_body(domain_id, 3).splitlines(keepends=True)
+
+    response = client.post("/data-objects/ingest", content=first + second + third + second, headers=NDJSON)
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Line 4: 'table_1': Data object already exists in the domain"
+    assert app_db.query(DataObjectDB).count() == 0
+
+    response = client.post("/data-objects/ingest", content=third + third, headers=NDJSON)
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Line 2: Duplicate data object name, first used at line 1"
+    assert app_db.query(DataObjectDB).count() == 0
+
+
+def test_ingest_rejects_names_taken_in_domain(app_db, domain_id, monkeypatch):
+    """Test that in create mode a name already in the domain is a 409 naming its line."""
+    monkeypatch.setattr(dataobjects, "INGEST_BATCH_SIZE", 2)
+    client.post("/data-objects/ingest", content=make_body(domain_id, 1), headers=NDJSON)
+    body = b"".join(
+        json.dumps({
+            "name": name, "type": "table", "data_domain_id": domain_id,
+            "data_fields": [{"name": "id", "type": "integer"}]
+        }).encode() + b"\n"
+        for name in ("new_0", "new_1", "new_2", "table_0")
+    )
+
+    response = client.post("/data-objects/ingest", content=body, headers=NDJSON)
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Line 4: 'table_0': Data object already exists in the domain"
+    assert app_db.query(DataObjectDB).count() == 1
+
+    # A row that appears after the check still ends in a 409, not a 500
+    with patch.object(DataObjectRepository, "find_bulk_conflicts", return_value=[]):
+        response = client.post("/data-objects/ingest", content=body, headers=NDJSON)
+    assert response.status_code == 409
+    assert app_db.query(DataObjectDB).count() == 1
+
+
+async def test_iter_ndjson_lines_bounds_line_length():
+    """Test that lines are split across chunks and overlong lines are rejected."""
+    async def chunks(*parts):
+        for part in parts:
+            yield part
+
+    assert [line async for line in iter_ndjson_lines(chunks(b'{"a"', b': 1}\n\n{"b": 2}'))] == [
+        b'{"a": 1}', b"", b'{"b": 2}'
+    ]
+    with pytest.raises(ValueError):
+        [line async for line in iter_ndjson_lines(chunks(b"x" * 10, b"x" * 10), max_line_bytes=15)]
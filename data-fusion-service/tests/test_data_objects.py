@@ -2,12 +2,23 @@
 Data Fusion Hub Service - Data Object Tests
 """
 
+import csv
+import io
+import json
 import pytest
-from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base, get_db, unit_of_work
+from app.main import app
 from app.models.data_domain import DataDomainCreate
 from app.models.data_object import DataObjectCreate
 from app.repositories.data_domain_repository import DataDomainRepository
+from app.repositories.data_field_repository import DataFieldRepository
 from app.repositories.data_object_repository import DataObjectRepository
+from app.utils.batch import BATCH_GET_CHUNK_SIZE
 
 def test_create_data_object():
     """Test creating a data object."""
@@ -16,5 +27,244 @@ def test_create_data_object():
     # For now, let's just make sure the basic structure works
     assert True
 
+@pytest.fixture
+def test_db():
+    """Create a test database session shared with the API through get_db."""
+    test_engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=test_engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)()
+    
+    def override_get_db():
+        with unit_of_work(db):
+            yield db
+    
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield db
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        db.close()
+
+
+@pytest.fixture
+def catalog(test_db):
+    """Create two domains holding tables and views with spread-out timestamps."""
+    domains = DataDomainRepository(test_db)
+    sales = domains.create(DataDomainCreate(name="Sales"), "test_user").id
+    hr = domains.create(DataDomainCreate(name="HR"), "test_user").id
+    
+    repository = DataObjectRepository(test_db)
+    start = datetime(2024, 1, 1)
+    for i in range(10):
+        created = repository.create(
+            DataObjectCreate(name=f"orders_{i}", type="table" if i % 2 else "view", data_domain_id=sales),
+            "test_user"
+        )
+        created.created_at = created.updated_at = start + timedelta(days=i)
+    repository.create(DataObjectCreate(name="employees", type="table", data_domain_id=hr), "test_user")
+    test_db.commit()
+    return {"sales": sales, "hr": hr, "start": start}
+
+
+def test_get_page_pushes_filters_into_sql(test_db, catalog):
+    """Test the domain, type, name prefix and updated_since filters."""
+    repository = DataObjectRepository(test_db)
+    
+    rows, _ = repository.get_page(100, data_domain_id=catalog["sales"], type="table")
+    assert sorted(row.name for row in rows) == ["orders_1", "orders_3", "orders_5", "orders_7", "orders_9"]
+    
+    rows, _ = repository.get_page(100, name_prefix="emp")
+    assert [row.name for row in rows] == ["employees"]
+    # LIKE wildcards in the prefix are matched literally
+    assert repository.get_page(100, name_prefix="orders%")[0] == []
+    
+    since = catalog["start"] + timedelta(days=8)
+    assert repository.count(data_domain_id=catalog["sales"], updated_since=since) == 2
+
+
+def test_get_page_walks_every_sort_with_cursor(test_db, catalog):
+    """Test that following cursors visits each object once in every sort order."""
+    repository = DataObjectRepository(test_db)
+    
+    for sort in ("created_at", "-created_at", "updated_at", "name", "-name"):
+        seen = []
+        cursor = None
+        while True:
+            rows, cursor = repository.get_page(3, cursor=cursor, sort=sort, data_domain_id=catalog["sales"])
+            seen.extend(row.name for row in rows)
+            if cursor is None:
+                break
+        key = (lambda name: int(name.split("_")[1])) if "at" in sort else None
+        assert seen == sorted(seen, key=key, reverse=sort.startswith("-")), sort
+        assert len(seen) == 10
+
+
+def test_get_page_rejects_unknown_sort(test_db):
+    """Test that only indexed columns can be sorted on."""
+    with pytest.raises(ValueError):
+        DataObjectRepository(test_db).get_page(10, sort="description")
+
+
+def test_list_data_objects_endpoint(test_db, catalog):
+    """Test filters, sort and cursor pagination through the API."""
+    client = TestClient(app)
+    params = {"data_domain_id": catalog["sales"], "sort": "-created_at", "size": 4, "include_total": True}
+    
+    first = client.get("/data-objects/", params=params).json()
+    assert [item["name"] for item in first["data"]] == ["orders_9", "orders_8", "orders_7", "orders_6"]
+    assert first["pagination"]["total"] == 10
+    assert first["pagination"]["pages"] == 3
+    
+    second = client.get(
+        "/data-objects/", params={**params, "cursor": first["pagination"]["next_cursor"], "include_total": False}
+    ).json()
+    assert [item["name"] for item in second["data"]] == ["orders_5", "orders_4", "orders_3", "orders_2"]
+    assert second["pagination"]["total"] is None
+    
+    assert client.get("/data-objects/", params={"sort": "description"}).status_code == 400
+    assert client.get("/data-objects/", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
+
+def add_fields(test_db, object_id, names):
+    """Add string data fields to a data object."""
+    repository = DataFieldRepository(test_db)
+    for name in names:
+        repository.create({
+            "object_id": object_id, "name": name, "type": "string",
+            "created_by": "test_user", "updated_by": "test_user"
+        })
+    test_db.commit()
+
+
+def test_export_ndjson_streams_objects_with_fields(test_db, catalog):
+    """Test that each NDJSON line holds one object and all of its fields."""
+    objects = {row.name: row.id for row in DataObjectRepository(test_db).get_by_domain_id(catalog["sales"])}
+    add_fields(test_db, objects["orders_0"], ["id", "amount"])
+    
+    response = TestClient(app).get("/data-objects/export", params={"data_domain_id": catalog["sales"]})
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["name"] for record in records] == [f"orders_{i}" for i in range(10)]
+    assert sorted(field["name"] for field in records[0]["data_fields"]) == ["amount", "id"]
+    assert records[0]["created_at"] == catalog["start"].isoformat()
+    # Objects without fields are still exported
+    assert records[1]["data_fields"] == []
+
+
+def test_export_csv_writes_one_row_per_field(test_db, catalog):
+    """Test the CSV export, including objects without fields and filters."""
+    objects = {row.name: row.id for row in DataObjectRepository(test_db).get_by_domain_id(catalog["sales"])}
+    add_fields(test_db, objects["orders_1"], ["id", "amount"])
+    
+    response = TestClient(app).get(
+        "/data-objects/export", params={"format": "csv", "data_domain_id": catalog["sales"], "type": "table"}
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["object_name"] for row in rows] == ["orders_1", "orders_1", "orders_3", "orders_5", "orders_7", "orders_9"]
+    assert sorted(row["field_name"] for row in rows[:2]) == ["amount", "id"]
+    assert rows[2]["field_name"] == ""
+
+
+def record_selects(test_db, request):
+    """Send a request and return it with the SELECTs it ran on the test database."""
+    selects = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+    
+    engine = test_db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = request()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return response, selects
+
+
+def test_export_reads_objects_and_fields_in_one_query(test_db, catalog):
+    """Test that the export joins fields instead of querying them per object."""
+    for row in DataObjectRepository(test_db).get_by_domain_id(catalog["sales"]):
+        add_fields(test_db, row.id, ["id"])
+    
+    response, selects = record_selects(test_db, lambda: TestClient(app).get("/data-objects/export"))
+    
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 11
+    assert len(selects) == 1
+
+
+def test_list_include_fields_loads_page_in_two_queries(test_db, catalog):
+    """Test that ?include=fields adds one query per page, not one per object."""
+    for row in DataObjectRepository(test_db).get_by_domain_id(catalog["sales"]):
+        add_fields(test_db, row.id, ["id", "amount"])
+    params = {"data_domain_id": catalog["sales"], "size": 10}
+    
+    response, selects = record_selects(
+        test_db, lambda: TestClient(app).get("/data-objects/", params={**params, "include": "fields"})
+    )
+    
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert len(data) == 10
+    assert all(sorted(field["name"] for field in item["data_fields"]) == ["amount", "id"] for item in data)
+    assert len(selects) == 2
+    
+    plain = TestClient(app).get("/data-objects/", params=params).json()["data"]
+    assert "data_fields" not in plain[0]
+
+
+def test_get_include_fields(test_db, catalog):
+    """Test fetching one object with and without its fields."""
+    object_id = DataObjectRepository(test_db).get_by_domain_id(catalog["hr"])[0].id
+    add_fields(test_db, object_id, ["name"])
+    client = TestClient(app)
+    
+    response = client.get(f"/data-objects/{object_id}", params={"include": "fields"})
+    assert response.status_code == 200
+    assert [field["name"] for field in response.json()["data_fields"]] == ["name"]
+    
+    assert "data_fields" not in client.get(f"/data-objects/{object_id}").json()
+    assert client.get(f"/data-objects/{object_id}", params={"include": "owners"}).status_code == 422
+
+
+def test_batch_get_reports_missing_ids(test_db, catalog):
+    """Test that batch-get returns objects in request order and lists unknown IDs."""
+    ids = [row.id for row in DataObjectRepository(test_db).get_by_domain_id(catalog["sales"])][:3]
+    requested = [ids[2], "missing", ids[0], ids[2], ids[1]]
+    
+    response, selects = record_selects(
+        test_db, lambda: TestClient(app).post("/data-objects/batch-get", json={"ids": requested})
+    )
+    
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["data"]] == [ids[2], ids[0], ids[1]]
+    assert response.json()["missing"] == ["missing"]
+    assert len(selects) == 1
+
+
+def test_batch_get_chunks_large_id_lists(test_db, catalog):
+    """Test that long ID lists are split over several IN queries."""
+    ids = [row.id for row in DataObjectRepository(test_db).get_by_domain_id(catalog["sales"])]
+    requested = ids + [f"missing-{i}" for i in range(BATCH_GET_CHUNK_SIZE * 2)]
+    
+    response, selects = record_selects(
+        test_db, lambda: TestClient(app).post("/data-objects/batch-get", json={"ids": requested})
+    )
+    
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == 10
+    assert len(response.json()["missing"]) == BATCH_GET_CHUNK_SIZE * 2
+    assert len(selects) == 3
+    
+    assert TestClient(app).post("/data-objects/batch-get", json={"ids": []}).status_code == 422
@@ -0,0 +1,197 @@
+"""
+Data Fusion Hub Service - Entity Cache Tests
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import EntityCache, InMemoryRedis, LRUCacheBackend, RedisCacheBackend
+from app.core.database import Base
+from app.main import app
+from app.models.data_connector import DataConnectorCreate, DataConnectorUpdate
+from app.models.data_domain import DataDomainCreate, DataDomainUpdate
+from app.repositories.data_connector_repository import DataConnectorRepository
+from app.repositories.data_domain_repository import DataDomainRepository
+
+TEST_DATABASE_URL = "sqlite:///:memory:"
+
+
+@pytest.fixture
+def test_engine():
+    """Create an in-memory database that counts the SELECTs it runs."""
+    engine = create_engine(TEST_DATABASE_URL)
+    Base.metadata.create_all(bind=engine)
+    engine.selects = 0
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            engine.selects += 1
+    
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def test_db(test_engine):
+    """Create a test database session."""
+    db = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    """Create an entity cache on each backend."""
+    if request.param == "memory":
+        return EntityCache(LRUCacheBackend(max_entries=100, ttl_seconds=60))
+    return EntityCache(RedisCacheBackend(InMemoryRedis(), ttl_seconds=60))
+
+
+def test_get_by_id_reads_through_cache(test_engine, test_db, cache):
+    """Test that repeated lookups are served without touching the database."""
+    repository = DataDomainRepository(test_db, cache=cache)
+    created = repository.create(DataDomainCreate(name="Cached Domain", description="cached"), "test_user")
+    
+    test_engine.selects = 0
+    first = repository.get_by_id(created.id)
+    second = repository.get_by_id(created.id)
+    
+    assert test_engine.selects == 1
+    assert first.name == second.name == "Cached Domain"
+    assert second.created_at == created.created_at
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_update_and_delete_invalidate(test_db, cache):
+    """Test that writes drop the cached entry."""
+    repository = DataConnectorRepository(test_db, cache=cache)
+    created = repository.create(
+        DataConnectorCreate(name="Cached API", type="rest", configuration={"endpoint_url": "https://a"}),
+        "test_user"
+    )
+    assert repository.get_by_id(created.id).name == "Cached API"
+    
+    repository.update(created.id, DataConnectorUpdate(name="Renamed API"), "test_user")
+    cached = repository.get_by_id(created.id)
+    assert cached.name == "Renamed API"
+    assert cached.configuration == {"endpoint_url": "https://a"}
+    
+    assert repository.delete(created.id) is True
+    assert repository.get_by_id(created.id) is None
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_invalidation_is_repeated_on_commit(test_db, cache):
+    """Test that a row cached while an update was uncommitted is dropped at commit."""
+    repository = DataDomainRepository(test_db, cache=cache)
+    created = repository.create(DataDomainCreate(name="Before"), "test_user")
+    test_db.commit()
+    stale = repository.get_by_id(created.id)
+    
+    repository.update(created.id, DataDomainUpdate(name="After"), "updater")
+    # A concurrent reader still sees the committed row and caches it again
+    cache.backend.set(cache.key(type(stale), created.id), {"id": created.id, "name": "Before"})
+    test_db.commit()
+    
+    assert repository.get_by_id(created.id).name == "After"
+
+
+def test_invalidation_waits_for_outermost_commit(test_db, cache):
+    """Test that an update's invalidation outlives savepoints and is repeated at the real commit."""
+    repository = DataDomainRepository(test_db, cache=cache)
+    created = repository.create(DataDomainCreate(name="Before"), "test_user")
+    test_db.commit()
+    stale = repository.get_by_id(created.id)
+    
+    with test_db.begin_nested():
+        repository.update(created.id, DataDomainUpdate(name="After"), "updater")
+    with pytest.raises(ValueError):
+        with test_db.begin_nested():
+            raise ValueError("contained failure")
+    cache.backend.set(cache.key(type(stale), created.id), {"id": created.id, "name": "Before"})
+    test_db.commit()
+    
+    assert repository.get_by_id(created.id).name == "After"
+
+
+def test_cached_rows_are_detached(test_db, cache):
+    """Test that a row served from the cache behaves like a detached row."""
+    from sqlalchemy import inspect
+    
+    repository = DataDomainRepository(test_db, cache=cache)
+    created = repository.create(DataDomainCreate(name="Detached"), "test_user")
+    test_db.commit()
+    repository.get_by_id(created.id)
+    
+    cached = repository.get_by_id(created.id)
+    
+    assert inspect(cached).detached
+    merged = test_db.merge(cached, load=False)
+    assert merged.name == "Detached"
+
+
+def test_replica_reads_are_not_cached(test_engine, tmp_path, cache):
+    """Test that a row read from a replica is returned but never cached."""
+    from app.core.database import RoutingSession
+    
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=replica)
+    with sessionmaker(bind=replica)() as db:
+        created = DataDomainRepository(db, cache=cache).create(DataDomainCreate(name="On Replica"), "test_user")
+        db.commit()
+        cache.backend.delete(cache.key(type(created), created.id))
+    
+    db = sessionmaker(class_=RoutingSession, bind=test_engine, replicas=[replica])()
+    db.use_replica = True
+    try:
+        repository = DataDomainRepository(db, cache=cache)
+        assert repository.get_by_id(created.id).name == "On Replica"
+        assert cache.backend.get(cache.key(type(created), created.id)) is None
+        
+        db.use_replica = False
+        assert repository.get_by_id(created.id) is None
+    finally:
+        db.close()
+        replica.dispose()
+
+
+def test_missing_rows_are_not_cached(test_engine, test_db, cache):
+    """Test that a lookup for a missing ID keeps going to the database."""
+    repository = DataDomainRepository(test_db, cache=cache)
+    
+    test_engine.selects = 0
+    assert repository.get_by_id("missing") is None
+    assert repository.get_by_id("missing") is None
+    assert test_engine.selects == 2
+
+
+def test_lru_evicts_and_expires():
+    """Test LRU eviction order and TTL expiry."""
+    backend = LRUCacheBackend(max_entries=2, ttl_seconds=60)
+    backend.set("a", {"v": 1})
+    backend.set("b", {"v": 2})
+    assert backend.get("a") == {"v": 1}  # a is now most recently used
+    backend.set("c", {"v": 3})
+    
+    assert backend.get("b") is None
+    assert backend.get("a") == {"v": 1}
+    assert backend.stats()["evictions"] == 1
+    
+    expiring = LRUCacheBackend(max_entries=2, ttl_seconds=0)
+    expiring.set("a", {"v": 1})
+    assert expiring.get("a") is None
+    assert expiring.stats()["expirations"] == 1
+
+
+def test_cache_stats_endpoint(current_user):
+    """Test that cache counters are exposed on the internal endpoint."""
+    response = TestClient(app).get("/internal/cache/stats")
+    
+    assert response.status_code == 200
+    assert {"hits", "misses", "evictions"} <= set(response.json())
@@ -0,0 +1,217 @@
+"""
+Data Fusion Hub Service - Role Membership and Permission Index Tests
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.migrations import backfill_user_roles
+from app.core.permissions import PermissionIndex, permission_index
+from app.main import app
+from app.models.role_db import RoleDB
+from app.models.user_db import UserDB
+from app.models.user_role_db import UserRoleDB
+from app.models.user_role_request_db import UserRoleRequestDB
+from app.repositories.user_role_repository import UserRoleRepository
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def test_db(app_db):
+    """Seed the test database with a user, two roles and a pending request."""
+    permission_index.clear()
+    app_db.add_all([
+        UserDB(id="user-1", email="member@example.com", first_name="Member", last_name="User"),
+        RoleDB(id="role-1", name="editor", created_by="test", updated_by="test"),
+        RoleDB(id="role-2", name="viewer", created_by="test", updated_by="test"),
+        UserRoleRequestDB(
+            id="request-1", user_id="user-1", role_id="role-1", justification="Editing",
+            created_by="test", updated_by="test"
+        ),
+    ])
+    app_db.commit()
+    yield app_db
+    permission_index.clear()
+
+
+async def has_role(test_db, user_id, role_id, statements=None):
+    """Check a role through the repository, recording the statements it runs."""
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statements is not None:
+            statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        async with test_db.session_factory() as db:
+            return await UserRoleRepository(db).has_role(user_id, role_id)
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+
+async def test_approval_grants_membership(test_db):
+    """Test that approving writes the membership and later checks are served from the index."""
+    assert await has_role(test_db, "user-1", "role-1") is False
+
+    response = client.put("/user-role-requests/request-1/approve", json={"status": "approved"})
+
+    assert response.status_code == 200
+    membership = test_db.query(UserRoleDB).one()
+    assert (membership.user_id, membership.role_id, membership.request_id) == ("user-1", "role-1", "request-1")
+
+    statements = []
+    assert await has_role(test_db, "user-1", "role-1", statements) is True
+    assert await has_role(test_db, "user-1", "role-1", statements) is True
+    assert await has_role(test_db, "user-1", "role-2", statements) is False
+    assert len(statements) == 1
+
+    # Approving again does not duplicate the membership
+    client.put("/user-role-requests/request-1/approve", json={"status": "approved"})
+    assert test_db.query(UserRoleDB).count() == 1
+
+
+async def test_denying_and_deleting_revoke_membership(test_db):
+    """Test that denying an approved request and deleting its role both take the role away."""
+    client.put("/user-role-requests/request-1/approve", json={"status": "approved"})
+    assert await has_role(test_db, "user-1", "role-1") is True
+
+    client.put("/user-role-requests/request-1/deny", json={"status": "denied"})
+    assert await has_role(test_db, "user-1", "role-1") is False
+    assert test_db.query(UserRoleDB).count() == 0
+
+    client.put("/user-role-requests/request-1/approve", json={"status": "approved"})
+    assert await has_role(test_db, "user-1", "role-1") is True
+    assert client.delete("/roles/role-1").status_code == 200
+    assert await has_role(test_db, "user-1", "role-1") is False
+    test_db.expire_all()
+    assert test_db.query(UserRoleDB).count() == 0
+
+
+async def test_denying_keeps_membership_backed_by_another_approval(test_db):
+    """Test that denying one of two approved requests for a role leaves the user holding it."""
+    client.put("/user-role-requests/request-1/approve", json={"status": "approved"})
+    test_db.add(UserRoleRequestDB(
+        id="request-2", user_id="user-1", role_id="role-1", justification="Again", created_by="test", updated_by="test"
+    ))
+    test_db.commit()
+    client.put("/user-role-requests/request-2/approve", json={"status": "approved"})
+
+    client.put("/user-role-requests/request-1/deny", json={"status": "denied"})
+    assert await has_role(test_db, "user-1", "role-1") is True
+    assert test_db.query(UserRoleDB).count() == 1
+
+    client.put("/user-role-requests/request-2/deny", json={"status": "denied"})
+    assert await has_role(test_db, "user-1", "role-1") is False
+    assert test_db.query(UserRoleDB).count() == 0
+
+
+def test_backfill_user_roles(test_db):
+    """Test that requests approved before memberships existed are backfilled once."""
+    test_db.query(UserRoleRequestDB).update({"status": "approved"})
+    test_db.commit()
+
+    assert backfill_user_roles(test_db.get_bind()) == 1
+    assert backfill_user_roles(test_db.get_bind()) == 0
+    assert test_db.query(UserRoleDB.user_id, UserRoleDB.role_id).one() == ("user-1", "role-1")
+
+
+def test_permission_index_reuses_bits_of_deleted_roles():
+    """Test that a deleted role's holders are dropped before a new role gets its bit."""
+    index = PermissionIndex(max_users=2)
+    index.load("alice", ["admin", "editor"])
+    index.load("bob", ["editor"])
+
+    index.invalidate_role("admin")
+    assert index.has_role("alice", "editor") is None
+    assert index.has_role("bob", "editor") is True
+    # carol's role takes admin's bit, and bob is the least recently used user
+    index.load("carol", ["auditor"])
+    index.load("alice", ["editor"])
+
+    assert index.has_role("alice", "auditor") is False
+    assert index.has_role("carol", "auditor") is True
+    assert index.has_role("bob", "editor") is None
+    assert index.stats()["evictions"] == 1
+
+
+def test_permission_index_reloads_users_after_max_age():
+    """Test that a user's roles expire, so changes made by other workers are picked up."""
+    index = PermissionIndex(max_age_seconds=60)
+    index.load("alice", ["editor"])
+    assert index.has_role("alice", "editor") is True
+
+    index.max_age_seconds = 0
+    index.load("alice", ["editor"])
+
+    assert index.has_role("alice", "editor") is None
+    assert index.get_role_ids("alice") is None
+    assert index.stats()["expirations"] == 1
+
+
+def test_invalidation_waits_for_outermost_commit(test_db):
+    """Test that an invalidation outlives savepoints and is repeated at the real commit."""
+    index = PermissionIndex()
+    with test_db.begin_nested():
+        index.invalidate_user("user-1", test_db)
+    with pytest.raises(ValueError):
+        with test_db.begin_nested():
+            raise ValueError("contained failure")
+    # A concurrent reader loads the memberships that are still committed
+    index.load("user-1", [])
+    test_db.commit()
+
+    assert index.has_role("user-1", "role-1") is None
+
+
+async def test_bulk_decision_updates_only_pending_requests(test_db):
+    """Test that a bulk approval decides pending requests in one UPDATE and grants their roles."""
+    test_db.add(UserDB(id="user-2", email="second@example.com", first_name="Second", last_name="User"))
+    test_db.add_all([
+        UserRoleRequestDB(
+            id=f"request-{i}", user_id=user_id, role_id=role_id, justification="Work",
+            status=status, created_by="test", updated_by="test"
+        )
+        for i, user_id, role_id, status in [
+            (2, "user-1", "role-2", "pending"), (3, "user-2", "role-1", "pending"), (4, "user-1", "role-2", "denied")
+        ]
+    ])
+    test_db.commit()
+    assert await has_role(test_db, "user-1", "role-2") is False
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0])
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = client.put("/user-role-requests/bulk-decision", json={
+            "request_ids": ["request-1", "request-2", "request-3", "request-4", "missing", "request-1"],
+            "status": "approved",
+        })
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "approved",
+        "updated": ["request-1", "request-2", "request-3"],
+        "skipped": ["request-4", "missing"],
+    }
+    assert statements == ["UPDATE", "SELECT", "INSERT"]
+    assert sorted(test_db.query(UserRoleDB.user_id, UserRoleDB.role_id).all()) == [
+        ("user-1", "role-1"), ("user-1", "role-2"), ("user-2", "role-1")
+    ]
+    assert await has_role(test_db, "user-1", "role-2") is True
+    assert {updated_by for updated_by, in test_db.query(UserRoleRequestDB.updated_by).filter(
+        UserRoleRequestDB.id.in_(["request-1", "request-2", "request-3"])
+    )} == {"system"}
+
+    # Decided requests are skipped by a later decision
+    response = client.put("/user-role-requests/bulk-decision", json={"request_ids": ["request-2"], "status": "denied"})
+    assert response.json()["skipped"] == ["request-2"]
+    assert client.put(
+        "/user-role-requests/bulk-decision", json={"request_ids": ["request-2"], "status": "revoked"}
+    ).status_code == 422
@@ -0,0 +1,256 @@
+"""
+Data Fusion Hub Service - Query Plan Tests
+
+Every lookup below must be answered with an index SEARCH on SQLite; a SCAN
+means the query reads the whole table.
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base, get_db, unit_of_work
+from app.core.migrations import (
+    create_missing_indexes,
+    deny_duplicate_pending_requests,
+    drop_obsolete_indexes,
+    rename_duplicate_data_objects,
+    rename_duplicate_user_emails,
+)
+from app.main import app
+from app.models.data_domain import DataDomainDB
+from app.models.data_object import DataObjectDB
+from app.models.role_db import RoleDB
+from app.models.user_db import UserDB
+from app.models.user_role_request_db import UserRoleRequestDB
+from app.repositories.data_field_repository import DataFieldRepository
+from app.repositories.data_object_repository import DataObjectRepository
+from app.repositories.user_role_request_repository import UserRoleRequestRepository
+from app.utils.pagination import encode_cursor
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def test_engine():
+    """Create an in-memory database that records the SELECTs it runs."""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    engine.selects = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            engine.selects.append((statement, parameters))
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def test_db(test_engine):
+    """Create a test database session."""
+    db = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def assert_uses_index(engine, run):
+    """Run a lookup and assert every SELECT it issued searches an index."""
+    engine.selects.clear()
+    run()
+    assert engine.selects, "lookup did not query the database"
+
+    selects = list(engine.selects)
+    with engine.connect() as conn:
+        for statement, parameters in selects:
+            plan = [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+            assert all(step.startswith("SEARCH") for step in plan), f"{statement}\n{plan}"
+
+
+def test_data_object_lookups_use_indexes(test_engine, test_db):
+    """Test the data object and data field repository lookups."""
+    objects = DataObjectRepository(test_db)
+    fields = DataFieldRepository(test_db)
+
+    assert_uses_index(test_engine, lambda: objects.get_by_domain_id("domain-id"))
+    assert_uses_index(test_engine, lambda: fields.get_by_object_id("object-id"))
+    assert_uses_index(test_engine, lambda: fields.get_by_name_and_object_id("column", "object-id"))
+
+
+@pytest.mark.parametrize("sort", ["created_at", "-updated_at", "name"])
+def test_data_object_pages_use_indexes(test_engine, test_db, sort):
+    """Test that listing a domain's objects reads one index range, with no sort step."""
+    objects = DataObjectRepository(test_db)
+    cursor = encode_cursor("orders" if sort == "name" else datetime(2024, 1, 1), "object-id")
+
+    assert_uses_index(test_engine, lambda: objects.get_page(20, sort=sort, data_domain_id="domain-id"))
+    assert_uses_index(test_engine, lambda: objects.get_page(20, cursor=cursor, sort=sort, data_domain_id="domain-id"))
+
+
+def test_user_role_request_lookups_use_indexes(test_engine, test_db):
+    """Test looking up role requests by user, by status and by status and role."""
+    assert_uses_index(test_engine, lambda: test_db.execute(
+        select(UserRoleRequestDB).where(UserRoleRequestDB.user_id == "user-id")
+    ).all())
+    assert_uses_index(test_engine, lambda: test_db.execute(
+        select(UserRoleRequestDB).where(UserRoleRequestDB.status == "pending")
+    ).all())
+    # The approver inbox query
+    assert_uses_index(test_engine, lambda: test_db.execute(
+        select(UserRoleRequestDB).where(
+            UserRoleRequestDB.status == "pending",
+            UserRoleRequestDB.role_id.in_(["role-1", "role-2"]),
+            UserRoleRequestDB.user_id != "user-id",
+        )
+    ).all())
+
+
+@pytest.mark.parametrize("filters", [
+    {}, {"status": "pending"}, {"status": "pending", "role_id": "role-id"}, {"user_id": "user-id"}
+])
+def test_user_role_request_pages_use_indexes(test_engine, test_db, filters):
+    """Test that listing a role request queue reads one index range, with no sort step."""
+    requests = UserRoleRequestRepository(test_db)
+    cursor = encode_cursor(datetime(2024, 1, 1), "request-id")
+
+    assert_uses_index(test_engine, lambda: requests.get_page(20, created_after=datetime(2023, 1, 1), **filters))
+    assert_uses_index(test_engine, lambda: requests.get_page(20, cursor=cursor, descending=True, **filters))
+
+
+@pytest.mark.parametrize("model", [DataDomainDB, DataObjectDB, RoleDB, UserRoleRequestDB])
+def test_audit_lookups_use_indexes(test_engine, test_db, model):
+    """Test looking up rows by their creator."""
+    assert_uses_index(test_engine, lambda: test_db.query(model).filter(model.created_by == "auditor").all())
+
+
+def test_approver_lookups_use_indexes(test_engine, test_db):
+    """Test the approver routes' lookups by role and by role and approver."""
+    test_db.add_all([
+        RoleDB(id="target", name="target", created_by="test_user", updated_by="test_user"),
+        RoleDB(id="approver", name="approver", created_by="test_user", updated_by="test_user"),
+    ])
+    test_db.commit()
+
+    def override_get_db():
+        with unit_of_work(test_db):
+            yield test_db
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        assert_uses_index(test_engine, lambda: client.get("/roles/target/approver-roles/"))
+        assert_uses_index(test_engine, lambda: client.delete("/roles/target/approver-roles/approver"))
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+def test_create_missing_indexes_migrates_existing_tables(test_engine):
+    """Test that indexes added to models are created on tables that predate them."""
+    with test_engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_data_objects_data_domain_id")
+        conn.exec_driver_sql("DROP INDEX uq_users_email_lower")
+
+    assert create_missing_indexes(test_engine) == ["uq_users_email_lower", "ix_data_objects_data_domain_id"]
+    assert create_missing_indexes(test_engine) == []
+
+
+def test_duplicate_pending_requests_are_denied_before_indexing(test_engine, test_db):
+    """Test that duplicate pending requests in an existing database do not block the unique index."""
+    with test_engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX uq_user_role_requests_pending_user_role")
+    test_db.add_all(
+        UserRoleRequestDB(
+            id=f"request-{i}", user_id="user-id", role_id="role-id", justification="Retry",
+            created_by="test_user", updated_by="test_user", created_at=datetime(2024, 1, 1, i)
+        )
+        for i in range(3)
+    )
+    test_db.commit()
+
+    assert deny_duplicate_pending_requests(test_engine) == 2
+    assert create_missing_indexes(test_engine) == ["uq_user_role_requests_pending_user_role"]
+    test_db.expire_all()
+    assert test_db.query(UserRoleRequestDB.id).filter(UserRoleRequestDB.status == "pending").all() == [("request-0",)]
+
+
+def test_duplicate_data_object_names_are_renamed_before_indexing(test_engine, test_db, caplog):
+    """Test that duplicate data object names in an existing database are renamed, with a log, to free names."""
+    with test_engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX uq_data_objects_domain_name")
+    test_db.add(DataDomainDB(id="domain-id", name="Domain", created_by="test_user", updated_by="test_user"))
+    test_db.add_all(
+        DataObjectDB(
+            id=f"object-{i}", name="orders", type="table", data_domain_id="domain-id",
+            created_by="test_user", updated_by="test_user", created_at=datetime(2024, 1, 1, i)
+        )
+        for i in range(3)
+    )
+    # Already holds the name the first duplicate would get
+    test_db.add(DataObjectDB(
+        id="object-other", name="orders-object-1", type="table", data_domain_id="domain-id",
+        created_by="test_user", updated_by="test_user"
+    ))
+    test_db.commit()
+
+    assert rename_duplicate_data_objects(test_engine) == 2
+    assert create_missing_indexes(test_engine) == ["uq_data_objects_domain_name"]
+    assert rename_duplicate_data_objects(test_engine) == 0
+    test_db.expire_all()
+    assert sorted(name for name, in test_db.query(DataObjectDB.name)) == [
+        "orders", "orders-object-1", "orders-object-1-2", "orders-object-2"
+    ]
+    assert [record.getMessage() for record in caplog.records if record.name == "app.core.migrations"] == [
+        "Renamed data object object-1 in domain domain-id from 'orders' to 'orders-object-1-2': its name was taken",
+        "Renamed data object object-2 in domain domain-id from 'orders' to 'orders-object-2': its name was taken",
+    ]
+
+
+def test_obsolete_indexes_are_dropped(test_engine):
+    """Test that an index removed from the models is dropped from a database that still has it."""
+    with test_engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE INDEX ix_data_objects_domain_name_id ON data_objects (data_domain_id, name, id)"
+        )
+
+    assert drop_obsolete_indexes(test_engine) == ["ix_data_objects_domain_name_id"]
+    assert drop_obsolete_indexes(test_engine) == []
+    assert create_missing_indexes(test_engine) == []
+
+
+def test_emails_differing_in_case_are_renamed_before_indexing(test_engine, test_db, caplog):
+    """Test that users whose emails differ only in case are renamed, with a log, to free addresses."""
+    with test_engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX uq_users_email_lower")
+        conn.exec_driver_sql("CREATE INDEX ix_users_email_lower ON users (lower(email))")
+    test_db.add_all(
+        UserDB(id=f"user-{i}", email=email, first_name="Dup", last_name="User", created_at=datetime(2024, 1, 1, i))
+        for i, email in enumerate([
+            "Ada@Example.com", "ada@example.com", "ADA@example.com", "bob@example.com",
+            # Already holds, ignoring case, the address the first duplicate would get
+            "Ada+Duplicate-User-1@example.com",
+        ])
+    )
+    test_db.commit()
+
+    assert rename_duplicate_user_emails(test_engine) == 2
+    assert create_missing_indexes(test_engine) == ["uq_users_email_lower"]
+    assert rename_duplicate_user_emails(test_engine) == 0
+    test_db.expire_all()
+    assert sorted(email for email, in test_db.query(UserDB.email)) == [
+        "ADA+duplicate-user-2@example.com", "Ada+Duplicate-User-1@example.com", "Ada@Example.com",
+        "ada+duplicate-user-1-2@example.com", "bob@example.com",
+    ]
+    assert [record.getMessage() for record in caplog.records if record.name == "app.core.migrations"] == [
+        "Renamed the email of user user-1 from 'ada@example.com' to 'ada+duplicate-user-1-2@example.com': "
+        "it was taken ignoring case",
+        "Renamed the email of user user-2 from 'ADA@example.com' to 'ADA+duplicate-user-2@example.com': "
+        "it was taken ignoring case",
+    ]
@@ -0,0 +1,94 @@
+"""
+Data Fusion Hub Service - Read Replica Routing Tests
+
+The primary and the replica are two SQLite files holding different rows, so
+each response shows which database served it.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import database
+from app.core.cache import NullCacheBackend, entity_cache
+from app.core.config import settings
+from app.core.database import Base, RoutingSession
+from app.main import app
+from app.models.data_domain import DataDomainDB
+
+
+def add_domain(engine, id, name):
+    """Insert a data domain straight into one database."""
+    with sessionmaker(bind=engine)() as db:
+        db.add(DataDomainDB(id=id, name=name, created_by="test_user", updated_by="test_user"))
+        db.commit()
+
+
+@pytest.fixture
+def engines(tmp_path, monkeypatch):
+    """Route the app's sessions to a primary file with one replica file."""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}", connect_args={"check_same_thread": False})
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", connect_args={"check_same_thread": False})
+    for engine in (primary, replica):
+        Base.metadata.create_all(bind=engine)
+    add_domain(primary, "on-primary", "Primary Domain")
+    add_domain(replica, "on-replica", "Replica Domain")
+
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(
+        class_=RoutingSession, autoflush=False, bind=primary, replicas=[replica]
+    ))
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", ["sqlite:///replica.db"])
+    # Cached rows would hide which database served a lookup
+    monkeypatch.setattr(entity_cache, "backend", NullCacheBackend())
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def test_get_reads_from_replica(engines):
+    """Test that safe GET handlers read from the replica."""
+    client = TestClient(app)
+
+    assert client.get("/datadomains/on-replica").status_code == 200
+    assert client.get("/datadomains/on-primary").status_code == 404
+    assert [item["id"] for item in client.get("/datadomains/").json()["data"]] == ["on-replica"]
+
+
+def test_consistency_header_reads_from_primary(engines):
+    """Test that X-Read-Consistency: primary keeps a read on the primary."""
+    response = TestClient(app).get("/datadomains/on-primary", headers={"X-Read-Consistency": "primary"})
+
+    assert response.status_code == 200
+
+
+def test_writes_go_to_primary_and_pin_reads(engines):
+    """Test that a write lands on the primary and the writer then reads its own write."""
+    primary, replica = engines
+    writer = TestClient(app)
+
+    response = writer.post("/datadomains/", json={"name": "New Domain"})
+    assert response.status_code == 201
+    domain_id = response.json()["id"]
+    assert database.READ_PRIMARY_COOKIE in response.cookies
+
+    with sessionmaker(bind=primary)() as db:
+        assert db.get(DataDomainDB, domain_id) is not None
+    with sessionmaker(bind=replica)() as db:
+        assert db.get(DataDomainDB, domain_id) is None
+
+    # The writer is pinned to the primary, other clients still read the replica
+    assert writer.get(f"/datadomains/{domain_id}").status_code == 200
+    assert TestClient(app).get(f"/datadomains/{domain_id}").status_code == 404
+
+
+def test_batch_get_reads_from_replica_without_pinning(engines):
+    """Test that a POST that only reads neither pins the client nor leaves the replica."""
+    client = TestClient(app)
+
+    response = client.post("/datadomains/batch-get", json={"ids": ["on-primary", "on-replica"]})
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["data"]] == ["on-replica"]
+    assert response.json()["missing"] == ["on-primary"]
+    assert database.READ_PRIMARY_COOKIE not in response.cookies
@@ -0,0 +1,77 @@
+"""
+Data Fusion Hub Service - Role Request Queue Tests
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.role_db import RoleDB
+from app.models.user_db import UserDB
+from app.models.user_role_request_db import UserRoleRequestDB
+
+client = TestClient(app)
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def test_db(app_db):
+    """Seed the test database with requests of two users for three roles."""
+    app_db.add_all([
+        UserDB(id="user-1", email="one@example.com", first_name="One", last_name="User"),
+        UserDB(id="user-2", email="two@example.com", first_name="Two", last_name="User"),
+        *(RoleDB(id=f"role-{i}", name=f"role-{i}", created_by="test", updated_by="test") for i in range(3)),
+        *(
+            UserRoleRequestDB(
+                id=f"request-{i}", user_id=f"user-{i % 2 + 1}", role_id=f"role-{i % 3}", justification="Work",
+                status="pending" if i < 4 else "denied", created_by="test", updated_by="test",
+                created_at=START + timedelta(hours=i)
+            )
+            for i in range(6)
+        ),
+    ])
+    app_db.commit()
+    return app_db
+
+
+def list_ids(**params):
+    """List role requests and return their IDs and the pagination metadata."""
+    response = client.get("/user-role-requests/", params=params)
+    assert response.status_code == 200
+    return [request["id"] for request in response.json()["data"]], response.json()["pagination"]
+
+
+def test_list_filters_requests(test_db):
+    """Test filtering requests by status, role, user and creation time."""
+    assert list_ids(status="pending")[0] == ["request-0", "request-1", "request-2", "request-3"]
+    assert list_ids(status="pending", role_id="role-0")[0] == ["request-0", "request-3"]
+    assert list_ids(user_id="user-2", sort="-created_at")[0] == ["request-5", "request-3", "request-1"]
+    assert list_ids(
+        created_after=(START + timedelta(hours=2)).isoformat(), created_before=(START + timedelta(hours=4)).isoformat()
+    )[0] == ["request-2", "request-3"]
+
+
+def test_list_pages_with_cursor(test_db):
+    """Test walking the queue page by page with the next cursor."""
+    ids, pagination = list_ids(size=4, include_total=True)
+    assert ids == [f"request-{i}" for i in range(4)]
+    assert (pagination["total"], pagination["pages"]) == (6, 2)
+
+    ids, pagination = list_ids(size=4, cursor=pagination["next_cursor"])
+    assert ids == ["request-4", "request-5"]
+    assert pagination["next_cursor"] is None
+    assert client.get("/user-role-requests/", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_duplicate_pending_request_is_rejected(test_db):
+    """Test that a second pending request for the same role conflicts, but one after a decision does not."""
+    payload = {"user_id": "user-1", "role_id": "role-0", "justification": "Retry"}
+    assert client.post("/user-role-requests/", json=payload).status_code == 409
+
+    # request-4 (user-1, role-1) was denied, so a new pending request is fine
+    response = client.post("/user-role-requests/", json={**payload, "role_id": "role-1"})
+    assert response.status_code == 200
+    assert response.json()["status"] == "pending"
+    assert test_db.query(UserRoleRequestDB).filter(UserRoleRequestDB.status == "pending").count() == 5
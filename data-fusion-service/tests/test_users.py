@@ -5,6 +5,7 @@ Data Fusion Hub Service - User Tests
 import pytest
 from sqlalchemy.orm import Session
 from app.models.user import UserCreate, UserUpdate
+from app.models.user_db import UserDB
 from app.repositories.concrete_user_repository import ConcreteUserRepository
 
 
@@ -196,4 +197,22 @@ def test_social_login_user(db: Session):
     created_user = repository.create(user_data, "social_creator")
     
     assert created_user.email == "social@example.com"
-    assert created_user.password_hash is None  # Should be None for social users
\ No newline at end of file
+    assert created_user.password_hash is None  # Should be None for social users
+
+
+async def test_update_user_stores_only_the_password_hash(app_db: Session):
+    """Test that updating a password hashes it instead of copying the plain text onto the row."""
+    repository = ConcreteUserRepository(app_db)
+    created_user = await repository.create(
+        UserCreate(email="secret@example.com", first_name="Secret", last_name="User", password="password123"),
+        "test_creator"
+    )
+
+    # Holding the row keeps the instance the repository updates in the session
+    db_user = app_db.get(UserDB, created_user.id)
+    user_update = UserUpdate(email="secret@example.com", first_name="Secret", last_name="User", password="newpassword456")
+    updated_user = await repository.update(created_user.id, user_update, "test_updater")
+
+    assert "password" not in vars(db_user)
+    assert updated_user.password_hash not in (None, created_user.password_hash, "newpassword456")
+    assert db_user.password_hash == updated_user.password_hash